@@ -0,0 +1,286 @@
+"""A module containing a compiled plan of where values from each Codelist should be found within a Dataset.
+
+The plan allows the values within a Dataset to be checked against many Codelists in a single pass over the Dataset.
+"""
+from lxml import etree
+import iati.constants
+import iati.default
+
+
+_VALIDATION_PLAN = dict()
+"""A cache of the compiled Codelist validation plan.
+
+This removes the need to repeatedly parse the Codelist mapping file and compile XPath expressions each time a Dataset is checked against a Codelist.
+
+The dictionary is structured as:
+
+{
+    "codelist_name_1": [
+        {
+            "parent_xpath": etree.XPath,
+            "attr_name": "code",
+            "attr_key": "code",
+            "element_tag": "sector",
+            "ancestor_tags": ("iati-activity",),
+            "anchored": False,
+            "condition_xpath": etree.XPath or None
+        },
+        [...]
+    ],
+    [...]
+}
+
+"""
+
+
+def compile_mapping(mapping):
+    """Compile a single Codelist mapping into a form that may be directly evaluated against a Dataset.
+
+    Args:
+        mapping (dict): A mapping, as returned by `iati.default.codelist_mapping()`. Contains an `xpath` and a `condition`.
+
+    Returns:
+        dict: A dictionary containing the compiled information.
+            `parent_xpath` is an `etree.XPath` that locates the elements containing a Code.
+            `attr_name` is the name of the attribute containing the Code, as written in the mapping.
+            `attr_key` is the key of the attribute within the `attrib` of a located element. It is `None` when the Code is the text of the located element.
+            `element_tag` is the tag of the elements containing a Code. It is `*` when any element may contain a Code.
+            `ancestor_tags` is a tuple of the tags that the ancestors of a located element must have, starting with its parent.
+            `anchored` is whether the furthest of the `ancestor_tags` must be the root element.
+            `condition_xpath` is an `etree.XPath` that returns whether a located element meets the mapping condition. It is `None` when there is no condition.
+
+    """
+    split_xpath = mapping['xpath'].split('/')
+    parent_el_xpath = '/'.join(split_xpath[:-1])
+    value_location = split_xpath[-1]
+
+    if value_location.startswith('@'):
+        attr_name = value_location[1:]
+        if attr_name.startswith('xml:'):
+            attr_key = '{' + iati.constants.NAMESPACE_XML + '}' + attr_name[len('xml:'):]
+        else:
+            attr_key = attr_name
+    else:
+        # the Code is the text of the element (eg. `channel-code/text()`)
+        attr_name = value_location
+        attr_key = None
+
+    # `//a/b` is split into `['', '', 'a', 'b']` while `/a/b` is split into `['', 'a', 'b']`
+    anchored = not parent_el_xpath.startswith('//')
+    element_tags = [tag for tag in split_xpath[:-1] if tag != '']
+    element_tag = element_tags[-1] if element_tags else '*'
+    ancestor_tags = tuple(reversed(element_tags[:-1]))
+
+    if mapping['condition'] is None:
+        parent_el_xpath = parent_el_xpath + '[' + value_location + ']'
+        condition_xpath = None
+    else:
+        parent_el_xpath = parent_el_xpath + '[(' + mapping['condition'] + ') and ' + value_location + ']'
+        condition_xpath = etree.XPath('boolean(' + mapping['condition'] + ')')
+
+    # some nasty string manipulation to make the `//@xml:lang` mapping work
+    while not parent_el_xpath.startswith('//'):
+        parent_el_xpath = '/' + parent_el_xpath
+    if parent_el_xpath.startswith('//['):
+        parent_el_xpath = '//*[' + parent_el_xpath[3:]
+
+    return {
+        'parent_xpath': etree.XPath(parent_el_xpath),
+        'attr_name': attr_name,
+        'attr_key': attr_key,
+        'element_tag': element_tag,
+        'ancestor_tags': ancestor_tags,
+        'anchored': anchored and bool(element_tags),
+        'condition_xpath': condition_xpath
+    }
+
+
+def validation_plan():
+    """Return a compiled plan of where values from each Codelist should be found within a Dataset.
+
+    The plan is built from the default Codelist mapping the first time that it is needed. It is then reused for every Schema and Dataset that is checked.
+
+    Returns:
+        dict: A dictionary containing the compiled mappings. Keys are Codelist names. Values are lists of compiled mappings, as returned by `compile_mapping()`.
+
+    Warning:
+        The returned value is shared. It must not be modified.
+
+    """
+    if not _VALIDATION_PLAN:
+        for codelist_name, codelist_mappings in iati.default.codelist_mapping().items():
+            _VALIDATION_PLAN[codelist_name] = [compile_mapping(mapping) for mapping in codelist_mappings]
+
+    return _VALIDATION_PLAN
+
+
+_VALIDATION_INDEX = dict()
+"""A cache of the Codelist validation plan, indexed by the tag of the elements that contain Codes.
+
+The dictionary is structured as:
+
+{
+    "element_tag_1": [
+        ("codelist_name_1", position_of_mapping_in_plan, compiled_mapping),
+        [...]
+    ],
+    "*": [...],
+    [...]
+}
+
+"""
+
+
+def validation_index():
+    """Return the Codelist validation plan indexed by the tag of the elements that contain Codes.
+
+    Returns:
+        dict: A dictionary where keys are element tags and values are lists of `(codelist_name, position, mapping)` tuples. Mappings that apply to any element are under the key `*`.
+
+    Warning:
+        The returned value is shared. It must not be modified.
+
+    """
+    if not _VALIDATION_INDEX:
+        for codelist_name, mappings in validation_plan().items():
+            for position, mapping in enumerate(mappings):
+                _VALIDATION_INDEX.setdefault(mapping['element_tag'], []).append((codelist_name, position, mapping))
+
+    return _VALIDATION_INDEX
+
+
+def mapping_matches(element, mapping):
+    """Determine whether an element is located by a compiled Codelist mapping.
+
+    Args:
+        element (etree._Element): The element to check. Its tag must match the `element_tag` of the mapping.
+        mapping (dict): A compiled mapping, as returned by `compile_mapping()`.
+
+    Returns:
+        bool: Whether the element is located by the mapping.
+
+    """
+    ancestor = element.getparent()
+    for ancestor_tag in mapping['ancestor_tags']:
+        if ancestor is None or ancestor.tag != ancestor_tag:
+            return False
+        ancestor = ancestor.getparent()
+
+    if mapping['anchored'] and ancestor is not None:
+        return False
+
+    if mapping['condition_xpath'] is not None:
+        return mapping['condition_xpath'](element)
+
+    return True
+
+
+def value_for(element, mapping):
+    """Return the value that should be on a Codelist for an element located by a compiled Codelist mapping.
+
+    Args:
+        element (etree._Element): The element containing the value.
+        mapping (dict): A compiled mapping, as returned by `compile_mapping()`.
+
+    Returns:
+        str or None: The value of the mapped attribute, or the text of the element. None if there is no such value.
+
+    """
+    if mapping['attr_key'] is None:
+        return element.text
+
+    return element.get(mapping['attr_key'])
+
+
+def invalid_values(dataset, codelists, fail_fast=False, skip_root=False):
+    """Find the values in a given Dataset that are not on the Codelists that they should be on.
+
+    The Dataset is walked once, with each element being checked against the Codelist mappings for its tag.
+
+    Args:
+        dataset (iati.data.Dataset): The Dataset to check Codelist values within.
+        codelists (iterable of iati.codelists.Codelist): The Codelists to check values from.
+        fail_fast (bool): Whether to stop at the first value that is not on a complete Codelist. Defaults to False.
+        skip_root (bool): Whether to skip checking the root element of the Dataset. Defaults to False.
+
+    Returns:
+        list of tuple: A list of `(codelist, code, attr_name, line_number)` tuples, one for each value that is not on its Codelist.
+            Values are ordered by Codelist, then by mapping, then by location within the Dataset.
+            When failing fast, the list contains only the first value in document order that is not on a complete Codelist.
+
+    """
+    codelists = list(codelists)
+    if not codelists:
+        return []
+
+    if fail_fast:
+        return _first_invalid_value(dataset, codelists, skip_root)
+
+    codelist_names = set(codelist.name for codelist in codelists)
+    index = validation_index()
+    any_element_mappings = index.get('*', [])
+    located_values = dict()
+    elements = dataset.xml_tree.iter(tag=etree.Element)
+    if skip_root:
+        next(elements, None)
+
+    for element in elements:
+        for codelist_name, position, mapping in index.get(element.tag, []) + any_element_mappings:
+            if codelist_name not in codelist_names:
+                continue
+
+            code = value_for(element, mapping)
+            if code is None or not mapping_matches(element, mapping):
+                continue
+
+            located_values.setdefault((codelist_name, position), []).append((code, element.sourceline))
+
+    found_values = list()
+    for codelist in codelists:
+        for position, mapping in enumerate(validation_plan().get(codelist.name, [])):
+            for code, line_number in located_values.get((codelist.name, position), []):
+                if code not in codelist.code_values:
+                    found_values.append((codelist, code, mapping['attr_name'], line_number))
+
+    return found_values
+
+
+def _first_invalid_value(dataset, codelists, skip_root=False):
+    """Find the first value in a given Dataset that is not on a complete Codelist that it should be on.
+
+    Args:
+        dataset (iati.data.Dataset): The Dataset to check Codelist values within.
+        codelists (list of iati.codelists.Codelist): The Codelists to check values from.
+        skip_root (bool): Whether to skip checking the root element of the Dataset. Defaults to False.
+
+    Returns:
+        list of tuple: A list containing the `(codelist, code, attr_name, line_number)` tuple for the first value that is not on its Codelist, if there is one.
+
+    Note:
+        Incomplete Codelists are not checked, since values that are not on them only cause warnings.
+
+    """
+    complete_codelists = {codelist.name: codelist for codelist in codelists if codelist.complete}
+    if not complete_codelists:
+        return []
+
+    index = validation_index()
+    any_element_mappings = index.get('*', [])
+    elements = dataset.xml_tree.iter(tag=etree.Element)
+    if skip_root:
+        next(elements, None)
+
+    for element in elements:
+        for codelist_name, _, mapping in index.get(element.tag, []) + any_element_mappings:
+            try:
+                codelist = complete_codelists[codelist_name]
+            except KeyError:
+                continue
+
+            code = value_for(element, mapping)
+            if code is None or code in codelist.code_values or not mapping_matches(element, mapping):
+                continue
+
+            return [(codelist, code, mapping['attr_name'], element.sourceline)]
+
+    return []
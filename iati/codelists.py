@@ -1,5 +1,6 @@
 """A module containing a core representation of IATI Codelists."""
 import collections
+from copy import deepcopy
 from lxml import etree
 import iati.resources
 import iati.utilities
@@ -11,6 +12,8 @@ class Codelist(object):
     Attributes:
         complete (bool): Whether the Codelist is complete or not. If complete, attributes making use of this Codelist must only contain values present on the Codelist. If not complete, this is merely strongly advised.
         codes (:obj:`set` of :obj:`iati.Code`): The codes demonstrating the range of values that the Codelist may represent.
+        code_values (:obj:`frozenset` of str): The values of the codes. This is kept in sync with `codes`.
+        frozen (bool): Whether the Codelist has been frozen, so cannot be modified.
         name (str): The name of the Codelist.
 
     Warning:
@@ -81,6 +84,7 @@ class Codelist(object):
             except KeyError:
                 pass
 
+        self._frozen = False
         self.complete = None
         self.codes = set()
         self.name = name
@@ -127,6 +131,101 @@ class Codelist(object):
         """
         return hash((self.name, tuple(self.codes)))
 
+    def __setattr__(self, name, value):
+        """Set an attribute of the Codelist.
+
+        Raises:
+            AttributeError: When the Codelist is frozen.
+
+        """
+        if getattr(self, '_frozen', False):
+            raise AttributeError("The {0} Codelist is frozen, so cannot be modified. Use `mutable=True` to obtain a default Codelist that may be modified, or modify a `deepcopy()` of the Codelist.".format(self.name))
+
+        super(Codelist, self).__setattr__(name, value)
+
+    def __deepcopy__(self, memo):
+        """Create a deep copy of the Codelist.
+
+        The copy is not frozen, even when the Codelist is. This is the way to obtain a version of a frozen Codelist that may be modified.
+
+        Args:
+            memo (dict): A dictionary of objects already copied during the current copying pass.
+
+        Returns:
+            iati.Codelist: A deep copy of the Codelist.
+
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for key, value in self.__dict__.items():
+            if key not in ['_codes', '_frozen']:
+                setattr(copied, key, deepcopy(value, memo))
+
+        copied.codes = (deepcopy(code, memo) for code in self.codes)
+        copied._frozen = False  # pylint: disable=protected-access
+
+        return copied
+
+    @property
+    def frozen(self):
+        """bool: Whether the Codelist has been frozen, so cannot be modified."""
+        return self._frozen
+
+    def freeze(self):
+        """Prevent the Codelist and its Codes from being modified.
+
+        Once frozen, a Codelist may be shared without being copied. Attempts to set its attributes, or those of its Codes, raise an AttributeError. Its `codes` become a frozenset.
+
+        Returns:
+            iati.Codelist: The Codelist, which is now frozen.
+
+        Note:
+            A frozen Codelist cannot be unfrozen. A `deepcopy()` of it is not frozen, so may be modified.
+
+        """
+        if not self._frozen:
+            for code in self.codes:
+                code.freeze()
+            self._codes = _FrozenCodeSet(self.codes)
+            self._frozen = True
+
+        return self
+
+    @property
+    def codes(self):
+        """:obj:`set` of :obj:`iati.Code`: The codes demonstrating the range of values that the Codelist may represent.
+
+        Note:
+            Assigning a set of Codes to this attribute copies it.
+
+            When the Codelist is frozen, this is a frozenset.
+
+        """
+        return self._codes
+
+    @codes.setter
+    def codes(self, value):
+        """Set the codes of the Codelist.
+
+        Args:
+            value (iterable of iati.Code): The codes demonstrating the range of values that the Codelist may represent.
+
+        """
+        self._codes = _CodeSet(value)
+
+    @property
+    def code_values(self):
+        """:obj:`frozenset` of str: The values of the codes within the Codelist.
+
+        Checking whether a string is within this frozenset does not require any comparison between strings and Codes, so is considerably faster than checking whether it is within `codes`.
+
+        Warning:
+            Modifying the value of a Code that is within the Codelist is not detected.
+
+        """
+        return self._codes.code_values
+
     @property
     def xsd_restriction(self):
         """Output the Codelist as an XSD simpleType restriction.
@@ -168,10 +267,95 @@ class Codelist(object):
         return type_base_el
 
 
+class _CodeSet(set):
+    """A set of Codes that keeps a frozenset of the values of its Codes.
+
+    The frozenset is created when first needed, and is discarded whenever the set is modified.
+
+    """
+
+    def __init__(self, iterable=()):
+        """Initialise a set of Codes.
+
+        Args:
+            iterable (iterable of iati.Code): The Codes within the set.
+
+        """
+        super(_CodeSet, self).__init__(iterable)
+        self._code_values = None
+
+    @property
+    def code_values(self):
+        """:obj:`frozenset` of str: The values of the Codes within the set."""
+        if self._code_values is None:
+            self._code_values = frozenset(code.value for code in self)
+
+        return self._code_values
+
+
+def _discarding_code_values(method_name):
+    """Wrap a method of `set` that modifies a set, so that it discards the frozenset of Code values kept by a _CodeSet.
+
+    Args:
+        method_name (str): The name of the method to wrap.
+
+    Returns:
+        function: The wrapped method.
+
+    """
+    set_method = getattr(set, method_name)
+
+    def method(self, *args):
+        """Discard the frozenset of Code values, then modify the set."""
+        self._code_values = None  # pylint: disable=protected-access
+        return set_method(self, *args)
+
+    method.__name__ = method_name
+    method.__doc__ = set_method.__doc__
+
+    return method
+
+
+class _FrozenCodeSet(frozenset):
+    """A frozenset of the Codes of a frozen Codelist that keeps a frozenset of the values of its Codes.
+
+    Attempting to add to or remove from it raises an AttributeError that states how to obtain a Codelist that may be modified, rather than stating that a frozenset has no such method.
+
+    """
+
+    _MODIFYING_METHOD_NAMES = frozenset(['add', 'clear', 'difference_update', 'discard', 'intersection_update', 'pop', 'remove', 'symmetric_difference_update', 'update'])
+
+    def __getattr__(self, name):
+        """Locate an attribute that is not otherwise present.
+
+        Raises:
+            AttributeError: Always. The message states how to obtain a Codelist that may be modified when `name` is a method of `set` that modifies a set.
+
+        """
+        if name in self._MODIFYING_METHOD_NAMES:
+            raise AttributeError("The Codes of a frozen Codelist cannot be modified. Use `mutable=True` to obtain a default Codelist that may be modified, or modify a `deepcopy()` of the Codelist.")
+
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name))
+
+    @property
+    def code_values(self):
+        """:obj:`frozenset` of str: The values of the Codes within the frozenset."""
+        try:
+            return self._code_values
+        except AttributeError:
+            self._code_values = frozenset(code.value for code in self)  # pylint: disable=attribute-defined-outside-init
+            return self._code_values
+
+
+for _method_name in ['add', 'clear', 'difference_update', 'discard', 'intersection_update', 'pop', 'remove', 'symmetric_difference_update', 'update', '__iand__', '__ior__', '__isub__', '__ixor__']:
+    setattr(_CodeSet, _method_name, _discarding_code_values(_method_name))
+
+
 class Code(object):
     """Representation of a Code contained within a Codelist.
 
     Attributes:
+        frozen (bool): Whether the Code has been frozen, so cannot be modified.
         name (str): The name of the code.
         value (str): The value of the code.
 
@@ -195,6 +379,7 @@ class Code(object):
             The format of the constructor is likely to change. It should include mandatory parameters, and allow for other attributes to be defined.
 
         """
+        self._frozen = False
         self.name = name
         self.value = value
 
@@ -245,6 +430,57 @@ class Code(object):
         """
         return hash((self.value))
 
+    def __setattr__(self, name, value):
+        """Set an attribute of the Code.
+
+        Raises:
+            AttributeError: When the Code is frozen.
+
+        """
+        if getattr(self, '_frozen', False):
+            raise AttributeError("The Code with value {0} is frozen, so cannot be modified. A `deepcopy()` of it may be modified.".format(self.value))
+
+        super(Code, self).__setattr__(name, value)
+
+    def __deepcopy__(self, memo):
+        """Create a deep copy of the Code.
+
+        The copy is not frozen, even when the Code is.
+
+        Args:
+            memo (dict): A dictionary of objects already copied during the current copying pass.
+
+        Returns:
+            iati.Code: A deep copy of the Code.
+
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for key, value in self.__dict__.items():
+            if key != '_frozen':
+                setattr(copied, key, deepcopy(value, memo))
+        copied._frozen = False  # pylint: disable=protected-access
+
+        return copied
+
+    @property
+    def frozen(self):
+        """bool: Whether the Code has been frozen, so cannot be modified."""
+        return self._frozen
+
+    def freeze(self):
+        """Prevent the Code from being modified.
+
+        Returns:
+            iati.Code: The Code, which is now frozen.
+
+        """
+        if not self._frozen:
+            self._frozen = True
+
+        return self
+
     @property
     def xsd_enumeration(self):
         """Output the Code as an etree enumeration element.
@@ -47,3 +47,5 @@ NAMESPACE = '{http://www.w3.org/2001/XMLSchema}'
 """The namespace that IATI Schema XSD files are specified within."""
 NSMAP = {'xsd': 'http://www.w3.org/2001/XMLSchema'}
 """A dictionary for interpreting namespaces in IATI Schemas."""
+NAMESPACE_XML = 'http://www.w3.org/XML/1998/namespace'
+"""The namespace that attributes prefixed with `xml:` (such as `xml:lang`) are specified within."""
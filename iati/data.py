@@ -1,6 +1,9 @@
 """A module containing a core representation of an IATI Dataset."""
+from array import array
+from copy import deepcopy
 import sys
 from lxml import etree
+import six
 import iati.exceptions
 import iati.utilities
 import iati.validator
@@ -16,6 +19,8 @@ class Dataset(object):
     Note:
         Should it be modified after initialisation, the current content of the Dataset is deemed to be that which was last asigned to either `self.xml_str` or `self.xml_tree`.
 
+        When a tree is assigned, the string representation is not created until `self.xml_str` is first accessed.
+
     Warning:
         The behaviour of simultaneous assignment to both `self.xml_str` and `self.xml_tree` is undefined.
 
@@ -54,6 +59,9 @@ class Dataset(object):
         """
         self._xml_str = None
         self._xml_tree = None
+        self._xml_tree_from_str = False
+        self._line_index = None
+        self._line_index_source = None
 
         if isinstance(xml, etree._Element):  # pylint: disable=W0212
             self.xml_tree = xml
@@ -68,12 +76,20 @@ class Dataset(object):
             ValueError: If a value that is being assigned is not a valid XML string.
             TypeError: If a value that is being assigned is not a string.
 
+        Warning:
+            When the Dataset was last assigned a tree, the string is created from the tree the first time it is accessed, and then reused.
+
+            Modifications made to the tree in-place after this point are not reflected in the string. Assign the modified tree to `self.xml_tree` for them to be.
+
         Todo:
             Clarify error messages, for example when a mismatched encoding is used.
 
             Perhaps pass on the original lxml error message instead of trying to intrepret what might have gone wrong when running `etree.fromstring()`.
 
         """
+        if self._xml_str is None:
+            self._xml_str = etree.tostring(self._xml_tree, pretty_print=True)
+
         return self._xml_str
 
     @xml_str.setter
@@ -93,11 +109,13 @@ class Dataset(object):
                 else:
                     value_stripped_bytes = value_stripped
 
-                validation_error_log = iati.validator.validate_is_xml(value_stripped_bytes)
+                tree, validation_error_log = iati.validator._parse_xml(value_stripped_bytes)  # pylint: disable=protected-access
 
                 if not validation_error_log.contains_errors():
-                    self.xml_tree = etree.fromstring(value_stripped_bytes)
+                    # the string has already been parsed, so there is no need to serialise the tree back out through the xml_tree setter
+                    self._xml_tree = tree
                     self._xml_str = value_stripped
+                    self._xml_tree_from_str = True
                 else:
                     if validation_error_log.contains_error_of_type(TypeError):
                         raise TypeError
@@ -128,12 +146,29 @@ class Dataset(object):
     def xml_tree(self, value):
         if isinstance(value, etree._Element):  # pylint: disable=W0212
             self._xml_tree = value
-            self._xml_str = etree.tostring(value, pretty_print=True)
+            # the string is created from the tree when it is next accessed
+            self._xml_str = None
+            self._xml_tree_from_str = False
         else:
             msg = "If setting a Dataset with the xml_property, an ElementTree should be provided, not a {0}.".format(type(value))
             iati.utilities.log_error(msg)
             raise TypeError(msg)
 
+    def _source_line_numbers(self):
+        """Determine the line number of each node within the tree, where parsing `xml_str` would not give the same line numbers.
+
+        Returns:
+            list of int or None: The `sourceline` of each node within the tree, in document order. `None` when the tree was parsed from `xml_str`, so parsing the string again gives the same line numbers.
+
+        Note:
+            When a tree is assigned, `xml_str` is a formatted serialisation of it. The line numbers within the tree are those of wherever it was parsed from, or `None` where it was created in code.
+
+        """
+        if self._xml_tree_from_str:
+            return None
+
+        return [node.sourceline for node in self._xml_tree.iter()]
+
     def _raw_source_at_line(self, line_number):
         """Return the raw value of the XML source at the specified line.
 
@@ -154,13 +189,53 @@ class Dataset(object):
         if line_number < 0:
             raise ValueError
 
-        try:
-            # this is led with an empty string since the `sourceline` attribute is 1-indexed.
-            split_lines = [''] + self.xml_str.split('\n')
-            return split_lines[line_number]
-        except IndexError:
+        # line 0 is an empty string since the `sourceline` attribute is 1-indexed.
+        if line_number == 0:
+            return ''
+
+        if line_number > len(self._line_starts):
             raise ValueError
 
+        return self._raw_source_between_lines(line_number, line_number)
+
+    def _raw_source_between_lines(self, first_line_number, last_line_number):
+        """Return the raw value of the XML source between the specified lines, inclusive.
+
+        Args:
+            first_line_number (int): The 1-indexed number of the first line to return.
+            last_line_number (int): The 1-indexed number of the last line to return. Must not be more than the number of lines in the file.
+
+        Returns:
+            str: The source of the XML between the specified lines. Lines are separated by newlines.
+
+        """
+        line_starts = self._line_starts
+        start = line_starts[first_line_number - 1]
+        if last_line_number < len(line_starts):
+            end = line_starts[last_line_number] - 1  # exclude the newline at the end of the last line
+        else:
+            end = None
+
+        source = self.xml_str[start:end]
+        if not isinstance(source, six.text_type):
+            source = source.decode('utf-8', 'replace')
+
+        return source
+
+    @property
+    def _line_starts(self):
+        """array: The offsets within `self.xml_str` at which each line starts.
+
+        The index is created the first time it is required and is reused until the string representation of the Dataset changes.
+
+        """
+        xml_str = self.xml_str
+        if self._line_index is None or self._line_index_source is not xml_str:
+            self._line_index = _line_start_offsets(xml_str)
+            self._line_index_source = xml_str
+
+        return self._line_index
+
     @property
     def version(self):
         """Return the version of the Standard that this Dataset is specified against.
@@ -239,11 +314,139 @@ class Dataset(object):
         if surrounding_lines < 0:
             raise ValueError
 
-        lines_arr = []
         lower_line_number = max(line_number - surrounding_lines, 1)
-        upper_line_number = min(line_number + surrounding_lines + 1, len(self.xml_str.split('\n')) + 1)
+        upper_line_number = min(line_number + surrounding_lines, len(self._line_starts))
+
+        if lower_line_number > upper_line_number:
+            return ''
+
+        return self._raw_source_between_lines(lower_line_number, upper_line_number)
+
+
+def _has_q_typecode():
+    """Determine whether arrays may store unsigned long longs.
+
+    Returns:
+        bool: Whether the 'Q' array typecode is available.
+
+    """
+    try:
+        array('Q')
+    except ValueError:  # python2/3 - the 'Q' typecode is not available in Python 2
+        return False
+
+    return True
+
+
+_LINE_OFFSET_TYPECODE = 'Q' if _has_q_typecode() else 'L'
+"""The array typecode used to store line offsets. An unsigned long long where available, so that offsets within files of any size can be stored."""
+
+
+def _line_start_offsets(source):
+    """Locate the offset at which each line of some XML source starts.
+
+    Args:
+        source (str or bytes or mmap.mmap): The XML source to index. This is not decoded.
+
+    Returns:
+        array: The offset of the start of each line. The first line starts at offset 0.
+
+    """
+    newline = u'\n' if isinstance(source, six.text_type) else b'\n'
+    line_starts = array(_LINE_OFFSET_TYPECODE, [0])
+
+    newline_offset = source.find(newline)
+    while newline_offset != -1:
+        line_starts.append(newline_offset + 1)
+        newline_offset = source.find(newline, newline_offset + 1)
 
-        for line_num in range(lower_line_number, upper_line_number):
-            lines_arr.append(self._raw_source_at_line(line_num))
+    return line_starts
+
+
+class _DatasetFragment(Dataset):
+    """A Dataset containing part of a larger XML document, such as a single `iati-activity` taken from a stream.
+
+    Elements within the tree keep the line numbers that they had within the larger document. The string representation is an unformatted serialisation of the tree, so each of its lines matches a line of the larger document, shifted by `line_offset`.
+
+    Attributes:
+        line_offset (int): The number of lines within the larger document that come before the first line of the fragment.
+
+    Warning:
+        Should an element in the larger document span multiple lines (for example, when attributes are each on their own line), the source returned for lines after it will not exactly match the larger document.
+
+    """
+
+    def __init__(self, xml_tree, line_offset):
+        """Initialise a DatasetFragment.
+
+        Args:
+            xml_tree (etree._Element): The part of the larger document to encapsulate.
+            line_offset (int): The number of lines within the larger document that come before the first line of the fragment.
+
+        """
+        super(_DatasetFragment, self).__init__(xml_tree)
+        self._xml_str = etree.tostring(xml_tree, encoding='unicode')
+        self.line_offset = line_offset
+
+    def source_at_line(self, line_number):
+        """Return the value of the XML source at the specified line of the larger document.
+
+        Args:
+            line_number (int): A line number within the larger document.
+
+        Returns:
+            str: The source of the XML at the specified line. Leading and trailing whitespace is trimmed.
+
+        """
+        return super(_DatasetFragment, self).source_at_line(line_number - self.line_offset)
+
+    def source_around_line(self, line_number, surrounding_lines=1):
+        """Return the value of the XML source at the specified line of the larger document, plus the specified amount of surrounding context.
+
+        Args:
+            line_number (int): A line number within the larger document.
+            surrounding_lines (int): The number of lines of context to provide either side of the specified line number. Default 1.
+
+        Returns:
+            str: The source of the XML at the specified line, plus the specified number of lines of surrounding context from within the fragment.
+
+        """
+        return super(_DatasetFragment, self).source_around_line(line_number - self.line_offset, surrounding_lines)
+
+
+def _fragment_for_element(element, fragment_tree=None):
+    """Create a Dataset containing a copy of an element that has been read from a stream.
+
+    Args:
+        element (etree._Element): The `iati-activity` or `iati-organisation` element to copy.
+        fragment_tree (etree._Element): An empty element to place the copy within. Defaults to None, meaning the copy is the root of the Dataset.
+
+    Returns:
+        _DatasetFragment: A Dataset containing the copied element. Line numbers are those of the stream.
+
+    """
+    element_copy = deepcopy(element)
+
+    if fragment_tree is None:
+        fragment_tree = element_copy
+    else:
+        fragment_tree.sourceline = element.sourceline
+        fragment_tree.append(element_copy)
+
+    return _DatasetFragment(fragment_tree, element.sourceline - 1)
+
+
+def _fragment_for_root(root):
+    """Create a Dataset containing the root element that has been read from a stream, without any of its children.
+
+    Args:
+        root (etree._Element): The root element of the stream.
+
+    Returns:
+        _DatasetFragment: A Dataset containing a childless copy of the root element. Line numbers are those of the stream.
+
+    """
+    root_copy = etree.Element(root.tag, attrib=dict(root.attrib), nsmap=root.nsmap)
+    root_copy.sourceline = root.sourceline
 
-        return '\n'.join(lines_arr)
+    return _DatasetFragment(root_copy, root.sourceline - 1)
@@ -7,10 +7,18 @@ Todo:
     Implement more than Codelists.
 """
 
+import hashlib
 import json
 import os
-from collections import defaultdict
+import pickle
+import sys
+import tempfile
+from collections import Counter, OrderedDict, defaultdict
 from copy import deepcopy
+try:
+    from collections.abc import Mapping
+except ImportError:  # python2/3 - the abstract base classes moved to `collections.abc` at python 3.3
+    from collections import Mapping
 import iati.codelists
 import iati.constants
 import iati.resources
@@ -39,7 +47,270 @@ def get_default_version_if_none(version):
     return version
 
 
-_CODELISTS = defaultdict(dict)
+_CACHE_NAMES = ['codelists', 'codelist_mappings', 'persistent_cache', 'rulesets', 'ruleset_schemas', 'schemas', 'schema_validators']
+"""The names of the caches of default data kept within this module."""
+
+
+_CACHE_STATISTICS = defaultdict(Counter)
+"""The number of hits and misses of each cache of default data.
+
+A hit is recorded when a value is returned from a cache. A miss is recorded when a value has to be loaded from disk, or otherwise created, before it is added to a cache.
+
+For the `persistent_cache`, a hit is recorded when data for a version of the Standard is loaded from a cache file, and a miss when it has to be parsed from the resource files.
+
+The dictionary is structured as:
+
+{
+    "cache_name_a": Counter({"hits": number_of_hits, "misses": number_of_misses}),
+    "cache_name_b": Counter([...]),
+    [...]
+}
+
+"""
+
+
+def _record_cache_access(cache_name, hit):
+    """Record a hit or miss of a cache of default data.
+
+    Args:
+        cache_name (str): The name of the cache that was accessed. One of `_CACHE_NAMES`.
+        hit (bool): Whether the value was found in the cache.
+
+    """
+    _CACHE_STATISTICS[cache_name]['hits' if hit else 'misses'] += 1
+
+
+def cache_statistics():
+    """Return the number of hits and misses of each cache of default data.
+
+    Returns:
+        dict of dict: A dictionary containing the statistics for each cache. Keys in the second dictionary are `hits` and `misses`.
+            Keys in the first dictionary are the names of caches: `codelists`, `codelist_mappings`, `persistent_cache`, `rulesets`, `ruleset_schemas`, `schemas` and `schema_validators`.
+
+    Note:
+        The statistics are reset by `clear_cache()`.
+
+    """
+    return {
+        cache_name: {'hits': _CACHE_STATISTICS[cache_name]['hits'], 'misses': _CACHE_STATISTICS[cache_name]['misses']}
+        for cache_name in _CACHE_NAMES
+    }
+
+
+def clear_cache():
+    """Remove all default data from the caches within this module, and reset their statistics.
+
+    Default data is loaded from disk again the next time that it is accessed.
+
+    Note:
+        Values that have already been returned remain valid. Frozen Codelists and Schemas that were returned before the caches were cleared are no longer shared with values returned afterwards.
+
+        Data that other modules derive from default data, such as the compiled Codelist validation plan within `iati.codelist_validation` and the Ruleset Schema validators within `iati.ruleset_caches`, is not cleared.
+
+        Files within the persistent cache are not removed. See `enable_persistent_cache()`.
+
+    """
+    _CODELISTS.clear()
+    _CODELIST_MAPPINGS.clear()
+    _RULESETS.clear()
+    _RULESET_SCHEMAS.clear()
+    _SCHEMAS.clear()
+    _SCHEMA_VALIDATORS.clear()
+    _CACHE_STATISTICS.clear()
+
+
+def warm_cache(versions=None):
+    """Load default data into the caches within this module, so that it does not need to be loaded from disk when first accessed.
+
+    The Codelists, Codelist mapping, Standard Ruleset and populated and unpopulated Schemas are loaded for each specified version of the Standard. Data that is already cached is not loaded again.
+
+    Args:
+        versions (list of str): The versions of the Standard to load default data for. Defaults to None. This means that default data is loaded for every version of the Standard.
+
+    Raises:
+        ValueError: When a specified version is not a valid version of the IATI Standard.
+
+    """
+    if versions is None:
+        versions = iati.constants.STANDARD_VERSIONS
+
+    for version in versions:
+        _codelists(version, True).load_all()
+        _codelist_mapping(version, True)
+        _ruleset(version, True)
+        for populate in [True, False]:
+            _schema(iati.resources.get_all_activity_schema_paths, iati.ActivitySchema, version, populate, True)
+            _schema(iati.resources.get_all_organisation_schema_paths, iati.OrganisationSchema, version, populate, True)
+
+
+_PERSISTENT_CACHE = {'directory': None}
+"""The settings of the persistent cache of parsed default data.
+
+The dictionary is structured as:
+
+{
+    "directory": "path/to/the/directory/containing/cache/files"
+}
+
+The directory is `None` when the persistent cache is disabled.
+
+"""
+
+
+_PERSISTENT_CACHE_FORMAT = 1
+"""The version of the format of persistent cache files.
+
+This forms part of the key for each cache file, so should be incremented whenever the content of the files changes in a way that the source files that are hashed do not capture.
+
+"""
+
+
+def enable_persistent_cache(directory):
+    """Store parsed default data within files in the specified directory, and load it from there in future.
+
+    Codelists, Codelist mappings and Standard Rulesets are stored for each version of the Standard.
+
+    Each file is keyed by a hash of the contents of the resource files that its data is parsed from, and of the modules defining the classes of the stored objects. A file that does not match the current resources is not used.
+
+    Args:
+        directory (str): The path to the directory in which to store cache files. It is created if it does not exist.
+
+    Raises:
+        OSError: When the directory does not exist and cannot be created.
+
+    Warning:
+        Cache files are loaded with `pickle`. The directory must not be writable by anyone who is not trusted to run code as the current user.
+
+    Note:
+        The persistent cache is disabled by default.
+
+        Old cache files are not removed.
+
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    _PERSISTENT_CACHE['directory'] = directory
+
+
+def disable_persistent_cache():
+    """Stop storing parsed default data within files, and stop loading it from them.
+
+    Files that have already been created are not removed.
+
+    """
+    _PERSISTENT_CACHE['directory'] = None
+
+
+def _persistent_cache_directory():
+    """Return the directory in which to store persistent cache files.
+
+    Returns:
+        str or None: The path to the directory. None if the persistent cache is disabled.
+
+    """
+    return _PERSISTENT_CACHE['directory']
+
+
+def _persistent_cache_path(version):
+    """Return the path of the persistent cache file for the specified version of the Standard.
+
+    The name of the file contains a SHA-256 hash of the resource files that its data is parsed from, along with the modules that define the classes of the stored objects and the version of Python.
+
+    Args:
+        version (str): The version of the Standard to return the path for.
+
+    Returns:
+        str: The path to the cache file.
+
+    """
+    source_paths = iati.resources.get_all_codelist_paths(version) + [
+        iati.resources.get_codelist_mapping_path(version),
+        iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_STANDARD_NAME, version),
+        iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_SCHEMA_NAME)
+    ]
+
+    source_hash = hashlib.sha256()
+    source_hash.update('{0} {1}'.format(_PERSISTENT_CACHE_FORMAT, sys.version_info[:2]).encode('utf-8'))
+    for path in sorted(source_paths):
+        source_hash.update(path.encode('utf-8'))
+        source_hash.update(iati.resources.load_as_bytes(path))
+    for module in [iati.codelists, iati.ruleset_caches, iati.rulesets, iati.utilities]:
+        with open(module.__file__, 'rb') as module_file:
+            source_hash.update(module_file.read())
+
+    filename = '{0}-{1}.pickle'.format(version, source_hash.hexdigest())
+
+    return os.path.join(_persistent_cache_directory(), filename)
+
+
+def _load_from_persistent_cache(version):
+    """Add the parsed default data for the specified version of the Standard to the in-memory caches, using the persistent cache.
+
+    The data is loaded from the persistent cache file for the version if there is a valid one. Otherwise, it is parsed from the resource files and a cache file is written.
+
+    Values that are already within the in-memory caches are kept, so that they remain shared with previous callers.
+
+    Args:
+        version (str): The version of the Standard to load data for.
+
+    Note:
+        Failure to read or write a cache file is logged as a warning. The data is then parsed from the resource files as though there were no persistent cache.
+
+    """
+    path = _persistent_cache_path(version)
+    data = None
+
+    try:
+        with open(path, 'rb') as cache_file:
+            data = pickle.load(cache_file)
+    except (IOError, OSError):  # python2/3 - FileNotFoundError is a subclass of OSError at python 3
+        pass
+    except Exception:  # pylint: disable=broad-except
+        iati.utilities.log_warning('The persistent cache file at {0} could not be loaded, so will be replaced.'.format(path))
+
+    if data is None:
+        _record_cache_access('persistent_cache', False)
+        data = {
+            'codelists': _load_codelists(version).load_all(),
+            'codelist_mapping': _load_codelist_mapping(version),
+            'ruleset': _load_ruleset(version)
+        }
+        _write_persistent_cache_file(path, data)
+    else:
+        _record_cache_access('persistent_cache', True)
+
+    _CODELISTS.setdefault(version, _LazyCodelists(version, data['codelists']))
+    _CODELIST_MAPPINGS.setdefault(version, data['codelist_mapping'])
+    _RULESETS.setdefault(version, data['ruleset'])
+
+
+def _write_persistent_cache_file(path, data):
+    """Write parsed default data to a persistent cache file.
+
+    The data is written to a temporary file that then replaces any existing file, so that a partially written file is never read.
+
+    Args:
+        path (str): The path of the cache file.
+        data (dict): The parsed default data to store.
+
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            pickle.dump(data, temp_file, pickle.HIGHEST_PROTOCOL)
+        try:
+            os.replace(temp_path, path)
+        except AttributeError:  # python2/3 - os.replace() does not exist at python 2
+            os.rename(temp_path, path)
+    except (IOError, OSError, pickle.PicklingError) as err:
+        iati.utilities.log_warning('The persistent cache file at {0} could not be written: {1}'.format(path, err))
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+_CODELISTS = dict()
 """A cache of loaded Codelists.
 
 This removes the need to repeatedly load a Codelist from disk each time it is accessed.
@@ -47,29 +318,32 @@ This removes the need to repeatedly load a Codelist from disk each time it is ac
 The dictionary is structured as:
 
 {
-    "version_number_a": {
+    "version_number_a": _LazyCodelists({
         "codelist_name_1": iati.Codelist(codelist_1),
         "codelist_name_2": iati.Codelist(codelist_2)
         [...]
-    },
-    "version_number_b": {
+    }),
+    "version_number_b": _LazyCodelists({
         [...]
-    },
+    }),
     [...]
 }
 
-Warning:
-    Modifying values directly obtained from this cache can potentially cause unexpected behavior. As such, it is highly recommended to perform a `deepcopy()` on any accessed Codelist before it is modified in any way.
+Each Codelist is parsed from disk when it is first accessed, rather than when the version is first accessed.
+
+Note:
+    The Codelists within this cache are frozen, so may be shared without being copied. A `deepcopy()` of a Codelist may be modified.
 
 """
 
 
-def codelist(name, version=None):
+def codelist(name, version=None, mutable=False):
     """Return the default Codelist with the specified name for the specified version of the Standard.
 
     Args:
         name (str): The name of the Codelist to return.
         version (str): The version of the Standard to return the Codelists for. Defaults to None. This means that the latest version of the specified Codelist is returned.
+        mutable (bool): Whether to return a copy of the Codelist that may be modified. Defaults to False. This means that a frozen Codelist is returned, which is shared between all callers.
 
     Raises:
         ValueError: When a specified name is not a Codelist at the specified version of the Standard.
@@ -78,6 +352,9 @@ def codelist(name, version=None):
     Returns:
         iati.Codelist: A Codelist with the specified name from the specified version of the Standard. It is populated with all the Codes on the Codelist.
 
+    Note:
+        Returning a frozen Codelist avoids copying the Codes within it. Where a Codelist is to be modified, either specify `mutable` or perform a `deepcopy()` of it.
+
     Warning:
         A name may not be sufficient to act as a UID.
 
@@ -91,60 +368,146 @@ def codelist(name, version=None):
     """
     try:
         codelist_found = _codelists(version, True)[name]
-        return deepcopy(codelist_found)
     except (KeyError, TypeError):
         msg = "There is no default Codelist in version {0} of the Standard with the name {1}.".format(version, name)
         iati.utilities.log_warning(msg)
         raise ValueError(msg)
 
+    if mutable:
+        return deepcopy(codelist_found)
+    return codelist_found
+
 
 def _codelists(version=None, use_cache=False):
     """Locate the default Codelists for the specified version of the Standard.
 
+    Each Codelist file is parsed when the Codelist is first accessed, and at most once per version of the Standard. Listing the names of the Codelists does not parse any files.
+
     Args:
         version (str): The version of the Standard to return the Codelists for. Defaults to None. This means that the latest version of the Codelists are returned.
-        use_cache (bool): Whether the cache should be used rather than loading the Codelists from disk again. If used, a `deepcopy()` should be performed on any returned Codelist before it is modified.
+        use_cache (bool): Whether the cache should be used rather than loading the Codelists from disk again.
 
     Raises:
         ValueError: When a specified version is not a valid version of the IATI Standard.
 
     Returns:
-        dict: A dictionary containing all the Codelists at the specified version of the Standard. All Non-Embedded Codelists are included. Keys are Codelist names. Values are iati.Codelist() instances.
-
-    Warning:
-        Setting `use_cache` to `True` is dangerous since it does not return a deep copy of the Codelists. This means that modification of a returned Codelist will modify the Codelist everywhere.
-        A `deepcopy()` should be performed on any returned value before it is modified.
+        _LazyCodelists: The cached mapping containing all the Codelists at the specified version of the Standard. All Non-Embedded Codelists are included. Keys are Codelist names. Values are frozen iati.Codelist() instances.
 
     Note:
-        This is a private function so as to prevent the (dangerous) `use_cache` parameter being part of the public API.
+        This is a private function so as to prevent the `use_cache` parameter being part of the public API.
 
     """
     version = get_default_version_if_none(version)
 
-    paths = iati.resources.get_all_codelist_paths(version)
+    if version in _CODELISTS and use_cache:
+        _record_cache_access('codelists', True)
+        return _CODELISTS[version]
 
-    for path in paths:
-        _, filename = os.path.split(path)
-        name = filename[:-len(iati.resources.FILE_CODELIST_EXTENSION)]  # Get the name of the codelist, without the '.xml' file extension
-        if (name not in _CODELISTS[version].keys()) or not use_cache:
-            xml_str = iati.resources.load_as_string(path)
-            codelist_found = iati.Codelist(name, xml=xml_str)
-            _CODELISTS[version][name] = codelist_found
+    _record_cache_access('codelists', False)
+    if use_cache and _persistent_cache_directory() is not None:
+        _load_from_persistent_cache(version)
+    else:
+        _CODELISTS[version] = _load_codelists(version)
 
     return _CODELISTS[version]
 
 
-def codelists(version=None):
+def _load_codelists(version):
+    """Locate the default Codelists for the specified version of the Standard, without parsing them.
+
+    Args:
+        version (str): The version of the Standard to locate the Codelists for.
+
+    Returns:
+        _LazyCodelists: A mapping containing all the Codelists at the specified version of the Standard. Each Codelist is parsed when it is first accessed.
+
+    """
+    return _LazyCodelists(version)
+
+
+class _LazyCodelists(Mapping):
+    """A read-only mapping of the names of the default Codelists at a version of the Standard to the Codelists.
+
+    The names of the Codelists are found by listing the Codelist files. Each file is only parsed when its Codelist is first accessed, so a caller that needs a single Codelist does not parse the others.
+
+    """
+
+    def __init__(self, version, codelists_found=None):
+        """Initialise a mapping of Codelists.
+
+        Args:
+            version (str): The version of the Standard that the Codelists are at.
+            codelists_found (dict): Codelists that have already been parsed. Defaults to None. This means that the Codelist files are listed, and each is parsed when first accessed.
+
+        """
+        self._paths = OrderedDict()
+        self._codelists = dict()
+
+        if codelists_found is not None:
+            self._paths.update((name, None) for name in codelists_found)
+            self._codelists.update(codelists_found)
+            return
+
+        for path in iati.resources.get_all_codelist_paths(version):
+            _, filename = os.path.split(path)
+            name = filename[:-len(iati.resources.FILE_CODELIST_EXTENSION)]  # Get the name of the codelist, without the '.xml' file extension
+            self._paths[name] = path
+
+    def __getitem__(self, name):
+        """Return the Codelist with the specified name, parsing it if it has not yet been parsed.
+
+        Raises:
+            KeyError: When there is no Codelist with the specified name.
+
+        """
+        try:
+            return self._codelists[name]
+        except KeyError:
+            path = self._paths[name]
+
+        xml_str = iati.resources.load_as_string(path)
+        self._codelists[name] = iati.Codelist(name, xml=xml_str).freeze()
+
+        return self._codelists[name]
+
+    def __iter__(self):
+        """Iterate over the names of the Codelists, without parsing them."""
+        return iter(self._paths)
+
+    def __len__(self):
+        """Return the number of Codelists."""
+        return len(self._paths)
+
+    def __contains__(self, name):
+        """Determine whether there is a Codelist with the specified name, without parsing it."""
+        return name in self._paths
+
+    def load_all(self):
+        """Parse every Codelist that has not yet been parsed.
+
+        Returns:
+            dict: A dictionary containing all the Codelists. Keys are Codelist names. Values are frozen iati.Codelist() instances.
+
+        """
+        return {name: self[name] for name in self._paths}
+
+
+def codelists(version=None, mutable=False):
     """Return the default Codelists for the specified version of the Standard.
 
     Args:
         version (str): The version of the Standard to return the Codelists for. Defaults to None. This means that the latest version of the Codelists are returned.
+        mutable (bool): Whether to return copies of the Codelists that may be modified. Defaults to False. This means that frozen Codelists are returned, which are shared between all callers.
 
     Returns:
         dict: A dictionary containing all the Codelists at the specified version of the Standard. All Non-Embedded Codelists are included. Keys are Codelist names. Values are iati.Codelist() instances, populated with the relevant Codes.
 
     """
-    return _codelists(version)
+    codelists_found = _codelists(version, True).load_all()
+
+    if mutable:
+        return deepcopy(codelists_found)
+    return codelists_found
 
 
 def codelist_mapping(version=None):
@@ -156,9 +519,79 @@ def codelist_mapping(version=None):
     Returns:
         dict of dict: A dictionary containing mapping information. Keys in the first dictionary are Codelist names. Keys in the second dictionary are `xpath` and `condition`. The condition is `None` if there is no condition.
 
+    Raises:
+        ValueError: When a specified version is not a valid version of the IATI Standard.
+
     Todo:
         Make use of the `version` parameter.
 
+    """
+    return deepcopy(_codelist_mapping(version, True))
+
+
+_CODELIST_MAPPINGS = dict()
+"""A cache of loaded Codelist mappings.
+
+This removes the need to repeatedly load and parse the Codelist mapping file from disk each time it is accessed.
+
+The dictionary is structured as:
+
+{
+    "version_number_a": dict(codelist_mapping_a),
+    "version_number_b": dict(codelist_mapping_b),
+    [...]
+}
+
+Warning:
+    Modifying values directly obtained from this cache can potentially cause unexpected behavior. As such, it is highly recommended to perform a `deepcopy()` on any accessed Codelist mapping before it is modified in any way.
+
+"""
+
+
+def _codelist_mapping(version=None, use_cache=False):
+    """Locate the Codelist mapping for the specified version of the Standard.
+
+    Args:
+        version (str): The version of the Standard to return the mapping file for. Defaults to None. This means that the mapping file is returned for the latest version of the Standard.
+        use_cache (bool): Whether the cache should be used rather than loading the mapping file from disk again. If used, a `deepcopy()` should be performed on the returned value before it is modified.
+
+    Returns:
+        dict of dict: A dictionary containing mapping information, as returned by `codelist_mapping()`.
+
+    Raises:
+        ValueError: When a specified version is not a valid version of the IATI Standard.
+
+    Warning:
+        Setting `use_cache` to `True` is dangerous since it does not return a deep copy of the Codelist mapping. This means that modification of the returned value will modify it everywhere.
+
+    Note:
+        This is a private function so as to prevent the (dangerous) `use_cache` parameter being part of the public API.
+
+    """
+    version = get_default_version_if_none(version)
+
+    if version in _CODELIST_MAPPINGS and use_cache:
+        _record_cache_access('codelist_mappings', True)
+        return _CODELIST_MAPPINGS[version]
+
+    _record_cache_access('codelist_mappings', False)
+    if use_cache and _persistent_cache_directory() is not None:
+        _load_from_persistent_cache(version)
+    else:
+        _CODELIST_MAPPINGS[version] = _load_codelist_mapping(version)
+
+    return _CODELIST_MAPPINGS[version]
+
+
+def _load_codelist_mapping(version):
+    """Load and parse the Codelist mapping file for the specified version of the Standard.
+
+    Args:
+        version (str): The version of the Standard to load the mapping file for.
+
+    Returns:
+        dict of dict: A dictionary containing mapping information, as returned by `codelist_mapping()`.
+
     """
     path = iati.resources.get_codelist_mapping_path(version)
     mapping_tree = iati.resources.load_as_tree(path)
@@ -193,6 +626,73 @@ def ruleset(version=None):
     Raises:
         ValueError: When a specified version is not a valid version of the IATI Standard.
 
+    """
+    return deepcopy(_ruleset(version, True))
+
+
+_RULESETS = dict()
+"""A cache of loaded Standard Rulesets.
+
+This removes the need to repeatedly load and parse the Standard Ruleset from disk each time it is accessed.
+
+The dictionary is structured as:
+
+{
+    "version_number_a": iati.Ruleset(ruleset_a),
+    "version_number_b": iati.Ruleset(ruleset_b),
+    [...]
+}
+
+Warning:
+    Modifying values directly obtained from this cache can potentially cause unexpected behavior. As such, it is highly recommended to perform a `deepcopy()` on any accessed Ruleset before it is modified in any way.
+
+"""
+
+
+def _ruleset(version=None, use_cache=False):
+    """Locate the Standard Ruleset for the specified version of the Standard.
+
+    Args:
+        version (str): The version of the Standard to return the Ruleset for. Defaults to None. This means that the latest Standard Ruleset is returned.
+        use_cache (bool): Whether the cache should be used rather than loading the Ruleset from disk again. If used, a `deepcopy()` should be performed on the returned Ruleset before it is modified.
+
+    Returns:
+        iati.Ruleset: The default Ruleset for the specified version of the Standard.
+
+    Raises:
+        ValueError: When a specified version is not a valid version of the IATI Standard.
+
+    Warning:
+        Setting `use_cache` to `True` is dangerous since it does not return a deep copy of the Ruleset. This means that modification of the returned Ruleset will modify it everywhere.
+
+    Note:
+        This is a private function so as to prevent the (dangerous) `use_cache` parameter being part of the public API.
+
+    """
+    version = get_default_version_if_none(version)
+
+    if version in _RULESETS and use_cache:
+        _record_cache_access('rulesets', True)
+        return _RULESETS[version]
+
+    _record_cache_access('rulesets', False)
+    if use_cache and _persistent_cache_directory() is not None:
+        _load_from_persistent_cache(version)
+    else:
+        _RULESETS[version] = _load_ruleset(version)
+
+    return _RULESETS[version]
+
+
+def _load_ruleset(version):
+    """Load and parse the Standard Ruleset for the specified version of the Standard.
+
+    Args:
+        version (str): The version of the Standard to load the Ruleset for.
+
+    Returns:
+        iati.Ruleset: The Standard Ruleset for the specified version of the Standard.
+
     """
     path = iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_STANDARD_NAME, version)
     ruleset_str = iati.resources.load_as_string(path)
@@ -200,6 +700,25 @@ def ruleset(version=None):
     return iati.Ruleset(ruleset_str)
 
 
+_RULESET_SCHEMAS = dict()
+"""A cache of loaded Ruleset schemas.
+
+This removes the need to repeatedly load and parse the Ruleset schema from disk each time it is accessed.
+
+The dictionary is structured as:
+
+{
+    "version_number_a": dict(ruleset_schema_a),
+    "version_number_b": dict(ruleset_schema_b),
+    [...]
+}
+
+Warning:
+    Modifying values directly obtained from this cache can potentially cause unexpected behavior. As such, it is highly recommended to perform a `deepcopy()` on any accessed Ruleset schema before it is modified in any way.
+
+"""
+
+
 def ruleset_schema(version=None):
     """Return the Ruleset schema for the specified version of the Standard.
 
@@ -213,10 +732,41 @@ def ruleset_schema(version=None):
         ValueError: When a specified version is not a valid version of the IATI Standard.
 
     """
+    return deepcopy(_ruleset_schema(version, True))
+
+
+def _ruleset_schema(version=None, use_cache=False):
+    """Locate the Ruleset schema for the specified version of the Standard.
+
+    Args:
+        version (str): The version of the Standard to return the Ruleset for. Defaults to None. This means that the latest Ruleset schema is returned.
+        use_cache (bool): Whether the cache should be used rather than loading the Ruleset schema from disk again. If used, a `deepcopy()` should be performed on the returned value before it is modified.
+
+    Returns:
+        dict: A dictionary representing the Ruleset schema for the specified version of the Standard.
+
+    Raises:
+        ValueError: When a specified version is not a valid version of the IATI Standard.
+
+    Warning:
+        Setting `use_cache` to `True` is dangerous since it does not return a deep copy of the Ruleset schema. This means that modification of the returned value will modify it everywhere.
+
+    Note:
+        This is a private function so as to prevent the (dangerous) `use_cache` parameter being part of the public API.
+
+    """
+    version = get_default_version_if_none(version)
+
+    if version in _RULESET_SCHEMAS and use_cache:
+        _record_cache_access('ruleset_schemas', True)
+        return _RULESET_SCHEMAS[version]
+
+    _record_cache_access('ruleset_schemas', False)
     path = iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_SCHEMA_NAME, version)
     schema_str = iati.resources.load_as_string(path)
+    _RULESET_SCHEMAS[version] = json.loads(schema_str)
 
-    return json.loads(schema_str)
+    return _RULESET_SCHEMAS[version]
 
 
 _SCHEMAS = defaultdict(lambda: defaultdict(dict))
@@ -241,8 +791,32 @@ This removes the need to repeatedly load a Schema from disk each time it is acce
     [...]
 }
 
-Warning:
-    Modifying values directly obtained from this cache can potentially cause unexpected behavior. As such, it is highly recommended to perform a `deepcopy()` on any accessed Schema before it is modified in any way.
+Note:
+    The Schemas within this cache are frozen, so may be shared without being copied. A `deepcopy()` of a Schema may be modified.
+
+"""
+
+
+_SCHEMA_VALIDATORS = defaultdict(dict)
+"""A cache of compiled validators for the default Schemas.
+
+This removes the need to convert the XSD for a default Schema into an `etree.XMLSchema` each time a new copy of the Schema is loaded.
+
+The dictionary is structured as:
+
+{
+    "version_number_a": {
+        "iati-activities": etree.XMLSchema,
+        "iati-organisations": etree.XMLSchema
+    },
+    "version_number_b": {
+        [...]
+    },
+    [...]
+}
+
+Note:
+    Populated and unpopulated Schemas share a validator since Codelists and Rulesets do not form part of the XSD.
 
 """
 
@@ -282,36 +856,68 @@ def _schema(path_func, schema_class, version=None, populate=True, use_cache=Fals
         schema_class (type): A class definition for the Schema of interest.
         version (str): The version of the Standard to return the Schema for. Defaults to None. This means that the latest version of the Schema is returned.
         populate (bool): Whether the Schema should be populated with auxilliary information such as Codelists and Rulesets.
-        use_cache (bool): Whether the cache should be used rather than loading the Schema from disk again. If used, a `deepcopy()` should be performed on any returned Schema before it is modified.
+        use_cache (bool): Whether the cache should be used rather than loading the Schema from disk again.
 
     Raises:
         ValueError: When a specified version is not a valid version of the IATI Standard.
 
     Returns:
-        iati.Schema: An instantiated IATI Schema for the specified version.
+        iati.Schema: A frozen IATI Schema for the specified version.
 
     """
     population_key = 'populated' if populate else 'unpopulated'
 
     version = get_default_version_if_none(version)
 
-    schema_paths = path_func(version)
-
-    if (schema_class.ROOT_ELEMENT_NAME not in _SCHEMAS[version][population_key].keys()) or not use_cache:
+    if (schema_class.ROOT_ELEMENT_NAME in _SCHEMAS[version][population_key]) and use_cache:
+        _record_cache_access('schemas', True)
+        return _SCHEMAS[version][population_key][schema_class.ROOT_ELEMENT_NAME]
+
+    _record_cache_access('schemas', False)
+    if populate:
+        # the populated Schema is created from the unpopulated Schema so that the Schema file is only parsed once
+        unpopulated_schema = _schema(path_func, schema_class, version, False, use_cache)
+        schema = _populate_schema(deepcopy(unpopulated_schema), version)
+    else:
+        schema_paths = path_func(version)
         schema = schema_class(schema_paths[0])
-        if populate:
-            schema = _populate_schema(schema, version)
-        _SCHEMAS[version][population_key][schema_class.ROOT_ELEMENT_NAME] = schema
+        _use_schema_validator(schema, version)
+    _SCHEMAS[version][population_key][schema_class.ROOT_ELEMENT_NAME] = schema.freeze()
 
     return _SCHEMAS[version][population_key][schema_class.ROOT_ELEMENT_NAME]
 
 
-def activity_schema(version=None, populate=True):
+def _use_schema_validator(schema, version):
+    """Provide a default Schema with the validator that has been compiled for its type and version.
+
+    The validator is compiled the first time a Schema of a given type is loaded at a given version of the Standard.
+
+    Args:
+        schema (iati.Schema): A default Schema that has just been loaded from disk.
+        version (str): The version of the Standard that the Schema is at.
+
+    Raises:
+        iati.exceptions.SchemaError: An error occurred in the creation of the validator.
+
+    """
+    try:
+        validator = _SCHEMA_VALIDATORS[version][schema.ROOT_ELEMENT_NAME]
+    except KeyError:
+        _record_cache_access('schema_validators', False)
+        validator = schema.validator()
+        _SCHEMA_VALIDATORS[version][schema.ROOT_ELEMENT_NAME] = validator
+    else:
+        _record_cache_access('schema_validators', True)
+        schema._use_validator(validator)  # pylint: disable=protected-access
+
+
+def activity_schema(version=None, populate=True, mutable=False):
     """Return the default Activity Schema for the specified version of the Standard.
 
     Args:
         version (str): The version of the Standard to return the Schema for. Defaults to None. This means that the latest version of the Schema is returned.
         populate (bool): Whether the Schema should be populated with auxilliary information such as Codelists and Rulesets.
+        mutable (bool): Whether to return a copy of the Schema that may be modified. Defaults to False. This means that a frozen Schema is returned, which is shared between all callers.
 
     Raises:
         ValueError: When a specified version is not a valid version of the IATI Standard.
@@ -319,16 +925,24 @@ def activity_schema(version=None, populate=True):
     Returns:
         iati.ActivitySchema: An instantiated IATI Schema for the specified version of the Standard.
 
+    Note:
+        Returning a frozen Schema avoids loading it from disk again. Where a Schema is to be modified, either specify `mutable` or perform a `deepcopy()` of it.
+
     """
-    return _schema(iati.resources.get_all_activity_schema_paths, iati.ActivitySchema, version, populate)
+    schema = _schema(iati.resources.get_all_activity_schema_paths, iati.ActivitySchema, version, populate, True)
+
+    if mutable:
+        return deepcopy(schema)
+    return schema
 
 
-def organisation_schema(version=None, populate=True):
+def organisation_schema(version=None, populate=True, mutable=False):
     """Return the default Organisation Schema for the specified version of the Standard.
 
     Args:
         version (str): The version of the Standard to return the Schema for. Defaults to None. This means that the latest version of the Schema is returned.
         populate (bool): Whether the Schema should be populated with auxilliary information such as Codelists and Rulesets.
+        mutable (bool): Whether to return a copy of the Schema that may be modified. Defaults to False. This means that a frozen Schema is returned, which is shared between all callers.
 
     Raises:
         ValueError: When a specified version is not a valid version of the IATI Standard.
@@ -336,5 +950,12 @@ def organisation_schema(version=None, populate=True):
     Returns:
         iati.OrganisationSchema: An instantiated IATI Schema for the specified version of the Standard.
 
+    Note:
+        Returning a frozen Schema avoids loading it from disk again. Where a Schema is to be modified, either specify `mutable` or perform a `deepcopy()` of it.
+
     """
-    return _schema(iati.resources.get_all_organisation_schema_paths, iati.OrganisationSchema, version, populate)
+    schema = _schema(iati.resources.get_all_organisation_schema_paths, iati.OrganisationSchema, version, populate, True)
+
+    if mutable:
+        return deepcopy(schema)
+    return schema
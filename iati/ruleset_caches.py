@@ -0,0 +1,120 @@
+"""A module containing caches of the data used to create Rules and check them against Datasets.
+
+This includes the sections of the Ruleset Schema for each type of Rule, along with the dates that are parsed when Rules are checked.
+"""
+import re
+from collections import OrderedDict
+from datetime import datetime
+import jsonschema
+import iati.default
+
+
+_SCHEMA_VALIDATORS = dict()
+"""A cache of the Ruleset Schema and the sections of it relevant to each type of Rule, along with a validator for each.
+
+This removes the need to load the Ruleset Schema and create a validator each time a Ruleset or Rule is created.
+
+The dictionary is structured as:
+
+{
+    None: (dict(ruleset_schema), jsonschema validator),
+    "rule_type_a": (dict(partial_schema_a), jsonschema validator),
+    "rule_type_b": (dict(partial_schema_b), jsonschema validator),
+    [...]
+}
+
+Warning:
+    Modifying values directly obtained from this cache will modify the checks performed for every subsequently created Ruleset or Rule.
+
+"""
+
+
+def schema_validator(rule_type=None):
+    """Locate the section of the Ruleset Schema for a type of Rule, along with a validator for it.
+
+    Within the section, all properties other than `condition` are required, and any `paths` array must not be empty.
+
+    Args:
+        rule_type (str): The type of Rule to locate the section of the Ruleset Schema for. Defaults to None, meaning the whole Ruleset Schema is returned.
+
+    Returns:
+        tuple: The relevant section of the Ruleset Schema (dict), followed by a jsonschema validator for it.
+
+    Raises:
+        KeyError: When a non-permitted `rule_type` is provided.
+
+    """
+    try:
+        return _SCHEMA_VALIDATORS[rule_type]
+    except KeyError:
+        pass
+
+    schema = iati.default.ruleset_schema()
+    if rule_type is not None:
+        schema = schema['patternProperties']['.+']['properties'][rule_type]['properties']['cases']['items']
+        # make all attributes other than 'condition' in the partial schema required
+        schema['required'] = [key for key in schema['properties'].keys() if key != 'condition']
+        # ensure that the 'paths' array is not empty
+        if 'paths' in schema['properties'].keys():
+            schema['properties']['paths']['minItems'] = 1
+
+    validator_class = jsonschema.validators.validator_for(schema)
+    _SCHEMA_VALIDATORS[rule_type] = (schema, validator_class(schema))
+
+    return _SCHEMA_VALIDATORS[rule_type]
+
+
+_ISO_DATE_PATTERN = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$')
+"""A compiled regular expression matching a YYYY-MM-DD date string that can be parsed without `datetime.strptime()`."""
+
+_PARSED_DATES = OrderedDict()
+"""A cache of parsed date strings, ordered from least to most recently used.
+
+Dates repeat heavily within a Dataset, so this removes the need to repeatedly parse the same date string.
+
+The dictionary is structured as:
+
+{
+    "YYYY-MM-DD": datetime.datetime(YYYY, MM, DD),
+    [...]
+}
+
+Warning:
+    The cache is limited to `_PARSED_DATES_MAX_SIZE` dates. The least recently used date is removed when the limit is reached.
+
+"""
+
+_PARSED_DATES_MAX_SIZE = 4096
+"""int: The maximum number of parsed dates to cache."""
+
+
+def parse_date(date_str):
+    """Parse a YYYY-MM-DD date string, using a cache of previously parsed date strings.
+
+    Args:
+        date_str (str): A date string of the form YYYY-MM-DD.
+
+    Returns:
+        datetime.datetime: The parsed date.
+
+    Raises:
+        ValueError: When the string is not a valid date of the form YYYY-MM-DD.
+
+    """
+    try:
+        parsed_date = _PARSED_DATES.pop(date_str)
+    except KeyError:
+        if _ISO_DATE_PATTERN.match(date_str):
+            parsed_date = datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+        else:
+            parsed_date = datetime.strptime(date_str, '%Y-%m-%d')
+
+        if len(_PARSED_DATES) >= _PARSED_DATES_MAX_SIZE:
+            try:
+                _PARSED_DATES.popitem(last=False)
+            except KeyError:
+                pass
+
+    _PARSED_DATES[date_str] = parsed_date
+
+    return parsed_date
@@ -0,0 +1,191 @@
+"""A module containing the results of checking Datasets against Rulesets, including when Datasets are checked within worker processes."""
+import iati.data
+
+
+RESULT_CODES = {True: 0, False: 1, None: 2}
+"""A mapping from the result of checking a context element against a Rule to the code used to store it within RulesetResults."""
+
+RESULTS_FROM_CODES = (True, False, None)
+"""The result of checking a context element against a Rule for each code used within RulesetResults."""
+
+
+class RulesetResults(object):
+    """The result of checking every context element within a Dataset against every Rule within a Ruleset.
+
+    The results form a matrix of Rules against the context elements for each Rule. The result for a context element is one of:
+
+        `True` when the context element passes the Rule.
+
+        `False` when the context element does not pass the Rule.
+
+        `None` when a condition is met to skip validation of the context element.
+
+    Each context element is identified by its source line number and the identifier of the Activity or Organisation that contains it.
+
+    Attributes:
+        rules (list of iati.Rule): The Rules that were checked.
+
+    Note:
+        Results are stored as one byte per Rule per context element, rather than as Python objects.
+
+    """
+
+    def __init__(self):
+        """Initialise a set of RulesetResults."""
+        self.rules = list()
+        self._context_elements = dict()
+        self._result_codes = dict()
+
+    def __len__(self):
+        """Return the number of Rules with results."""
+        return len(self.rules)
+
+    def _add_context(self, context, context_element_details):
+        """Add the details of the context elements located for a context.
+
+        Args:
+            context (str): The context that the elements were located with.
+            context_element_details (list of tuple): The line number and identifier for each context element.
+
+        """
+        self._context_elements[context] = context_element_details
+
+    def _add_rule(self, rule, result_codes):
+        """Add the results for a Rule.
+
+        Args:
+            rule (iati.Rule): The Rule that was checked.
+            result_codes (bytearray): The code for the result of each context element, in the order that the context elements were located.
+
+        """
+        self.rules.append(rule)
+        self._result_codes[rule] = result_codes
+
+    def context_elements_for(self, rule):
+        """Locate the details of the context elements that a Rule was checked against.
+
+        Args:
+            rule (iati.Rule): The Rule to locate context elements for.
+
+        Returns:
+            list of tuple of (int, str): The source line number and the Activity or Organisation identifier for each context element.
+
+        Raises:
+            KeyError: When there are no results for the Rule.
+
+        """
+        return self._context_elements[rule.context]
+
+    def results_for(self, rule):
+        """Locate the result of checking each context element against a Rule.
+
+        Args:
+            rule (iati.Rule): The Rule to locate results for.
+
+        Returns:
+            list of bool or None: The result for each context element, in the same order as `context_elements_for()`.
+
+        Raises:
+            KeyError: When there are no results for the Rule.
+
+        """
+        return [RESULTS_FROM_CODES[code] for code in self._result_codes[rule]]
+
+    def failures_for(self, rule):
+        """Locate the context elements that do not pass a Rule.
+
+        Args:
+            rule (iati.Rule): The Rule to locate failures for.
+
+        Returns:
+            list of tuple of (int, str): The source line number and the Activity or Organisation identifier for each context element that does not pass the Rule.
+
+        Raises:
+            KeyError: When there are no results for the Rule.
+
+        """
+        failure_code = RESULT_CODES[False]
+        context_elements = self.context_elements_for(rule)
+
+        return [context_elements[index] for index, code in enumerate(self._result_codes[rule]) if code == failure_code]
+
+    def failures(self):
+        """Locate every context element that does not pass a Rule.
+
+        Returns:
+            list of tuple of (iati.Rule, int, str): Each Rule, along with the source line number and the Activity or Organisation identifier of a context element that does not pass it.
+
+        """
+        return [(rule, line_number, identifier) for rule in self.rules for line_number, identifier in self.failures_for(rule)]
+
+
+_WORKER_RULESET = None
+"""iati.Ruleset: The Ruleset that Datasets are checked against within a worker process started by `iati.Ruleset.evaluate_many()`."""
+
+
+def initialise_worker(ruleset):
+    """Set the Ruleset that Datasets are checked against within a worker process.
+
+    Args:
+        ruleset (iati.Ruleset): The Ruleset to check Datasets against. Its Rules are compiled once when it is unpickled within the worker.
+
+    """
+    global _WORKER_RULESET  # pylint: disable=global-statement
+    _WORKER_RULESET = ruleset
+
+
+def results_in_worker(dataset_details):
+    """Check a Dataset against the Ruleset of a worker process.
+
+    Args:
+        dataset_details (tuple of (str, list) or None): The XML of the Dataset to check, along with the source line number of each node within it.
+            Line numbers are as given by `Dataset._source_line_numbers()`. `None` when something other than a Dataset was given to be checked.
+
+    Returns:
+        tuple of (dict, list) or None: The details of the context elements for each context, and the result codes for each Rule. `None` when no XML is given.
+            Rules are identified by their position within the Ruleset, since Rules within the worker are copies of those that the results are returned to.
+
+    """
+    if dataset_details is None:
+        return None
+
+    xml_str, source_line_numbers = dataset_details
+    dataset = iati.data.Dataset(xml_str)
+    line_numbers = None
+    if source_line_numbers is not None:
+        line_numbers = dict(zip(dataset.xml_tree.iter(), source_line_numbers))
+
+    results = _WORKER_RULESET._results_for_each_context_element(dataset, line_numbers)  # pylint: disable=protected-access
+    rule_positions = dict((rule, position) for position, rule in enumerate(_WORKER_RULESET.rules))
+
+    return results._context_elements, [(rule_positions[rule], results._result_codes[rule]) for rule in results.rules]  # pylint: disable=protected-access
+
+
+def context_element_details(context_element, line_numbers=None):
+    """Determine the details used to identify a context element in RulesetResults.
+
+    Args:
+        context_element (etree._Element): A context element located by a Rule.
+        line_numbers (dict): The source line number of each element, keyed by element. Defaults to None, meaning that the `sourceline` of the element is used.
+
+    Returns:
+        tuple of (int, str): The source line number of the element and the identifier of the Activity or Organisation that contains it. Either may be `None` when it cannot be determined.
+
+    """
+    if line_numbers is None:
+        line_number = getattr(context_element, 'sourceline', None)
+    else:
+        line_number = line_numbers.get(context_element)
+
+    try:
+        ancestors = [context_element] + list(context_element.iterancestors())
+    except AttributeError:
+        return line_number, None
+
+    for ancestor in ancestors:
+        if ancestor.tag == 'iati-activity':
+            return line_number, ancestor.findtext('iati-identifier')
+        elif ancestor.tag == 'iati-organisation':
+            return line_number, ancestor.findtext('organisation-identifier')
+
+    return line_number, None
@@ -7,14 +7,23 @@ Todo:
 
 """
 # no-member errors are due to using `setattr()` # pylint: disable=no-member
+# pylint: disable=too-many-lines
 import decimal
 import json
+import multiprocessing
 import re
 import sre_constants
+import timeit
+from collections import Counter, OrderedDict
+from copy import deepcopy
 from datetime import datetime
 import jsonschema
+from lxml import etree
 import six
+import iati.data
 import iati.default
+import iati.ruleset_caches
+import iati.ruleset_results
 import iati.utilities
 
 
@@ -49,8 +58,27 @@ def constructor_for_rule_type(rule_type):
     return possible_rule_types[rule_type]
 
 
+_DATE_TIMEZONE_PATTERN = re.compile(r'^([+-]([01][0-9]|2[0-3]):([0-5][0-9])|Z)?$')
+"""A compiled regular expression matching the timezone characters that are permitted after a YYYY-MM-DD date string."""
+
+_PATH_STEP = r'@?(\*|[A-Za-z_][\w.-]*(:[A-Za-z_][\w.-]*)?)(\[[^\[\]/]*\])*'
+"""str: A regular expression matching a single child element or attribute step of an XPath, with any predicates that do not contain a `/`."""
+
+_CHILD_STEPS_PATTERN = re.compile(r'^(\./)*{0}(/{0})*$'.format(_PATH_STEP))
+"""A compiled regular expression matching XPaths that consist only of child element and attribute steps, optionally following leading `./` steps.
+
+Anything located by such an XPath is a fixed number of steps below the element that the XPath is evaluated against.
+"""
+
+
 class Ruleset(object):
-    """Representation of a Ruleset as defined within the IATI SSOT."""
+    """Representation of a Ruleset as defined within the IATI SSOT.
+
+    Attributes:
+        frozen (bool): Whether the Ruleset has been frozen, so cannot be modified.
+        rules (iati.utilities.OrderedSet): The Rules within the Ruleset.
+
+    """
 
     def __init__(self, ruleset_str=None):
         """Initialise a Ruleset.
@@ -63,6 +91,8 @@ class Ruleset(object):
             ValueError: When `ruleset_str` does not validate against the Ruleset Schema or cannot be correctly decoded.
 
         """
+        self._frozen = False
+
         if ruleset_str is None:
             ruleset_str = ''
 
@@ -76,9 +106,70 @@ class Ruleset(object):
             else:
                 raise ValueError('Provided Ruleset string is not valid JSON.')
         self.validate_ruleset()
-        self.rules = set()
+        self.rules = iati.utilities.OrderedSet()
         self._set_rules()
 
+    def __deepcopy__(self, memo):
+        """Create a deep copy of the Ruleset.
+
+        The copy is not frozen, even when the Ruleset is. This is the way to obtain a version of a frozen Ruleset that may be modified.
+
+        Args:
+            memo (dict): A dictionary of objects already copied during the current copying pass.
+
+        Returns:
+            iati.Ruleset: A deep copy of the Ruleset.
+
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for key, value in self.__dict__.items():
+            if key != '_frozen':
+                setattr(copied, key, deepcopy(value, memo))
+
+        copied.rules = iati.utilities.OrderedSet(copied.rules)
+        copied._frozen = False  # pylint: disable=protected-access
+
+        return copied
+
+    def __setattr__(self, name, value):
+        """Set an attribute of the Ruleset.
+
+        Raises:
+            AttributeError: When the Ruleset is frozen.
+
+        """
+        if getattr(self, '_frozen', False):
+            raise AttributeError("The Ruleset is frozen, so cannot be modified. A `deepcopy()` of it may be modified.")
+
+        super(Ruleset, self).__setattr__(name, value)
+
+    @property
+    def frozen(self):
+        """bool: Whether the Ruleset has been frozen, so cannot be modified."""
+        return self._frozen
+
+    def freeze(self):
+        """Prevent the Ruleset and its Rules from being modified.
+
+        Once frozen, a Ruleset may be shared without being copied. Attempts to set its attributes, or those of its Rules, raise an AttributeError.
+
+        Its `rules` become an iati.utilities.FrozenOrderedSet, so the Rules cannot be added to, removed or reordered.
+
+        Returns:
+            iati.Ruleset: The Ruleset, which is now frozen.
+
+        Note:
+            A frozen Ruleset cannot be unfrozen. A `deepcopy()` of it is not frozen, so may be modified.
+
+        """
+        if not self._frozen:
+            self.rules = iati.utilities.FrozenOrderedSet(rule.freeze() for rule in self.rules)
+            self._frozen = True
+
+        return self
+
     def is_valid_for(self, dataset):
         """Validate a Dataset against the Ruleset.
 
@@ -95,14 +186,252 @@ class Ruleset(object):
             Better design how Skips and ValueErrors are treated. The current True/False/Skip/Error thing is a bit clunky.
 
         """
+        try:
+            for _, result in self._results_for(dataset):
+                if result is False:
+                    return False
+        except ValueError:
+            return False
+
+        return True
+
+    def results_for(self, dataset):
+        """Check every context element within a Dataset against every Rule in the Ruleset.
+
+        Unlike `is_valid_for()`, checking does not stop at the first context element that does not pass a Rule. The context elements for each context are located once, then checked against every Rule with that context in a single pass.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked against the Rules.
+
+        Returns:
+            iati.ruleset_results.RulesetResults: The result of checking each context element against each Rule.
+
+        Raises:
+            TypeError: When a Dataset is not given as an argument.
+
+        """
+        return self._results_for_each_context_element(dataset)
+
+    def _results_for_each_context_element(self, dataset, line_numbers=None):
+        """Check every context element within a Dataset against every Rule in the Ruleset.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked against the Rules.
+            line_numbers (dict): The source line number of each element within the Dataset, keyed by element. Defaults to None, meaning that the `sourceline` of each context element is used.
+
+        Returns:
+            iati.ruleset_results.RulesetResults: As per `results_for()`.
+
+        Raises:
+            TypeError: When a Dataset is not given as an argument.
+
+        """
+        results = iati.ruleset_results.RulesetResults()
+        today = datetime.today()
+
+        for context, rules in self._rules_by_context().items():
+            try:
+                context_elements = rules[0]._find_context_elements(dataset)  # pylint: disable=protected-access
+            except AttributeError:
+                raise TypeError
+
+            result_codes = dict((rule, bytearray(len(context_elements))) for rule in rules)
+
+            for index, context_element in enumerate(context_elements):
+                for rule in rules:
+                    result = rule._result_for_context_element(context_element, today)  # pylint: disable=protected-access
+                    result_codes[rule][index] = iati.ruleset_results.RESULT_CODES[result]
+
+            results._add_context(context, [iati.ruleset_results.context_element_details(context_element, line_numbers) for context_element in context_elements])  # pylint: disable=protected-access
+            for rule in rules:
+                results._add_rule(rule, result_codes[rule])  # pylint: disable=protected-access
+
+        return results
+
+    def evaluate_many(self, datasets, workers=None, chunksize=1):
+        """Check each of a number of Datasets against the Ruleset.
+
+        The Rules of the Ruleset are compiled once and reused for every Dataset. When using worker processes, the Ruleset is sent to each worker once, and each Dataset is sent as a string of XML.
+
+        Where a Dataset was created from a tree, the line numbers within the tree are sent along with it, so that the same line numbers are given as by `results_for()`.
+
+        Args:
+            datasets (iterable of iati.Dataset): The Datasets to be checked against the Ruleset.
+            workers (int): The number of worker processes to check Datasets with. Defaults to None, meaning that Datasets are checked one at a time within the current process.
+            chunksize (int): The number of Datasets to send to a worker process at once. Defaults to 1.
+
+        Yields:
+            iati.ruleset_results.RulesetResults: The result of `results_for()` for each Dataset, in the same order as `datasets`. Results are yielded as soon as they are available.
+
+        Raises:
+            TypeError: When something other than a Dataset is given.
+
+        Warning:
+            The Rules of the Ruleset should not be changed while Datasets are being checked.
+
+        """
+        if workers is None:
+            for dataset in datasets:
+                yield self.results_for(dataset)
+            return
+
+        pool = multiprocessing.Pool(workers, initializer=iati.ruleset_results.initialise_worker, initargs=(self,))
+        try:
+            rules = list(self.rules)
+            for worker_results in pool.imap(iati.ruleset_results.results_in_worker, self._datasets_for_workers(datasets), chunksize):
+                if worker_results is None:
+                    raise TypeError
+                context_elements, rule_result_codes = worker_results
+
+                results = iati.ruleset_results.RulesetResults()
+                for context, context_element_details in context_elements.items():
+                    results._add_context(context, context_element_details)  # pylint: disable=protected-access
+                for position, result_codes in rule_result_codes:
+                    results._add_rule(rules[position], result_codes)  # pylint: disable=protected-access
+                yield results
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _datasets_for_workers(self, datasets):  # pylint: disable=no-self-use
+        """Convert Datasets into strings of XML that can be sent to a worker process.
+
+        Args:
+            datasets (iterable of iati.Dataset): The Datasets to convert.
+
+        Yields:
+            tuple of (str, list) or None: The XML of each Dataset, along with the result of `Dataset._source_line_numbers()`. `None` in place of anything that is not a Dataset.
+
+        Note:
+            Errors are not raised here, since this is run within a separate thread of the worker pool.
+
+        """
+        for dataset in datasets:
+            if isinstance(dataset, iati.data.Dataset):
+                yield dataset.xml_str, dataset._source_line_numbers()  # pylint: disable=protected-access
+            else:
+                yield None
+
+    def _results_for(self, dataset):
+        """Check a Dataset against each Rule in the Ruleset.
+
+        Rules are grouped by their context. The context elements for each group are located once, then every Rule in the group is checked against each context element in turn.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked against the Rules.
+
+        Yields:
+            tuple of (iati.Rule, bool or None): Each Rule, along with the result of `Rule.is_valid_for()` for the Dataset. Rules are yielded as soon as their result is known.
+
+        Raises:
+            TypeError: When a Dataset is not given as an argument.
+            ValueError: When a check encounters a completely incorrect value that it is unable to recover from within the definition of a Rule.
+
+        """
+        today = datetime.today()
+
+        for rules in self._rules_by_context().values():
+            try:
+                context_elements = rules[0]._find_context_elements(dataset)  # pylint: disable=protected-access
+            except AttributeError:
+                raise TypeError
+
+            for rule_result in self._results_for_context_elements(dataset, rules, context_elements, today):
+                yield rule_result
+
+    def _results_for_context_elements(self, dataset, rules, context_elements, today):  # pylint: disable=no-self-use,protected-access
+        """Check a group of Rules that share a context against the context elements that have been located for them.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked against the Rules.
+            rules (list of iati.Rule): The Rules that share a context.
+            context_elements (list of etree._Element): The context elements for the Rules within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW` throughout the run.
+
+        Yields:
+            tuple of (iati.Rule, bool or None): Each Rule, along with its result for the Dataset.
+
+        """
+        pending_rules = list()
+        for rule in rules:
+            if context_elements == list() or rule._checks_all_context_elements_at_once():
+                yield rule, rule._is_valid_for_context_elements(dataset, context_elements, today)
+            else:
+                pending_rules.append(rule)
+
+        for context_element in context_elements:
+            for rule in list(pending_rules):
+                rule_check_result = rule._check_context_element(context_element, today)
+                if rule_check_result is False or rule_check_result is None:
+                    pending_rules.remove(rule)
+                    yield rule, rule._result_from_context_checks(rule_check_result)
+
+            if not pending_rules:
+                break
+
+        for rule in pending_rules:
+            yield rule, rule._result_from_context_checks(True)
+
+    def _rules_by_context(self):
+        """Group the Rules of the Ruleset by their context.
+
+        Returns:
+            collections.OrderedDict: The Rules of the Ruleset, keyed by context. Each value is a list of iati.Rule. Contexts and Rules are in the same order as the Rules of the Ruleset.
+
+        """
+        rules_by_context = OrderedDict()
+
+        for rule in self.rules:
+            rules_by_context.setdefault(rule.context, list()).append(rule)
+
+        return rules_by_context
+
+    def order_rules_by_cost(self, timings=None):
+        """Order the Rules of the Ruleset so that the cheapest Rules are checked first.
+
+        When checking stops at the first Rule that does not pass, this means that a failing Rule is found as early as possible. Rules with the same cost keep their existing order.
+
+        Args:
+            timings (dict): The time taken by each Rule to check a Dataset, keyed by Rule, such as from `rule_timings()`. Defaults to None, meaning that a static cost model of each type of Rule is used instead.
+
+        Raises:
+            AttributeError: When the Ruleset is frozen.
+
+        Note:
+            Rules that share a context are checked together. As such, the context of the cheapest Rule is checked first, along with each of the other Rules that share it.
+
+        """
+        if timings is None:
+            ordered_rules = sorted(self.rules, key=lambda rule: rule._estimated_cost())  # pylint: disable=protected-access
+        else:
+            ordered_rules = sorted(self.rules, key=lambda rule: timings.get(rule, float('inf')))
+
+        self.rules = iati.utilities.OrderedSet(ordered_rules)
+
+    def rule_timings(self, dataset):
+        """Time how long each Rule in the Ruleset takes to check a Dataset.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked against each Rule.
+
+        Returns:
+            dict: The number of seconds taken by each Rule, keyed by Rule.
+
+        Raises:
+            TypeError: When a Dataset is not given as an argument.
+
+        """
+        timings = dict()
+
         for rule in self.rules:
+            start_time = timeit.default_timer()
             try:
-                if rule.is_valid_for(dataset) is False:
-                    return False
+                rule.is_valid_for(dataset)
             except ValueError:
-                return False
+                pass
+            timings[rule] = timeit.default_timer() - start_time
 
-        return True
+        return timings
 
     def validate_ruleset(self):
         """Validate a Ruleset against the Ruleset Schema.
@@ -111,8 +440,10 @@ class Ruleset(object):
             ValueError: When `ruleset_str` does not validate against the Ruleset Schema.
 
         """
+        _, validator = iati.ruleset_caches.schema_validator()
+
         try:
-            jsonschema.validate(self.ruleset, iati.default.ruleset_schema())
+            validator.validate(self.ruleset)
         except jsonschema.ValidationError:
             raise ValueError
 
@@ -139,12 +470,22 @@ class Rule(object):
         name (str): The type of Rule, as specified in a JSON Ruleset.
         context (str): An XPath expression to locate the elements that the Rule is to be checked against.
         case (dict): Specific configuration for this instance of the Rule.
+        frozen (bool): Whether the Rule has been frozen, so cannot be modified.
 
     Todo:
         Determine whether this should be an Abstract Base Class.
 
     """
 
+    _COMBINE_PATHS = False
+    """bool: Whether text at the `paths` of every context element may be checked at once, rather than one context element at a time."""
+
+    _COMBINED_PATHS_BY_CONTEXT = False
+    """bool: Whether values located with combined paths must be attributed to the context element that contains them. This requires each of the `paths` to consist only of child element and attribute steps."""
+
+    _COST = 1
+    """int: The relative cost of checking each of the `paths` of a context element against this type of Rule."""
+
     def __init__(self, context, case):
         """Initialise a Rule.
 
@@ -157,16 +498,262 @@ class Rule(object):
             ValueError: When a rule_type is not one of the permitted Rule types.
 
         """
+        self._frozen = False
         self.case = case
         self.context = self._validated_context(context)
         self._valid_rule_configuration(case)
         self._set_case_attributes(case)
         self._normalize_xpaths()
+        self._compile_xpaths()
+
+    def __deepcopy__(self, memo):
+        """Create a deep copy of the Rule.
+
+        Compiled XPath expressions cannot be copied, so are compiled again for the copy. Compiled regular expressions are immutable, so are shared with the copy.
+
+        Args:
+            memo (dict): A dictionary of objects already copied during the current copying pass.
+
+        Returns:
+            iati.Rule: A deep copy of the Rule.
+
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for key, value in self.__dict__.items():
+            if key == '_pattern':
+                # python2/3 - compiled regular expressions cannot be deep copied in Python 2
+                setattr(copied, key, value)
+            elif key not in ['_frozen', '_xpaths']:
+                setattr(copied, key, deepcopy(value, memo))
+
+        copied._frozen = False  # pylint: disable=protected-access
+        copied._compile_xpaths()
+
+        return copied
+
+    def __setattr__(self, name, value):
+        """Set an attribute of the Rule.
+
+        Raises:
+            AttributeError: When the Rule is frozen.
+
+        Note:
+            Compiled XPath expressions may still be set against a frozen Rule, since they are compiled again when the Rule is unpickled. Doing so does not change what the Rule represents.
+
+        """
+        if getattr(self, '_frozen', False) and name != '_xpaths':
+            raise AttributeError("The {0} Rule is frozen, so cannot be modified. A `deepcopy()` of it may be modified.".format(self.name))
+
+        super(Rule, self).__setattr__(name, value)
+
+    def __getstate__(self):
+        """Return the state of the Rule to pickle.
+
+        Compiled XPath expressions cannot be pickled, so are excluded. They are compiled again when the Rule is unpickled.
+
+        Returns:
+            dict: The attributes of the Rule, other than its compiled XPath expressions.
+
+        """
+        state = self.__dict__.copy()
+        state.pop('_xpaths', None)
+
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of an unpickled Rule.
+
+        Args:
+            state (dict): The attributes of the Rule, as given by `__getstate__()`.
+
+        """
+        self.__dict__.update(state)
+        self._compile_xpaths()
 
     def __str__(self):
         """Return string to state what the Rule is checking."""
         return 'This is a Rule.'
 
+    @property
+    def frozen(self):
+        """bool: Whether the Rule has been frozen, so cannot be modified."""
+        return self._frozen
+
+    def freeze(self):
+        """Prevent the Rule from being modified.
+
+        Returns:
+            iati.Rule: The Rule, which is now frozen.
+
+        Note:
+            A frozen Rule cannot be unfrozen. A `deepcopy()` of it is not frozen, so may be modified.
+
+        """
+        self._frozen = True
+
+        return self
+
+    def _estimated_cost(self):
+        """Estimate the relative cost of checking a context element against the Rule.
+
+        Returns:
+            int: The cost of the type of Rule, multiplied by the number of `paths` that the Rule has.
+
+        """
+        return self._COST * max(len(getattr(self, 'paths', [])), 1)
+
+    def _compile_xpaths(self):
+        """Compile each of the XPath expressions used by the Rule so that they are not compiled again for every element that the Rule is checked against.
+
+        Note:
+            Values that cannot be compiled are not valid XPath expressions. They are left uncompiled so that errors are raised when the Rule is checked, as they would be otherwise.
+
+        """
+        self._xpaths = dict()
+
+        for path in self._xpaths_to_compile():
+            try:
+                self._xpaths[path] = etree.XPath(path)
+            except etree.XPathSyntaxError:
+                pass
+
+    def _xpaths_to_compile(self):
+        """Locate the XPath expressions that are used by the Rule.
+
+        Returns:
+            list of str: The `context`, plus each of the `paths`, `condition`, `less`, `more` and `start` that the Rule has.
+
+        """
+        xpaths = [self.context] + list(getattr(self, 'paths', []))
+
+        for attrib in ['condition', 'less', 'more', 'start']:
+            try:
+                xpaths.append(getattr(self, attrib))
+            except AttributeError:
+                pass
+
+        xpaths.extend(self._combined_paths() or [])
+
+        return [xpath for xpath in xpaths if xpath != getattr(self, 'special_case', None)]
+
+    def _combined_paths(self):
+        """Combine `context` with each of the `paths`, so that the text at the `paths` within every context element can be located with a single XPath query per path.
+
+        Returns:
+            list of str or None: The combined XPaths. None when the type of Rule does not check context elements independently of one another, when the Rule has a condition, or when the XPaths cannot safely be combined.
+
+        Note:
+            XPaths containing a union (`|`) or starting at the root (`/`) are not combined, since joining them with `/` would change their meaning.
+
+        """
+        if not self._COMBINE_PATHS or hasattr(self, 'condition'):
+            return None
+
+        if '|' in self.context or any('|' in path or path.startswith('/') for path in self.paths):
+            return None
+
+        if self._COMBINED_PATHS_BY_CONTEXT and not all(_CHILD_STEPS_PATTERN.match(path) for path in self.paths):
+            return None
+
+        return [self._normalize_xpath(path) for path in self.paths]
+
+    def _values_in_all_contexts(self, dataset, context_elements):
+        """Locate the text at each of the unique `paths` within every context element of a Dataset at once, along with the context element that contains it.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to locate text within.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+
+        Returns:
+            list of tuple of (int, int, str) or None: A row for each value located. None when the values cannot be located at once, or when there are no context elements.
+                Each row contains the position of the context element containing the value within `context_elements`, the position of the path within the unique `paths`, and the text of the value.
+
+        """
+        if not self._COMBINED_PATHS_BY_CONTEXT or self._combined_paths() is None:
+            return None
+
+        if context_elements == list():
+            return None
+
+        context_positions = dict((context_element, position) for position, context_element in enumerate(context_elements))
+        values = list()
+
+        for path_position, path in enumerate(self._unique_paths()):
+            steps = [step for step in path.split('/') if step != '.']
+            locates_attributes = steps[-1].startswith('@')
+            # the parent of an attribute is the element that it is on, which is one step closer to the context element
+            parent_steps = range(len(steps) - 1) if locates_attributes else range(len(steps))
+
+            for result in self._evaluate_xpath(dataset.xml_tree, self._normalize_xpath(path)):
+                if locates_attributes:
+                    value = result
+                    element = result.getparent()
+                else:
+                    value = '' if result.text is None else result.text
+                    element = result
+
+                for _ in parent_steps:
+                    element = element.getparent()
+
+                try:
+                    values.append((context_positions[element], path_position, value))
+                except KeyError:
+                    return None
+
+        return values
+
+    def _unique_paths(self):
+        """Locate the unique `paths` of the Rule.
+
+        Returns:
+            list of str: The `paths` of the Rule, without duplicates, in the order that they were first given.
+
+        """
+        return list(OrderedDict.fromkeys(self.paths))
+
+    def _text_in_all_contexts(self, dataset, context_elements):
+        """Locate the text at each of the `paths` within every context element of a Dataset at once.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to locate text within.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+
+        Returns:
+            list of str or None: The text at each of the `paths` within every context element. None when the text cannot be located at once, or when there are no context elements.
+
+        """
+        if self._combined_paths() is None:
+            return None
+
+        if context_elements == list():
+            return None
+
+        strings = list()
+        for path in self._combined_paths():
+            strings.extend(self._extract_text_from_element_or_attribute(dataset.xml_tree, path))
+
+        return strings
+
+    def _evaluate_xpath(self, element, path):
+        """Evaluate an XPath expression used by the Rule against an element.
+
+        Args:
+            element (etree._Element or etree._ElementTree): The element to evaluate the XPath against.
+            path (str): The XPath expression, as given in the Rule.
+
+        Returns:
+            list or bool or float or str: The result of the XPath query.
+
+        """
+        try:
+            compiled_xpath = self._xpaths[path]
+        except KeyError:
+            return element.xpath(path)
+
+        return compiled_xpath(element)
+
     def _validated_context(self, context):
         """Check that a valid `context` is given for a Rule.
 
@@ -237,8 +824,10 @@ class Rule(object):
             The `name` attribute on the class must be set to a valid rule_type before this function is called.
 
         """
+        _, validator = iati.ruleset_caches.schema_validator(self.name)
+
         try:
-            jsonschema.validate(case, self._ruleset_schema_section())
+            validator.validate(case)
         except jsonschema.ValidationError:
             raise ValueError
 
@@ -252,11 +841,13 @@ class Rule(object):
             Set non-required properties such as a `condition`.
 
         """
-        required_attributes = self._case_attributes(self._ruleset_schema_section())
+        partial_schema = self._ruleset_schema_section()
+
+        required_attributes = self._case_attributes(partial_schema)
         for attrib in required_attributes:
             setattr(self, attrib, case[attrib])
 
-        optional_attributes = self._case_attributes(self._ruleset_schema_section(), False)
+        optional_attributes = self._case_attributes(partial_schema, False)
         for attrib in optional_attributes:
             try:
                 setattr(self, attrib, case[attrib])
@@ -289,14 +880,11 @@ class Rule(object):
         Raises:
             AttributeError: When the Rule name is unset or does not have the required attributes.
 
+        Warning:
+            The returned dictionary is shared between all Rules of the same type. It should not be modified.
+
         """
-        ruleset_schema = iati.default.ruleset_schema()
-        partial_schema = ruleset_schema['patternProperties']['.+']['properties'][self.name]['properties']['cases']['items']  # pylint: disable=E1101
-        # make all attributes other than 'condition' in the partial schema required
-        partial_schema['required'] = self._case_attributes(partial_schema)
-        # ensure that the 'paths' array is not empty
-        if 'paths' in partial_schema['properties'].keys():
-            partial_schema['properties']['paths']['minItems'] = 1
+        partial_schema, _ = iati.ruleset_caches.schema_validator(self.name)
 
         return partial_schema
 
@@ -313,7 +901,7 @@ class Rule(object):
             AttributeError: When an argument is given that does not have the required attributes.
 
         """
-        return dataset.xml_tree.xpath(self.context)
+        return self._evaluate_xpath(dataset.xml_tree, self.context)
 
     def _extract_text_from_element_or_attribute(self, context, path):
         """Return a list of strings regardless of whether XPath result is an attribute or an element.
@@ -330,7 +918,7 @@ class Rule(object):
             `path` should be validated outside of this function to avoid unexpected errors.
 
         """
-        xpath_results = context.xpath(path)
+        xpath_results = self._evaluate_xpath(context, path)
         results = [result if isinstance(result, six.string_types) else result.text for result in xpath_results]
         return ['' if result is None else result for result in results]
 
@@ -355,11 +943,13 @@ class Rule(object):
 
         """
         try:
-            if context_element.xpath(self.condition):
-                return True
+            condition = self.condition
         except AttributeError:
             return False
 
+        if self._evaluate_xpath(context_element, condition):
+            return True
+
         return False
 
     def is_valid_for(self, dataset):
@@ -392,20 +982,106 @@ class Rule(object):
         except AttributeError:
             raise TypeError
 
+        return self._is_valid_for_context_elements(dataset, context_elements, datetime.today())
+
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):  # pylint: disable=unused-argument
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        Raises:
+            ValueError: When a check encounters a completely incorrect value that it is unable to recover from within the definition of the Rule.
+
+        """
         if context_elements == list():
             return None
 
         for context_element in context_elements:
-            if self._condition_met_for(context_element):
-                return None
+            rule_check_result = self._check_context_element(context_element, today)
+            if rule_check_result is False or rule_check_result is None:
+                return self._result_from_context_checks(rule_check_result)
 
-            rule_check_result = self._check_against_Rule(context_element)
-            if rule_check_result is False:
-                return False
-            elif rule_check_result is None:
-                return None
+        return self._result_from_context_checks(True)
 
-        return True
+    def _check_context_element(self, context_element, today=None):  # pylint: disable=unused-argument
+        """Check a single context element against the Rule.
+
+        Args:
+            context_element (etree._Element): An XML Element.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: The result of checking the element. `None` when a condition is met to skip validation.
+
+        Raises:
+            ValueError: When a check encounters a completely incorrect value that it is unable to recover from within the definition of the Rule.
+
+        Note:
+            May be overridden in child class that depends upon the time at which it is checked.
+
+        """
+        if self._condition_met_for(context_element):
+            return None
+
+        return self._check_against_Rule(context_element)
+
+    def _result_for_context_element(self, context_element, today=None):
+        """Determine whether a single context element passes the Rule.
+
+        Args:
+            context_element (etree._Element): An XML Element.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None:
+                `True` when the context element passes the Rule.
+
+                `False` when the context element does not pass the Rule, including when a check encounters a completely incorrect value.
+
+                `None` when a condition is met to skip validation.
+
+        """
+        try:
+            rule_check_result = self._check_context_element(context_element, today)
+        except ValueError:
+            return False
+
+        if rule_check_result is not False and rule_check_result is not None:
+            rule_check_result = True
+
+        return self._result_from_context_checks(rule_check_result)
+
+    def _result_from_context_checks(self, result):
+        """Convert the result of checking context elements in turn into the result of the Rule.
+
+        Context elements are checked until one of them is `False` or `None`. That value, or `True` when every context element is checked, is converted.
+
+        Args:
+            result (bool or None): The result of checking the context elements.
+
+        Returns:
+            bool or None: The result of the Rule.
+
+        Note:
+            May be overridden in child class where the result of `_check_against_Rule()` does not directly state whether the Rule passes.
+
+        """
+        return result
+
+    def _checks_all_context_elements_at_once(self):
+        """Determine whether the Rule checks every context element at once, rather than one context element at a time.
+
+        Returns:
+            bool: Whether `_is_valid_for_context_elements()` should be used to check the Rule, rather than `_check_context_element()`.
+
+        """
+        return self._combined_paths() is not None
 
 
 class RuleAtLeastOne(Rule):
@@ -440,15 +1116,15 @@ class RuleAtLeastOne(Rule):
 
         """
         for path in self.paths:
-            if context_element.xpath(path):
+            if self._evaluate_xpath(context_element, path):
                 return False
         return True
 
-    def is_valid_for(self, dataset):
-        """Check whether a Dataset is valid against the Rule.
+    def _result_from_context_checks(self, result):
+        """Convert the result of checking context elements in turn into the result of the Rule.
 
         Args:
-            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            result (bool or None): The result of checking the context elements.
 
         Returns:
             bool or None:
@@ -458,15 +1134,10 @@ class RuleAtLeastOne(Rule):
 
                 `None` when a condition is met to skip validation.
 
-        Raises:
-            TypeError: When a Dataset is not given as an argument.
-
         """
-        parent = super(RuleAtLeastOne, self).is_valid_for(dataset)
-
-        if parent is True:
+        if result is True:
             return False
-        elif parent is None:
+        elif result is None:
             return None
         return True
 
@@ -481,6 +1152,8 @@ class RuleDateOrder(Rule):
 
     """
 
+    _COST = 4
+
     def __init__(self, context, case):
         """Initialise a `date_order` rule."""
         self.name = 'date_order'
@@ -512,12 +1185,32 @@ class RuleDateOrder(Rule):
 
         self._normalize_condition()
 
-    def _get_date(self, context_element, path):
+    def _check_context_element(self, context_element, today=None):
+        """Check a single context element against the Rule.
+
+        Args:
+            context_element (etree._Element): An XML Element.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: The result of checking the element. `None` when a condition is met to skip validation.
+
+        Raises:
+            ValueError: When a date is given that is not in the correct xsd:date format.
+
+        """
+        if self._condition_met_for(context_element):
+            return None
+
+        return self._check_against_Rule(context_element, today)
+
+    def _get_date(self, context_element, path, today=None):
         """Retrieve datetime object from an XPath string.
 
         Args:
             context_element (etree._Element): An XML Element.
             path: (an XPath): The ultimate XPath query to find the desired elements.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
 
         Returns:
             datetime.datetime: A datetime object.
@@ -536,25 +1229,27 @@ class RuleDateOrder(Rule):
 
         """
         if path == self.special_case:
-            return datetime.today()
+            if today is None:
+                return datetime.today()
+            return today
 
         dates = self._extract_text_from_element_or_attribute(context_element, path)
         if dates == list() or not dates[0]:
             return
         # Checks that anything after the YYYY-MM-DD string is a permitted timezone character
-        pattern = re.compile(r'^([+-]([01][0-9]|2[0-3]):([0-5][0-9])|Z)?$')
-        if (len(set(dates)) == 1) and pattern.match(dates[0][10:]):
+        if (len(set(dates)) == 1) and _DATE_TIMEZONE_PATTERN.match(dates[0][10:]):
             if len(dates[0]) < 10:
                 # '%d' and '%m' are documented as requiring zero-padded dates.as input. This is actually for output. As such, a separate length check is required to ensure zero-padded values.
                 raise ValueError
-            return datetime.strptime(dates[0][:10], '%Y-%m-%d')
+            return iati.ruleset_caches.parse_date(dates[0][:10])
         raise ValueError
 
-    def _check_against_Rule(self, context_element):
+    def _check_against_Rule(self, context_element, today=None):
         """Assert that the date value of `less` is chronologically before the date value of `more`.
 
         Args:
             context_element (etree._Element): An XML Element.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
 
         Return:
             bool: Return `True` when `less` is chronologically before `more`.
@@ -568,8 +1263,8 @@ class RuleDateOrder(Rule):
             `date` restricted to 10 characters in order to exclude possible timezone values.
 
         """
-        early_date = self._get_date(context_element, self.less)
-        later_date = self._get_date(context_element, self.more)
+        early_date = self._get_date(context_element, self.less, today)
+        later_date = self._get_date(context_element, self.more, today)
 
         try:
             # python2 allows `bool`s to be compared to `None` without raising a TypeError, while python3 does not
@@ -592,6 +1287,9 @@ class RuleDependent(Rule):
 
     """
 
+    _COMBINE_PATHS = True
+    _COMBINED_PATHS_BY_CONTEXT = True
+
     def __init__(self, context, case):
         """Initialise a `dependent` rule."""
         self.name = 'dependent'
@@ -618,7 +1316,7 @@ class RuleDependent(Rule):
         unique_paths = set(self.paths)
         found_paths = 0
         for path in unique_paths:
-            results = context_element.xpath(path)
+            results = self._evaluate_xpath(context_element, path)
             if results != list():
                 found_paths += 1
 
@@ -626,6 +1324,29 @@ class RuleDependent(Rule):
             return False
         return True
 
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        When the Rule has no condition, the values at each of the `paths` within every context element are located at once. The number of `paths` found within each context element is then counted.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        """
+        values = self._values_in_all_contexts(dataset, context_elements)
+        if values is None:
+            return super(RuleDependent, self)._is_valid_for_context_elements(dataset, context_elements, today)
+
+        paths_found = Counter(context_position for context_position, _ in set((context_position, path_position) for context_position, path_position, _ in values))
+        unique_path_count = len(self._unique_paths())
+
+        return all(path_count == unique_path_count for path_count in paths_found.values())
+
 
 class RuleNoMoreThanOne(Rule):
     """Representation of a Rule that checks that there is no more than one Element or Attribute matching a given XPath.
@@ -635,6 +1356,9 @@ class RuleNoMoreThanOne(Rule):
 
     """
 
+    _COMBINE_PATHS = True
+    _COMBINED_PATHS_BY_CONTEXT = True
+
     def __init__(self, context, case):
         """Initialise a `no_more_than_one` rule."""
         self.name = 'no_more_than_one'
@@ -663,13 +1387,35 @@ class RuleNoMoreThanOne(Rule):
         found_elements = 0
 
         for path in unique_paths:
-            results = context_element.xpath(path)
+            results = self._evaluate_xpath(context_element, path)
             found_elements += len(results)
 
         if found_elements > 1:
             return False
         return True
 
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        When the Rule has no condition, the values at each of the `paths` within every context element are located at once. The number of values within each context element is then counted.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        """
+        values = self._values_in_all_contexts(dataset, context_elements)
+        if values is None:
+            return super(RuleNoMoreThanOne, self)._is_valid_for_context_elements(dataset, context_elements, today)
+
+        values_found = Counter(context_position for context_position, _, _ in values)
+
+        return all(value_count <= 1 for value_count in values_found.values())
+
 
 class RuleRegexMatches(Rule):
     """Representation of a Rule that checks that the text of the given paths must match the regex value.
@@ -680,6 +1426,9 @@ class RuleRegexMatches(Rule):
 
     """
 
+    _COMBINE_PATHS = True
+    _COST = 2
+
     def __init__(self, context, case):
         """Initialise a `regex_matches` Rule.
 
@@ -694,7 +1443,7 @@ class RuleRegexMatches(Rule):
         if self.regex == '':
             raise ValueError
         try:
-            re.compile(self.regex)
+            self._pattern = re.compile(self.regex)
         except sre_constants.error:
             raise ValueError
 
@@ -715,15 +1464,34 @@ class RuleRegexMatches(Rule):
                   Return `False` when the given `path` text does not match the given regex.
 
         """
-        pattern = re.compile(self.regex)
-
         for path in self.paths:
             strings_to_check = self._extract_text_from_element_or_attribute(context_element, path)
             for string_to_check in strings_to_check:
-                if not pattern.search(string_to_check):
+                if not self._pattern.search(string_to_check):
                     return False
         return True
 
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        When the Rule has no condition, the text at each of the `paths` within every context element is located and checked at once.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        """
+        strings_to_check = self._text_in_all_contexts(dataset, context_elements)
+        if strings_to_check is None:
+            return super(RuleRegexMatches, self)._is_valid_for_context_elements(dataset, context_elements, today)
+
+        search = self._pattern.search
+        return all(search(string_to_check) for string_to_check in strings_to_check)
+
 
 class RuleRegexNoMatches(Rule):
     """Representation of a Rule that checks that the text of the given `paths` must not match the regex value.
@@ -734,6 +1502,9 @@ class RuleRegexNoMatches(Rule):
 
     """
 
+    _COMBINE_PATHS = True
+    _COST = 2
+
     def __init__(self, context, case):
         """Initialise a `regex_no_matches` Rule.
 
@@ -748,7 +1519,7 @@ class RuleRegexNoMatches(Rule):
         if self.regex == '':
             raise ValueError
         try:
-            re.compile(self.regex)
+            self._pattern = re.compile(self.regex)
         except sre_constants.error:
             raise ValueError
 
@@ -769,15 +1540,34 @@ class RuleRegexNoMatches(Rule):
                   Return `False` when the given `path` text matches the given regex.
 
         """
-        pattern = re.compile(self.regex)
-
         for path in self.paths:
             strings_to_check = self._extract_text_from_element_or_attribute(context_element, path)
             for string_to_check in strings_to_check:
-                if pattern.search(string_to_check):
+                if self._pattern.search(string_to_check):
                     return False
         return True
 
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        When the Rule has no condition, the text at each of the `paths` within every context element is located and checked at once.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        """
+        strings_to_check = self._text_in_all_contexts(dataset, context_elements)
+        if strings_to_check is None:
+            return super(RuleRegexNoMatches, self)._is_valid_for_context_elements(dataset, context_elements, today)
+
+        search = self._pattern.search
+        return not any(search(string_to_check) for string_to_check in strings_to_check)
+
 
 class RuleStartsWith(Rule):
     """Representation of a Rule that checks that the prefixing text of each text value for `path` matches the `start` text value.
@@ -788,6 +1578,8 @@ class RuleStartsWith(Rule):
 
     """
 
+    _COST = 2
+
     def __init__(self, context, case):
         """Initialise a `startswith` Rule."""
         self.name = 'startswith'
@@ -847,12 +1639,16 @@ class RuleSum(Rule):
 
     """
 
+    _COST = 3
+
     def __init__(self, context, case):
         """Initialise a `sum` rule."""
         self.name = 'sum'
 
         super(RuleSum, self).__init__(context, case)
 
+        self._decimal_sum = decimal.Decimal(str(self.sum))
+
     def __str__(self):
         """Return string stating what RuleSum is checking."""
         return 'Within each `{self.context}`, the sum of values matched at `{0}` must be `{self.sum}`.'.format('` and `'.join(self.paths), **locals())
@@ -873,20 +1669,23 @@ class RuleSum(Rule):
 
         """
         unique_paths = set(self.paths)
-        values_in_context = list()
+        total = decimal.Decimal(0)
+        values_found = False
 
         for path in unique_paths:
             values_to_sum = self._extract_text_from_element_or_attribute(context_element, path)
             for value in values_to_sum:
                 try:
-                    values_in_context.append(decimal.Decimal(value))
+                    decimal_value = decimal.Decimal(value)
                 except decimal.InvalidOperation:
                     raise ValueError
+                total += decimal_value
+                values_found = True
 
-        if values_in_context == list():
+        if not values_found:
             return None
 
-        if sum(values_in_context) != decimal.Decimal(str(self.sum)):
+        if total != self._decimal_sum:
             return False
         return True
 
@@ -899,6 +1698,10 @@ class RuleUnique(Rule):
 
     """
 
+    _COMBINE_PATHS = True
+    _COMBINED_PATHS_BY_CONTEXT = True
+    _COST = 2
+
     def __init__(self, context, case):
         """Initialise a `unique` rule."""
         self.name = 'unique'
@@ -936,3 +1739,23 @@ class RuleUnique(Rule):
         if len(all_content) != len(unique_content):
             return False
         return True
+
+    def _is_valid_for_context_elements(self, dataset, context_elements, today=None):
+        """Check whether a Dataset is valid against the Rule, given the context elements that have already been located within it.
+
+        When the Rule has no condition, the values at each of the `paths` within every context element are located at once. Repeated text is then found by comparing the number of values with the number of distinct values within each context element.
+
+        Args:
+            dataset (iati.Dataset): The Dataset to be checked for validity against the Rule.
+            context_elements (list of etree._Element): The context elements for the Rule within the Dataset.
+            today (datetime.datetime): The time that is treated as `NOW`. Defaults to None, meaning that the current time is determined whenever it is needed.
+
+        Returns:
+            bool or None: As per `is_valid_for()`.
+
+        """
+        values = self._values_in_all_contexts(dataset, context_elements)
+        if values is None:
+            return super(RuleUnique, self)._is_valid_for_context_elements(dataset, context_elements, today)
+
+        return len(set((context_position, value) for context_position, _, value in values)) == len(values)
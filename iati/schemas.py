@@ -1,4 +1,5 @@
 """A module containing a core representation of IATI Schemas."""
+from copy import deepcopy
 from lxml import etree
 import iati.codelists
 import iati.constants
@@ -12,6 +13,7 @@ class Schema(object):
 
     Attributes:
         codelists (set): The Codelists associated with this Schema.
+        frozen (bool): Whether the Schema has been frozen, so cannot be modified.
         rulesets (set): The Rulesets associated with this Schema.
         ROOT_ELEMENT_NAME (str): The name of the root element within the XML Schema that the class represents.
 
@@ -49,8 +51,10 @@ class Schema(object):
             Create test instance where the SchemaError is raised.
 
         """
+        self._frozen = False
         self._schema_base_tree = None
         self._source_path = path
+        self._validator_cache = None
         self.codelists = set()
         self.rulesets = set()
 
@@ -63,6 +67,87 @@ class Schema(object):
         else:
             self._schema_base_tree = loaded_tree
 
+    def __deepcopy__(self, memo):
+        """Create a deep copy of the Schema.
+
+        The compiled validator cannot be copied, so is shared with the copy. It remains valid for the copy until the copy's base tree changes.
+
+        The copy is not frozen, even when the Schema is. This is the way to obtain a version of a frozen Schema that may be modified.
+
+        Args:
+            memo (dict): A dictionary of objects already copied during the current copying pass.
+
+        Returns:
+            iati.Schema: A deep copy of the Schema.
+
+        """
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+
+        for key, value in self.__dict__.items():
+            if key not in ['_frozen', '_validator_cache']:
+                setattr(copied, key, deepcopy(value, memo))
+
+        copied.codelists = set(copied.codelists)
+        copied.rulesets = set(copied.rulesets)
+        copied._frozen = False
+        copied._validator_cache = None
+        if self._validator_cache is not None and self._validator_cache[0] is self._schema_base_tree:
+            copied._validator_cache = (copied._schema_base_tree, self._validator_cache[1])
+
+        return copied
+
+    def __setattr__(self, name, value):
+        """Set an attribute of the Schema.
+
+        Raises:
+            AttributeError: When the Schema is frozen.
+
+        Note:
+            The validator may still be cached against a frozen Schema, since doing so does not change what the Schema represents.
+
+        """
+        if name != '_validator_cache':
+            self._check_not_frozen()
+
+        super(Schema, self).__setattr__(name, value)
+
+    def _check_not_frozen(self):
+        """Check that the Schema may be modified.
+
+        Raises:
+            AttributeError: When the Schema is frozen.
+
+        """
+        if getattr(self, '_frozen', False):
+            raise AttributeError("The {0} Schema is frozen, so cannot be modified. Use `mutable=True` to obtain a default Schema that may be modified, or modify a `deepcopy()` of the Schema.".format(self.ROOT_ELEMENT_NAME))
+
+    @property
+    def frozen(self):
+        """bool: Whether the Schema has been frozen, so cannot be modified."""
+        return self._frozen
+
+    def freeze(self):
+        """Prevent the Schema, its Codelists and its Rulesets from being modified.
+
+        Once frozen, a Schema may be shared without being copied. Attempts to set its attributes, to add to or remove from its `codelists` and `rulesets`, or to modify its base tree through its methods, raise an AttributeError.
+
+        Its `codelists` and `rulesets` become frozensets, and each of its Codelists and Rulesets is frozen.
+
+        Returns:
+            iati.Schema: The Schema, which is now frozen.
+
+        Note:
+            A frozen Schema cannot be unfrozen. A `deepcopy()` of it is not frozen, so may be modified.
+
+        """
+        if not self._frozen:
+            self.codelists = _FrozenSchemaSet(codelist.freeze() for codelist in self.codelists)
+            self.rulesets = _FrozenSchemaSet(ruleset.freeze() for ruleset in self.rulesets)
+            self._frozen = True
+
+        return self
+
     def _change_include_to_xinclude(self, tree):
         """Change the method in which common elements are included.
 
@@ -78,6 +163,9 @@ class Schema(object):
         Returns:
             etree._ElementTree: The modified tree.
 
+        Raises:
+            AttributeError: When the tree is the base tree of a frozen Schema.
+
         Todo:
             Add more robust tests for schemas at different versions.
 
@@ -92,6 +180,10 @@ class Schema(object):
             Consider using XSLT.
 
         """
+        if tree is self._schema_base_tree:
+            self._check_not_frozen()
+            self._validator_cache = None
+
         # identify the old info
         include_xpath = (iati.constants.NAMESPACE + 'include')
         include_el = tree.getroot().find(include_xpath)
@@ -149,6 +241,9 @@ class Schema(object):
         Returns:
             etree._ElementTree: The flattened tree.
 
+        Raises:
+            AttributeError: When the tree is the base tree of a frozen Schema.
+
         Todo:
             Add more robust tests for schemas at different versions.
 
@@ -157,6 +252,10 @@ class Schema(object):
             Tidy this up.
 
         """
+        if tree is self._schema_base_tree:
+            self._check_not_frozen()
+            self._validator_cache = None
+
         # change the include to a format that lxml can read
         tree = self._change_include_to_xinclude(tree)
 
@@ -183,19 +282,40 @@ class Schema(object):
 
         Takes the base schema and converts it into an object that lxml can deal with.
 
+        The converted schema is cached against the base tree that it was created from. It is reused until the base tree is replaced or modified by a method of this Schema.
+
         Returns:
             etree.XMLSchema: A schema that can be used for validation.
 
         Raises:
             iati.exceptions.SchemaError: An error occurred in the creation of the validator.
 
+        Warning:
+            Changes made directly to the base tree, rather than through methods of this Schema, will not be detected. The previously created validator will continue to be returned.
+
         """
+        if self._validator_cache is not None and self._validator_cache[0] is self._schema_base_tree:
+            return self._validator_cache[1]
+
         try:
-            return iati.utilities.convert_tree_to_schema(self._schema_base_tree)
+            validator = iati.utilities.convert_tree_to_schema(self._schema_base_tree)
         except etree.XMLSchemaParseError as err:
             iati.utilities.log_error(err)
             raise iati.exceptions.SchemaError('Problem parsing Schema')
 
+        self._use_validator(validator)
+
+        return validator
+
+    def _use_validator(self, validator):
+        """Set the validator to be returned for the current base tree.
+
+        Args:
+            validator (etree.XMLSchema): A validator that was created from a tree equivalent to the current base tree.
+
+        """
+        self._validator_cache = (self._schema_base_tree, validator)
+
 
 class ActivitySchema(Schema):
     """Representation of an IATI Activity Schema as defined within the IATI SSOT."""
@@ -207,3 +327,25 @@ class OrganisationSchema(Schema):
     """Representation of an IATI Organisation Schema as defined within the IATI SSOT."""
 
     ROOT_ELEMENT_NAME = 'iati-organisations'
+
+
+class _FrozenSchemaSet(frozenset):
+    """A frozenset of the Codelists or Rulesets of a frozen Schema.
+
+    Attempting to add to or remove from it raises an AttributeError that states how to obtain a Schema that may be modified, rather than stating that a frozenset has no such method.
+
+    """
+
+    _MODIFYING_METHOD_NAMES = frozenset(['add', 'clear', 'difference_update', 'discard', 'intersection_update', 'pop', 'remove', 'symmetric_difference_update', 'update'])
+
+    def __getattr__(self, name):
+        """Locate an attribute that is not otherwise present.
+
+        Raises:
+            AttributeError: Always. The message states how to obtain a Schema that may be modified when `name` is a method of `set` that modifies a set.
+
+        """
+        if name in self._MODIFYING_METHOD_NAMES:
+            raise AttributeError("The Codelists and Rulesets of a frozen Schema cannot be modified. Use `mutable=True` to obtain a default Schema that may be modified, or modify a `deepcopy()` of the Schema.")
+
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name))
@@ -29,7 +29,7 @@ def schema_ruleset():
         A valid Activity Schema with the Standard Ruleset added.
 
     """
-    schema = iati.default.activity_schema(None, False)
+    schema = iati.default.activity_schema(None, False, mutable=True)
     ruleset = iati.default.ruleset()
 
     schema.rulesets.add(ruleset)
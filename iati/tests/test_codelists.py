@@ -1,4 +1,6 @@
 """A module containing tests for the library representation of Codelists."""
+import copy
+import pickle
 import pytest
 from lxml import etree
 import iati.codelists
@@ -118,6 +120,127 @@ class TestCodelists(object):
         assert type_tree[0][0].attrib['value'] == code_value_to_set
         assert type_tree[0][0].nsmap == iati.constants.NSMAP
 
+    def test_codelist_code_values(self, name_to_set):
+        """Check that a Codelist provides a frozenset of the values of its Codes."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1'))
+        codelist.codes.add(iati.Code('2'))
+
+        assert isinstance(codelist.code_values, frozenset)
+        assert codelist.code_values == frozenset(['1', '2'])
+
+    @pytest.mark.parametrize("modify, expected_values", [
+        (lambda codes: codes.add(iati.Code('3')), ['1', '2', '3']),
+        (lambda codes: codes.discard(next(code for code in codes if code.value == '1')), ['2']),
+        (lambda codes: codes.update([iati.Code('3'), iati.Code('4')]), ['1', '2', '3', '4']),
+        (lambda codes: codes.__ior__(set([iati.Code('5')])), ['1', '2', '5']),
+        (lambda codes: codes.clear(), [])
+    ])
+    def test_codelist_code_values_follow_codes(self, name_to_set, modify, expected_values):
+        """Check that the Code values of a Codelist remain correct when its set of Codes is modified."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.update([iati.Code('1'), iati.Code('2')])
+        assert codelist.code_values == frozenset(['1', '2'])
+
+        modify(codelist.codes)
+
+        assert codelist.code_values == frozenset(expected_values)
+        assert codelist.code_values == frozenset(code.value for code in codelist.codes)
+
+    def test_codelist_code_values_codes_assigned(self, name_to_set):
+        """Check that the Code values of a Codelist remain correct when a new set of Codes is assigned."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1'))
+        assert codelist.code_values == frozenset(['1'])
+
+        new_codes = set([iati.Code('2')])
+        codelist.codes = new_codes
+        new_codes.add(iati.Code('3'))
+
+        assert codelist.code_values == frozenset(['2'])
+        assert len(codelist.codes) == 1
+
+    def test_codelist_code_values_match_codes(self):
+        """Check that a value is within the Code values of a Codelist exactly when it is the value of one of its Codes."""
+        codelist = iati.default.codelist('FlowType')
+
+        for value in ['10', '20', '50', '11', '', 'ODA']:
+            assert (value in codelist.code_values) == (value in codelist.codes)
+
+    def test_codelist_code_values_deepcopy(self, name_to_set):
+        """Check that a copy of a Codelist keeps Code values that match its own Codes."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1'))
+        assert codelist.code_values == frozenset(['1'])
+
+        codelist_copy = copy.deepcopy(codelist)
+        codelist_copy.codes.add(iati.Code('2'))
+
+        assert codelist_copy.code_values == frozenset(['1', '2'])
+        assert codelist.code_values == frozenset(['1'])
+
+    def test_codelist_freeze(self, name_to_set):
+        """Check that a frozen Codelist and its Codes cannot be modified."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1'))
+
+        frozen_codelist = codelist.freeze()
+
+        assert frozen_codelist is codelist
+        assert codelist.frozen
+        assert all(code.frozen for code in codelist.codes)
+        assert codelist.code_values == frozenset(['1'])
+        with pytest.raises(AttributeError, match='mutable=True'):
+            codelist.codes.add(iati.Code('2'))
+        with pytest.raises(AttributeError, match='mutable=True'):
+            codelist.codes.discard(next(iter(codelist.codes)))
+        with pytest.raises(AttributeError, match='mutable=True'):
+            codelist.codes = set()
+        with pytest.raises(AttributeError):
+            codelist.complete = True
+        with pytest.raises(AttributeError):
+            next(iter(codelist.codes)).value = '2'
+
+    def test_codelist_freeze_twice(self, name_to_set):
+        """Check that freezing a frozen Codelist has no effect."""
+        codelist = iati.Codelist(name_to_set).freeze()
+
+        assert codelist.freeze() is codelist
+        assert codelist.frozen
+
+    def test_codelist_frozen_deepcopy(self, name_to_set):
+        """Check that a deep copy of a frozen Codelist is equal to it, and may be modified."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1', 'a name'))
+        codelist.freeze()
+
+        codelist_copy = copy.deepcopy(codelist)
+
+        assert codelist_copy == codelist
+        assert not codelist_copy.frozen
+        assert not any(code.frozen for code in codelist_copy.codes)
+
+        codelist_copy.codes.add(iati.Code('2'))
+        next(code for code in codelist_copy.codes if code.value == '1').name = 'a new name'
+
+        assert codelist_copy.code_values == frozenset(['1', '2'])
+        assert codelist.code_values == frozenset(['1'])
+        assert next(iter(codelist.codes)).name == 'a name'
+
+    def test_codelist_frozen_pickle(self, name_to_set):
+        """Check that a frozen Codelist remains frozen and equal to itself when pickled."""
+        codelist = iati.Codelist(name_to_set)
+        codelist.codes.add(iati.Code('1'))
+        codelist.freeze()
+
+        unpickled_codelist = pickle.loads(pickle.dumps(codelist))
+
+        assert unpickled_codelist == codelist
+        assert unpickled_codelist.frozen
+        assert unpickled_codelist.code_values == frozenset(['1'])
+        with pytest.raises(AttributeError):
+            unpickled_codelist.codes.add(iati.Code('2'))
+
 
 class TestCodes(object):
     """A container for tests relating to Codes."""
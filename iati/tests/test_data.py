@@ -5,6 +5,7 @@ Todo:
 """
 import collections
 import math
+import mmap
 from future.standard_library import install_aliases
 from lxml import etree
 import pytest
@@ -101,6 +102,30 @@ class TestDatasets(object):
 
         assert data.xml_str == xml_str.strip()
 
+    def test_dataset_xml_str_assignment_parsed_once(self, dataset_initialised, monkeypatch):
+        """Test that assignment to the xml_str property parses the string a single time, and does not serialise the resulting tree."""
+        xml_str = iati.tests.utilities.load_as_string('valid_not_iati')
+        data = dataset_initialised
+        calls = collections.Counter()
+        original_fromstring = etree.fromstring
+        original_tostring = etree.tostring
+
+        def counting_fromstring(*args, **kwargs):
+            calls['fromstring'] += 1
+            return original_fromstring(*args, **kwargs)
+
+        def counting_tostring(*args, **kwargs):
+            calls['tostring'] += 1
+            return original_tostring(*args, **kwargs)
+
+        monkeypatch.setattr(etree, 'fromstring', counting_fromstring)
+        monkeypatch.setattr(etree, 'tostring', counting_tostring)
+        data.xml_str = xml_str
+
+        assert calls['fromstring'] == 1
+        assert calls['tostring'] == 0
+        assert data.xml_tree.getroot().tag == original_fromstring(xml_str.strip().encode()).tag
+
     def test_dataset_xml_str_assignment_invalid_str(self, dataset_initialised):
         """Test assignment to the xml_str property with an invalid XML string."""
         xml_str = iati.tests.utilities.load_as_string('invalid')
@@ -142,6 +167,37 @@ class TestDatasets(object):
 
         assert data.xml_str == etree.tostring(iati.tests.utilities.XML_TREE_VALID, pretty_print=True)
 
+    def test_dataset_xml_tree_assignment_str_created_on_access(self, dataset_initialised, monkeypatch):
+        """Test that the string representation of an assigned tree is only created when it is accessed, and is then reused."""
+        data = dataset_initialised
+        calls = collections.Counter()
+        original_tostring = etree.tostring
+
+        def counting_tostring(*args, **kwargs):
+            calls['tostring'] += 1
+            return original_tostring(*args, **kwargs)
+
+        monkeypatch.setattr(etree, 'tostring', counting_tostring)
+        data.xml_tree = iati.tests.utilities.XML_TREE_VALID
+        calls_after_assignment = calls['tostring']
+        first_str = data.xml_str
+        second_str = data.xml_str
+
+        assert calls_after_assignment == 0
+        assert calls['tostring'] == 1
+        assert first_str is second_str
+
+    def test_dataset_xml_tree_assignment_replaces_str(self, dataset_initialised):
+        """Test that assignment to the xml_tree property replaces a string that was previously created from a different tree."""
+        data = dataset_initialised
+        original_str = data.xml_str
+        new_tree = etree.fromstring(iati.tests.utilities.load_as_string('valid_iati').strip().encode())
+
+        data.xml_tree = new_tree
+
+        assert data.xml_str != original_str
+        assert data.xml_str == etree.tostring(new_tree, pretty_print=True)
+
     def test_dataset_xml_tree_assignment_invalid_tree(self, dataset_initialised):
         """Test assignment to the xml_tree property with an invalid ElementTree.
 
@@ -452,6 +508,52 @@ class TestDatasetSourceFinding(object):
             with pytest.raises(TypeError):
                 data.source_around_line(line_num, invalid_value)
 
+    def test_dataset_xml_str_source_around_line_from_tree(self, data):
+        """Test obtaining source around a particular line of a Dataset that was created from a tree, and so has a bytes string representation."""
+        tree_data = iati.data.Dataset(data.xml_tree.getroot())
+        split_xml_str = [''] + tree_data.xml_str.decode('utf-8').split('\n')
+
+        for line_num in range(1, len(split_xml_str)):
+            assert tree_data.source_at_line(line_num) == split_xml_str[line_num].strip()
+            assert tree_data.source_around_line(line_num) == '\n'.join(split_xml_str[max(line_num - 1, 1):line_num + 2])
+
+    def test_dataset_xml_str_line_index_reused(self, monkeypatch):
+        """Test that the index of line offsets is only created once for a given string, and is recreated when the string changes."""
+        data = iati.tests.utilities.load_as_dataset('valid_not_iati')
+        calls = collections.Counter()
+        original_line_start_offsets = iati.data._line_start_offsets  # pylint: disable=protected-access
+
+        def counting_line_start_offsets(source):
+            calls['index'] += 1
+            return original_line_start_offsets(source)
+
+        monkeypatch.setattr(iati.data, '_line_start_offsets', counting_line_start_offsets)
+        for line_num in range(1, 5):
+            data.source_around_line(line_num)
+        calls_before_change = calls['index']
+        data.xml_str = iati.tests.utilities.load_as_string('valid_iati')
+        data.source_at_line(1)
+
+        assert calls_before_change == 1
+        assert calls['index'] == 2
+
+    def test_line_start_offsets_bytes_and_mmap(self, data, tmpdir):
+        """Test that offsets of lines are the same for text, the equivalent bytes, and a memory-mapped file containing the bytes."""
+        xml_bytes = data.xml_str.encode('utf-8')
+        xml_path = tmpdir.join('data.xml')
+        xml_path.write_binary(xml_bytes)
+
+        with open(str(xml_path), 'rb') as xml_file:
+            xml_mmap = mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ)
+            offsets_mmap = list(iati.data._line_start_offsets(xml_mmap))  # pylint: disable=protected-access
+            xml_mmap.close()
+
+        offsets_str = list(iati.data._line_start_offsets(data.xml_str))  # pylint: disable=protected-access
+        offsets_bytes = list(iati.data._line_start_offsets(xml_bytes))  # pylint: disable=protected-access
+
+        assert offsets_str == offsets_bytes == offsets_mmap
+        assert len(offsets_str) == len(data.xml_str.split('\n'))
+
 
 class TestDatasetVersionDetection(object):
     """A container for tests relating to detecting the version of a Dataset."""
@@ -1,12 +1,31 @@
 """A module containing tests for the library representation of default values."""
+import os
+from collections import Counter
+from copy import deepcopy
 import pytest
 import iati.codelists
 import iati.constants
 import iati.default
+import iati.rulesets
 import iati.schemas
 import iati.tests.utilities
 
 
+def prevent_resource_loads(monkeypatch):
+    """Cause an error should any resource file be loaded as a string or tree.
+
+    Args:
+        monkeypatch: The pytest monkeypatch fixture for the current test.
+
+    """
+    def load_nothing(path):
+        """Fail should a resource be loaded."""
+        raise AssertionError('{0} was loaded from disk.'.format(path))
+
+    monkeypatch.setattr(iati.resources, 'load_as_string', load_nothing)
+    monkeypatch.setattr(iati.resources, 'load_as_tree', load_nothing)
+
+
 class TestDefault(object):
     """A container for tests relating to Default data."""
 
@@ -23,6 +42,244 @@ class TestDefault(object):
             func_to_check(invalid_version)
 
 
+class TestDefaultCache(object):
+    """A container for tests relating to the caching of default data."""
+
+    @pytest.fixture
+    def resource_loads(self, monkeypatch):
+        """Count the number of times that each resource file is loaded from disk.
+
+        Returns:
+            collections.Counter: The number of times that each path has been loaded, once the test has been run.
+
+        """
+        loads = Counter()
+        original_load_as_string = iati.resources.load_as_string
+        original_load_as_tree = iati.resources.load_as_tree
+
+        def load_as_string_counted(path):
+            """Count and load a resource as a string."""
+            loads[path] += 1
+            return original_load_as_string(path)
+
+        def load_as_tree_counted(path):
+            """Count and load a resource as a tree."""
+            loads[path] += 1
+            return original_load_as_tree(path)
+
+        monkeypatch.setattr(iati.resources, 'load_as_string', load_as_string_counted)
+        monkeypatch.setattr(iati.resources, 'load_as_tree', load_as_tree_counted)
+
+        return loads
+
+    def test_clear_cache(self):
+        """Check that clearing the cache resets its statistics and causes default data to be loaded again."""
+        default_codelist = iati.default.codelist('Country')
+
+        iati.default.clear_cache()
+
+        assert all(stats == {'hits': 0, 'misses': 0} for stats in iati.default.cache_statistics().values())
+        assert iati.default.codelist('Country') is not default_codelist
+        assert iati.default.codelist('Country') == default_codelist
+
+    def test_cache_statistics(self, standard_version_mandatory):
+        """Check that the hits and misses of caches are counted."""
+        iati.default.clear_cache()
+
+        iati.default.codelist('Country', *standard_version_mandatory)
+        iati.default.codelist('Currency', *standard_version_mandatory)
+        iati.default.codelists(*standard_version_mandatory)
+        iati.default.ruleset(*standard_version_mandatory)
+        iati.default.ruleset(*standard_version_mandatory)
+
+        statistics = iati.default.cache_statistics()
+
+        assert set(statistics.keys()) == set(['codelists', 'codelist_mappings', 'persistent_cache', 'rulesets', 'ruleset_schemas', 'schemas', 'schema_validators'])
+        assert statistics['codelists'] == {'hits': 2, 'misses': 1}
+        assert statistics['rulesets'] == {'hits': 1, 'misses': 1}
+        assert statistics['schemas'] == {'hits': 0, 'misses': 0}
+
+    def test_resource_files_parsed_once(self, resource_loads, standard_version_optional):
+        """Check that each resource file is loaded from disk at most once, however many times default data is accessed."""
+        iati.default.clear_cache()
+
+        for _ in range(2):
+            iati.default.codelist('Country', *standard_version_optional)
+            iati.default.codelists(*standard_version_optional)
+            iati.default.codelist_mapping(*standard_version_optional)
+            iati.default.ruleset(*standard_version_optional)
+            iati.default.ruleset_schema()
+            iati.default.activity_schema(*standard_version_optional)
+            iati.default.organisation_schema(*standard_version_optional, populate=False)
+            iati.default.organisation_schema(*standard_version_optional, mutable=True)
+
+        assert len(resource_loads) > 0
+        assert max(resource_loads.values()) == 1
+
+    def test_codelist_parses_single_file(self, resource_loads, standard_version_optional):
+        """Check that accessing a single default Codelist only parses the file for that Codelist."""
+        iati.default.clear_cache()
+        codelist_path = iati.resources.get_codelist_path('Currency', *standard_version_optional)
+
+        iati.default.codelist('Currency', *standard_version_optional)
+        iati.default.codelist('Currency', *standard_version_optional)
+
+        assert resource_loads == Counter({codelist_path: 1})
+
+    def test_codelist_invalid_name_parses_nothing(self, resource_loads):
+        """Check that no Codelist files are parsed when looking for a Codelist that does not exist."""
+        iati.default.clear_cache()
+
+        with pytest.raises(ValueError):
+            iati.default.codelist('NotACodelist')
+
+        assert len(resource_loads) == 0
+
+    def test_codelists_parses_every_file(self, resource_loads, standard_version_optional):
+        """Check that accessing all the default Codelists parses each Codelist file once, including those already parsed individually."""
+        iati.default.clear_cache()
+
+        iati.default.codelist('Currency', *standard_version_optional)
+        all_codelists = iati.default.codelists(*standard_version_optional)
+
+        assert len(resource_loads) == len(all_codelists)
+        assert set(resource_loads.values()) == set([1])
+
+    def test_warm_cache(self, standard_version_mandatory, monkeypatch):
+        """Check that default data is not loaded from disk after the cache has been warmed."""
+        iati.default.clear_cache()
+        iati.default.warm_cache(standard_version_mandatory)
+        prevent_resource_loads(monkeypatch)
+
+        assert isinstance(iati.default.codelist('Country', *standard_version_mandatory), iati.Codelist)
+        assert isinstance(iati.default.codelist_mapping(*standard_version_mandatory), dict)
+        assert isinstance(iati.default.ruleset(*standard_version_mandatory), iati.Ruleset)
+        assert isinstance(iati.default.activity_schema(*standard_version_mandatory), iati.ActivitySchema)
+        assert isinstance(iati.default.organisation_schema(*standard_version_mandatory, populate=False), iati.OrganisationSchema)
+        assert iati.default.cache_statistics()['codelists']['misses'] == 1
+
+    def test_warm_cache_all_versions(self, monkeypatch):
+        """Check that default data is cached for every version of the Standard when no versions are specified."""
+        iati.default.clear_cache()
+        iati.default.warm_cache()
+        prevent_resource_loads(monkeypatch)
+
+        for version in iati.constants.STANDARD_VERSIONS:
+            assert isinstance(iati.default.activity_schema(version), iati.ActivitySchema)
+
+    @pytest.mark.parametrize("invalid_version", iati.tests.utilities.generate_test_types(['none'], True))
+    def test_warm_cache_invalid_version(self, invalid_version):
+        """Check that an invalid version causes an error when warming the cache."""
+        with pytest.raises(ValueError):
+            iati.default.warm_cache([invalid_version])
+
+
+class TestDefaultPersistentCache(object):
+    """A container for tests relating to the persistent cache of default data."""
+
+    @pytest.fixture
+    def cache_directory(self, tmpdir):
+        """Enable the persistent cache in a temporary directory, then disable it once the test is complete.
+
+        Returns:
+            str: The path to the directory containing cache files.
+
+        """
+        directory = str(tmpdir.join('cache'))
+        iati.default.clear_cache()
+        iati.default.enable_persistent_cache(directory)
+
+        yield directory
+
+        iati.default.disable_persistent_cache()
+        iati.default.clear_cache()
+
+    def test_persistent_cache_enable_creates_directory(self, cache_directory):
+        """Check that enabling the persistent cache creates the directory that is to contain cache files."""
+        assert os.path.isdir(cache_directory)
+        assert os.listdir(cache_directory) == []
+
+    def test_persistent_cache_file_written(self, cache_directory):
+        """Check that a cache file is written when default data is first accessed."""
+        iati.default.codelist('Country')
+
+        assert len(os.listdir(cache_directory)) == 1
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 0, 'misses': 1}
+
+    def test_persistent_cache_used(self, cache_directory, monkeypatch):  # pylint: disable=unused-argument
+        """Check that default data is loaded from the cache file, rather than being parsed from the resource files."""
+        codelist = iati.default.codelist('Country')
+        mapping = iati.default.codelist_mapping()
+        ruleset = iati.default.ruleset()
+        iati.default.clear_cache()
+        prevent_resource_loads(monkeypatch)
+
+        cached_codelist = iati.default.codelist('Country')
+        cached_ruleset = iati.default.ruleset()
+
+        assert cached_codelist == codelist
+        assert cached_codelist.frozen
+        assert iati.default.codelist_mapping() == mapping
+        assert [str(rule) for rule in cached_ruleset.rules] == [str(rule) for rule in ruleset.rules]
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 1, 'misses': 0}
+
+    def test_persistent_cache_ruleset_valid(self, cache_directory):  # pylint: disable=unused-argument
+        """Check that a Ruleset loaded from the cache file produces the same results as one parsed from the resource files."""
+        dataset = iati.tests.utilities.load_as_dataset('ruleset-std/invalid_std_ruleset_multiple_rule_errors')
+        ruleset = iati.default.ruleset()
+        iati.default.clear_cache()
+
+        cached_ruleset = iati.default.ruleset()
+
+        assert iati.default.cache_statistics()['persistent_cache']['hits'] == 1
+        assert cached_ruleset.is_valid_for(dataset) == ruleset.is_valid_for(dataset)
+        assert len(cached_ruleset.results_for(dataset).failures()) == len(ruleset.results_for(dataset).failures())
+
+    def test_persistent_cache_invalid_file_replaced(self, cache_directory):
+        """Check that a cache file that cannot be loaded is replaced."""
+        iati.default.codelist('Country')
+        path = os.path.join(cache_directory, os.listdir(cache_directory)[0])
+        with open(path, 'wb') as cache_file:
+            cache_file.write(b'not a pickle')
+        iati.default.clear_cache()
+
+        assert isinstance(iati.default.codelist('Country'), iati.Codelist)
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 0, 'misses': 1}
+
+        iati.default.clear_cache()
+        iati.default.codelist('Country')
+
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 1, 'misses': 0}
+
+    def test_persistent_cache_keyed_by_source_content(self, cache_directory, monkeypatch):
+        """Check that a different cache file is used when the content of the resource files changes."""
+        iati.default.codelist('Country')
+        iati.default.clear_cache()
+        original_load_as_bytes = iati.resources.load_as_bytes
+        mapping_path = iati.resources.get_codelist_mapping_path()
+
+        def load_changed_mapping(path):
+            """Return different content for the Codelist mapping file."""
+            if path == mapping_path:
+                return original_load_as_bytes(path) + b' '
+            return original_load_as_bytes(path)
+
+        monkeypatch.setattr(iati.resources, 'load_as_bytes', load_changed_mapping)
+        iati.default.codelist('Country')
+
+        assert len(os.listdir(cache_directory)) == 2
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 0, 'misses': 1}
+
+    def test_persistent_cache_disabled(self, cache_directory):
+        """Check that no cache files are written once the persistent cache is disabled."""
+        iati.default.disable_persistent_cache()
+
+        iati.default.codelist('Country')
+
+        assert os.listdir(cache_directory) == []
+        assert iati.default.cache_statistics()['persistent_cache'] == {'hits': 0, 'misses': 0}
+
+
 class TestDefaultCodelists(object):
     """A container for tests relating to default Codelists."""
 
@@ -191,6 +448,31 @@ class TestDefaultRulesets(object):
 
         assert isinstance(ruleset, iati.Ruleset)
 
+    def test_default_ruleset_schema_modification(self):
+        """Check that modifying a default Ruleset schema does not affect the Ruleset schema that is subsequently returned."""
+        schema = iati.default.ruleset_schema()
+        schema['title'] = 'A modified title'
+
+        assert iati.default.ruleset_schema()['title'] != 'A modified title'
+
+    def test_default_ruleset_schema_loaded_once(self, standard_version_optional, monkeypatch):
+        """Check that the Ruleset schema is not loaded from disk each time a Ruleset is created."""
+        iati.default.ruleset_schema()
+        iati.default.ruleset(*standard_version_optional)
+        original_load_as_string = iati.resources.load_as_string
+        schema_path = iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_SCHEMA_NAME)
+
+        def load_all_but_ruleset_schema(path):
+            """Fail should the Ruleset schema be loaded."""
+            if path == schema_path:
+                raise AssertionError('The Ruleset schema was loaded from disk again.')
+            return original_load_as_string(path)
+
+        monkeypatch.setattr(iati.resources, 'load_as_string', load_all_but_ruleset_schema)
+
+        assert isinstance(iati.default.ruleset(*standard_version_optional), iati.Ruleset)
+        assert isinstance(iati.default.ruleset_schema(), dict)
+
     def test_default_ruleset_validation_rules_valid(self, schema_ruleset):
         """Check that a fully valid IATI file does not raise any type of error (including rules/rulesets)."""
         data = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
@@ -295,6 +577,18 @@ class TestDefaultSchemas(object):
         assert schema.codelists == set()
         assert schema.rulesets == set()
 
+    @pytest.mark.parametrize("schema_func", [
+        iati.default.activity_schema,
+        iati.default.organisation_schema
+    ])
+    def test_default_schemas_share_validator(self, schema_func, standard_version_mandatory):
+        """Check that default Schemas of the same type and version share a validator rather than each creating their own."""
+        schema_populated = schema_func(*standard_version_mandatory)
+        schema_unpopulated = schema_func(*standard_version_mandatory, populate=False)
+
+        assert schema_populated is not schema_unpopulated
+        assert schema_populated.validator() is schema_unpopulated.validator()
+
 
 class TestDefaultModifications(object):
     """A container for tests relating to the ability to modify defaults."""
@@ -319,20 +613,54 @@ class TestDefaultModifications(object):
         """Return a Code object that has not been added to a Codelist."""
         return iati.Code('new code value', 'new code name')
 
-    def test_default_codelist_modification(self, codelist_name, new_code, standard_version_optional):
-        """Check that a default Codelist cannot be modified by adding Codes to returned lists."""
+    def test_default_codelist_frozen(self, codelist_name, new_code, standard_version_optional):
+        """Check that a default Codelist is frozen, so Codes cannot be added to it."""
+        default_codelist = iati.default.codelist(codelist_name, *standard_version_optional)
+
+        assert default_codelist.frozen
+        with pytest.raises(AttributeError):
+            default_codelist.codes.add(new_code)
+        with pytest.raises(AttributeError):
+            default_codelist.name = 'a new name'
+        with pytest.raises(AttributeError):
+            next(iter(default_codelist.codes)).value = 'a new value'
+
+    def test_default_codelist_shared(self, codelist_name, standard_version_optional):
+        """Check that the same frozen default Codelist is returned each time, rather than a copy."""
         default_codelist = iati.default.codelist(codelist_name, *standard_version_optional)
+
+        assert iati.default.codelist(codelist_name, *standard_version_optional) is default_codelist
+        assert iati.default.codelists(*standard_version_optional)[codelist_name] is default_codelist
+
+    def test_default_codelist_modification(self, codelist_name, new_code, standard_version_optional):
+        """Check that a default Codelist cannot be modified by adding Codes to returned mutable lists."""
+        default_codelist = iati.default.codelist(codelist_name, *standard_version_optional, mutable=True)
         base_default_codelist_length = len(default_codelist.codes)
 
         default_codelist.codes.add(new_code)
         unmodified_codelist = iati.default.codelist(codelist_name, *standard_version_optional)
 
+        assert not default_codelist.frozen
         assert len(default_codelist.codes) == base_default_codelist_length + 1
         assert len(unmodified_codelist.codes) == base_default_codelist_length
 
+    def test_default_codelist_deepcopy_modification(self, codelist_name, new_code, standard_version_optional):
+        """Check that a deep copy of a frozen default Codelist may be modified without affecting the default Codelist."""
+        default_codelist = iati.default.codelist(codelist_name, *standard_version_optional)
+        base_default_codelist_length = len(default_codelist.codes)
+
+        codelist_copy = deepcopy(default_codelist)
+        codelist_copy.codes.add(new_code)
+        next(iter(codelist_copy.codes)).name = 'a new name'
+
+        assert codelist_copy == deepcopy(codelist_copy)
+        assert len(codelist_copy.codes) == base_default_codelist_length + 1
+        assert len(default_codelist.codes) == base_default_codelist_length
+        assert 'a new name' not in [code.name for code in default_codelist.codes]
+
     def test_default_codelists_modification(self, codelist_name, new_code, standard_version_optional):
-        """Check that default Codelists cannot be modified by adding Codes to returned lists with default parameters."""
-        default_codelists = iati.default.codelists(*standard_version_optional)
+        """Check that default Codelists cannot be modified by adding Codes to returned mutable lists."""
+        default_codelists = iati.default.codelists(*standard_version_optional, mutable=True)
         codelist_of_interest = default_codelists[codelist_name]
         base_default_codelist_length = len(codelist_of_interest.codes)
 
@@ -343,6 +671,53 @@ class TestDefaultModifications(object):
         assert len(codelist_of_interest.codes) == base_default_codelist_length + 1
         assert len(unmodified_codelist_of_interest.codes) == base_default_codelist_length
 
+    def test_default_codelists_dict_modification(self, codelist_name, standard_version_optional):
+        """Check that removing a Codelist from the returned dictionary of frozen Codelists does not affect the default Codelists."""
+        default_codelists = iati.default.codelists(*standard_version_optional)
+
+        del default_codelists[codelist_name]
+
+        assert codelist_name in iati.default.codelists(*standard_version_optional)
+
+    @pytest.mark.parametrize("default_call", [
+        iati.default.activity_schema,
+        iati.default.organisation_schema
+    ])
+    @pytest.mark.parametrize("populate", [True, False])
+    def test_default_x_schema_frozen(self, default_call, populate, codelist_non_default, standard_version_mandatory):
+        """Check that default Schemas are frozen and shared, so Codelists cannot be added to them."""
+        default_schema = default_call(standard_version_mandatory[0], populate)
+
+        assert default_schema.frozen
+        assert default_call(standard_version_mandatory[0], populate) is default_schema
+        assert all(codelist.frozen for codelist in default_schema.codelists)
+        with pytest.raises(AttributeError, match='mutable=True'):
+            default_schema.codelists.add(codelist_non_default)
+        with pytest.raises(AttributeError):
+            default_schema.flatten_includes(default_schema._schema_base_tree)  # pylint: disable=protected-access
+
+    @pytest.mark.parametrize("default_call", [
+        iati.default.activity_schema,
+        iati.default.organisation_schema
+    ])
+    def test_default_x_schema_ruleset_frozen(self, default_call, standard_version_mandatory):
+        """Check that the Rulesets within a populated default Schema are frozen, so the shared default Ruleset cannot be modified."""
+        default_schema = default_call(standard_version_mandatory[0], True)
+        default_ruleset = next(iter(default_schema.rulesets))
+        rules_in_order = list(default_ruleset.rules)
+
+        assert default_ruleset.frozen
+        with pytest.raises(AttributeError):
+            default_ruleset.rules.add(iati.rulesets.RuleAtLeastOne('//iati-activity', {'paths': ['title']}))
+        with pytest.raises(AttributeError):
+            default_ruleset.order_rules_by_cost()
+        with pytest.raises(AttributeError):
+            rules_in_order[0].context = '//iati-organisation'
+
+        unmodified_ruleset = next(iter(default_call(standard_version_mandatory[0], True).rulesets))
+        assert unmodified_ruleset is default_ruleset
+        assert list(unmodified_ruleset.rules) == rules_in_order
+
     @pytest.mark.parametrize("default_call", [
         iati.default.activity_schema,
         iati.default.organisation_schema
@@ -351,10 +726,10 @@ class TestDefaultModifications(object):
         """Check that unpopulated default Schemas cannot be modified.
 
         Note:
-            Implementation is by attempting to add a Codelist to the Schema.
+            Implementation is by attempting to add a Codelist to a mutable Schema.
 
         """
-        default_schema = default_call(standard_version_mandatory[0], False)
+        default_schema = default_call(standard_version_mandatory[0], False, mutable=True)
         base_codelist_count = len(default_schema.codelists)
 
         default_schema.codelists.add(codelist)
@@ -371,14 +746,16 @@ class TestDefaultModifications(object):
         """Check that populated default Schemas cannot be modified.
 
         Note:
-            Implementation is by attempting to add a Codelist to the Schema.
+            Implementation is by attempting to add a Codelist to a mutable Schema.
 
         """
-        default_schema = default_call(standard_version_mandatory[0], True)
+        default_schema = default_call(standard_version_mandatory[0], True, mutable=True)
         base_codelist_count = len(default_schema.codelists)
 
         default_schema.codelists.add(codelist_non_default)
         unmodified_schema = default_call(standard_version_mandatory[0], True)
 
+        assert not default_schema.frozen
+        assert not any(codelist.frozen for codelist in default_schema.codelists)
         assert len(default_schema.codelists) == base_codelist_count + 1
         assert len(unmodified_schema.codelists) == base_codelist_count
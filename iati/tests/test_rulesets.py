@@ -8,11 +8,18 @@ Todo:
 
 """
 # pylint: disable=protected-access,too-many-lines
+from collections import OrderedDict
 from copy import deepcopy
+from datetime import datetime
+import pickle
+import timeit
+from lxml import etree
 import pytest
 import iati.default
+import iati.ruleset_caches
 import iati.rulesets
 import iati.resources
+import iati.utilities
 import iati.tests.utilities
 
 
@@ -24,7 +31,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset()
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert ruleset.rules == set()
 
     @pytest.mark.parametrize("ruleset_str", [
@@ -38,7 +45,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset(ruleset_str)
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert ruleset.rules == set()
 
     @pytest.mark.parametrize("not_a_ruleset", iati.tests.utilities.generate_test_types(['str', 'bytearray', 'none'], True))
@@ -67,7 +74,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset(ruleset_str)
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert len(ruleset.rules) == 1
         assert isinstance(list(ruleset.rules)[0], iati.Rule)
         assert isinstance(list(ruleset.rules)[0], iati.RuleAtLeastOne)
@@ -86,7 +93,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset(ruleset_str)
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert len(ruleset.rules) == 2
         for rule in ruleset.rules:
             assert isinstance(rule, iati.Rule)
@@ -99,7 +106,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset(ruleset_str)
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert len(ruleset.rules) == 2
         for rule in ruleset.rules:
             assert isinstance(rule, iati.Rule)
@@ -127,7 +134,7 @@ class TestRuleset(object):
         ruleset = iati.Ruleset(ruleset_str)
 
         assert isinstance(ruleset, iati.Ruleset)
-        assert isinstance(ruleset.rules, set)
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
         assert len(ruleset.rules) == 2
         for rule in ruleset.rules:
             assert isinstance(rule, iati.Rule)
@@ -169,6 +176,321 @@ class TestRuleset(object):
 
         assert not ruleset.is_valid_for(invalid_dataset)
 
+    def test_ruleset_rules_grouped_by_context(self):
+        """Check that the Rules of a Ruleset are grouped by their context."""
+        ruleset = iati.Ruleset('')
+        rule_1 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element1']})
+        rule_2 = iati.rulesets.RuleNoMoreThanOne('//root_element', {'paths': ['element2']})
+        rule_3 = iati.rulesets.RuleAtLeastOne('//root_element/element1', {'paths': ['element2']})
+        ruleset.rules.update([rule_1, rule_2, rule_3])
+
+        rules_by_context = ruleset._rules_by_context()
+
+        assert sorted(rules_by_context.keys()) == ['//root_element', '//root_element/element1']
+        assert set(rules_by_context['//root_element']) == set([rule_1, rule_2])
+        assert rules_by_context['//root_element/element1'] == [rule_3]
+
+    def test_ruleset_context_elements_located_once_per_context(self, monkeypatch):
+        """Check that the context elements shared by Rules are located once, rather than once for each Rule."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+        located_contexts = list()
+        original_find_context_elements = iati.Rule._find_context_elements
+
+        def find_context_elements(rule, dataset):
+            """Record the context that elements are located for."""
+            located_contexts.append(rule.context)
+            return original_find_context_elements(rule, dataset)
+
+        monkeypatch.setattr(iati.Rule, '_find_context_elements', find_context_elements)
+
+        assert ruleset.is_valid_for(dataset)
+        assert len(ruleset.rules) > len(set(located_contexts))
+        assert len(located_contexts) == len(set(located_contexts))
+
+    @pytest.mark.parametrize("dataset", [
+        iati.tests.utilities.load_as_dataset('valid_std_ruleset'),
+        iati.tests.utilities.load_as_dataset('ruleset-std/invalid_std_ruleset_bad_identifier'),
+        iati.tests.utilities.load_as_dataset('ruleset-std/invalid_std_ruleset_does_not_sum_100'),
+        iati.tests.utilities.load_as_dataset('ruleset-std/invalid_std_ruleset_missing_sector_element')
+    ])
+    def test_ruleset_results_match_rules(self, dataset):
+        """Check that checking Rules grouped by context gives the same result for each Rule as checking each Rule individually."""
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        results = dict(ruleset._results_for(dataset))
+
+        assert results == dict((rule, rule.is_valid_for(dataset)) for rule in ruleset.rules)
+
+    def test_ruleset_rules_order_deterministic(self):
+        """Check that Rules are in the same order each time a Ruleset is created, rather than in an order that depends on their hash."""
+        ruleset_str = iati.resources.load_as_string(iati.resources.get_ruleset_path(iati.resources.FILE_RULESET_STANDARD_NAME))
+
+        rule_descriptions = [str(rule) for rule in iati.Ruleset(ruleset_str).rules]
+
+        for _ in range(5):
+            assert [str(rule) for rule in iati.Ruleset(ruleset_str).rules] == rule_descriptions
+
+    def test_ruleset_order_rules_by_cost(self):
+        """Check that Rules can be ordered so that the Rules estimated to be cheapest are checked first."""
+        ruleset = iati.default.ruleset()
+        rules = set(ruleset.rules)
+
+        ruleset.order_rules_by_cost()
+
+        costs = [rule._estimated_cost() for rule in ruleset.rules]
+        assert costs == sorted(costs)
+        assert ruleset.rules == rules
+        assert isinstance(ruleset.rules, iati.utilities.OrderedSet)
+
+    def test_ruleset_order_rules_by_timings(self):
+        """Check that Rules can be ordered using the time that each Rule took to check a Dataset."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
+        ruleset = iati.default.ruleset()
+
+        timings = ruleset.rule_timings(dataset)
+        ruleset.order_rules_by_cost(timings)
+
+        assert set(timings.keys()) == ruleset.rules
+        assert all(timing >= 0 for timing in timings.values())
+        assert list(ruleset.rules) == sorted(timings.keys(), key=timings.get)
+        assert ruleset.is_valid_for(dataset)
+
+    def test_ruleset_order_rules_by_timings_missing_last(self):
+        """Check that Rules without a timing are checked after Rules with a timing."""
+        ruleset = iati.Ruleset('')
+        rule_1 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element1']})
+        rule_2 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element2']})
+        rule_3 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element3']})
+        ruleset.rules.update([rule_1, rule_2, rule_3])
+
+        ruleset.order_rules_by_cost({rule_2: 0.2, rule_3: 0.1})
+
+        assert list(ruleset.rules) == [rule_3, rule_2, rule_1]
+
+    @pytest.fixture
+    def multiple_activity_dataset(self):
+        """A Dataset containing several Activities, where only some Activities have a title."""
+        return iati.Dataset("""<iati-activities version="2.02">
+            <iati-activity><iati-identifier>AA-1</iati-identifier><title /></iati-activity>
+            <iati-activity><iati-identifier>AA-2</iati-identifier></iati-activity>
+            <iati-activity><iati-identifier>AA-3</iati-identifier><other-identifier /></iati-activity>
+        </iati-activities>""")
+
+    def test_ruleset_results_for_each_context_element(self, multiple_activity_dataset):
+        """Check that a result is given for every context element, rather than stopping at the first that does not pass."""
+        ruleset = iati.Ruleset('{"//iati-activity": {"atleast_one": {"cases": [{"paths": ["title"]}]}}}')
+        rule = list(ruleset.rules)[0]
+
+        results = ruleset.results_for(multiple_activity_dataset)
+
+        assert len(results) == 1
+        assert results.rules == [rule]
+        assert results.results_for(rule) == [True, False, False]
+        assert results.context_elements_for(rule) == [(2, 'AA-1'), (3, 'AA-2'), (4, 'AA-3')]
+        assert results.failures_for(rule) == [(3, 'AA-2'), (4, 'AA-3')]
+        assert results.failures() == [(rule, 3, 'AA-2'), (rule, 4, 'AA-3')]
+
+    def test_ruleset_results_skipped_by_condition(self, multiple_activity_dataset):
+        """Check that context elements where a condition is met are skipped, while other context elements are still checked."""
+        ruleset = iati.Ruleset('{"//iati-activity": {"atleast_one": {"cases": [{"paths": ["title"], "condition": "other-identifier"}]}}}')
+        rule = list(ruleset.rules)[0]
+
+        results = ruleset.results_for(multiple_activity_dataset)
+
+        assert results.results_for(rule) == [True, False, None]
+        assert results.failures() == [(rule, 3, 'AA-2')]
+
+    def test_ruleset_results_valueerror_is_failure(self):
+        """Check that a context element that causes a `ValueError` does not pass the Rule."""
+        dataset = iati.tests.utilities.load_as_dataset('ruleset/invalid_sum')
+        rule = iati.rulesets.RuleSum('//root_element', {'paths': ['element42'], 'sum': 50})
+        ruleset = iati.Ruleset('')
+        ruleset.rules.add(rule)
+
+        results = ruleset.results_for(dataset)
+
+        assert False in results.results_for(rule)
+        assert results.failures_for(rule) != list()
+
+    def test_ruleset_results_for_valid_dataset(self):
+        """Check that every context element within a valid Dataset passes or is skipped for every Rule in the Standard Ruleset."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        results = ruleset.results_for(dataset)
+
+        assert set(results.rules) == ruleset.rules
+        assert results.failures() == list()
+        for rule in results.rules:
+            assert len(results.results_for(rule)) == len(results.context_elements_for(rule))
+
+    @pytest.mark.parametrize("not_a_dataset", iati.tests.utilities.generate_test_types([], True))
+    def test_ruleset_results_for_not_dataset(self, not_a_dataset):
+        """Check that results cannot be obtained for a value that is not a Dataset."""
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        with pytest.raises(TypeError):
+            ruleset.results_for(not_a_dataset)
+
+    @pytest.fixture
+    def datasets_to_evaluate(self):
+        """A number of valid and invalid Datasets to check against the Standard Ruleset."""
+        return [iati.tests.utilities.load_as_dataset(dataset_name) for dataset_name in [
+            'valid_std_ruleset',
+            'ruleset-std/invalid_std_ruleset_bad_identifier',
+            'ruleset-std/invalid_std_ruleset_does_not_sum_100',
+            'ruleset-std/invalid_std_ruleset_missing_sector_element',
+            'valid_std_ruleset'
+        ]]
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_ruleset_evaluate_many(self, datasets_to_evaluate, workers):
+        """Check that the results for each of a number of Datasets are the same as those for each Dataset individually, and in the same order."""
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        many_results = list(ruleset.evaluate_many(datasets_to_evaluate, workers=workers))
+
+        assert len(many_results) == len(datasets_to_evaluate)
+        for dataset, results in zip(datasets_to_evaluate, many_results):
+            expected_results = ruleset.results_for(dataset)
+            assert results.failures() == expected_results.failures()
+            for rule in ruleset.rules:
+                assert results.results_for(rule) == expected_results.results_for(rule)
+                assert results.context_elements_for(rule) == expected_results.context_elements_for(rule)
+        assert many_results[0].failures() == list()
+        assert many_results[1].failures() != list()
+
+    @pytest.mark.parametrize("dataset_name", [
+        'valid_std_ruleset',
+        'ruleset-std/invalid_std_ruleset_missing_sector_element'
+    ])
+    def test_ruleset_evaluate_many_tree_line_numbers(self, dataset_name):
+        """Check that worker processes give the same line numbers as `results_for()` for a Dataset created from a tree, where these differ from the line numbers within its formatted string."""
+        xml_str = iati.tests.utilities.load_as_string(dataset_name).replace('\n', '\n\n')
+        dataset = iati.Dataset(etree.fromstring(xml_str.strip().encode('utf-8'), etree.XMLParser(remove_blank_text=True)))
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        expected_results = ruleset.results_for(dataset)
+        string_results = ruleset.results_for(iati.Dataset(dataset.xml_str))
+        many_results = list(ruleset.evaluate_many([dataset], workers=2))
+
+        expected_context_elements = [expected_results.context_elements_for(rule) for rule in ruleset.rules]
+        assert [string_results.context_elements_for(rule) for rule in ruleset.rules] != expected_context_elements
+        assert [many_results[0].context_elements_for(rule) for rule in ruleset.rules] == expected_context_elements
+        assert many_results[0].failures() == expected_results.failures()
+
+    def test_ruleset_evaluate_many_tree_created_in_code(self):
+        """Check that worker processes give no line numbers for a Dataset created from a tree that was not parsed, in the same way as `results_for()`."""
+        root = etree.Element('iati-activities')
+        etree.SubElement(etree.SubElement(root, 'iati-activity'), 'iati-identifier').text = 'AA-AAA-123456789-ABC123'
+        dataset = iati.Dataset(root)
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        expected_results = ruleset.results_for(dataset)
+        many_results = list(ruleset.evaluate_many([dataset], workers=2))
+
+        assert many_results[0].failures() == expected_results.failures()
+        assert many_results[0].failures() != list()
+        assert all(line_number is None for _, line_number, _ in many_results[0].failures())
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    @pytest.mark.parametrize("not_a_dataset", iati.tests.utilities.generate_test_types([], True))
+    def test_ruleset_evaluate_many_not_datasets(self, not_a_dataset, workers):
+        """Check that a TypeError is raised when something other than a Dataset is to be checked."""
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        with pytest.raises(TypeError):
+            list(ruleset.evaluate_many([not_a_dataset], workers=workers))
+
+    def test_ruleset_pickle(self, datasets_to_evaluate):
+        """Check that a Ruleset can be pickled, keeping the order of its Rules."""
+        ruleset = iati.tests.utilities.RULESET_FOR_TESTING
+
+        ruleset_unpickled = pickle.loads(pickle.dumps(ruleset))
+
+        assert [str(rule) for rule in ruleset_unpickled.rules] == [str(rule) for rule in ruleset.rules]
+        for dataset in datasets_to_evaluate:
+            assert ruleset_unpickled.is_valid_for(dataset) == ruleset.is_valid_for(dataset)
+
+    @pytest.fixture
+    def ruleset_to_freeze(self):
+        """A Ruleset containing a number of Rules, which may be frozen."""
+        ruleset = iati.Ruleset('')
+        ruleset.rules.update([
+            iati.rulesets.RuleSum('//root_element', {'paths': ['element1', 'element2'], 'sum': 50}),
+            iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element1']})
+        ])
+
+        return ruleset
+
+    def test_ruleset_freeze(self, ruleset_to_freeze):
+        """Check that a frozen Ruleset, and the Rules within it, cannot be modified."""
+        ruleset = ruleset_to_freeze
+        rules_in_order = list(ruleset.rules)
+
+        frozen_ruleset = ruleset.freeze()
+
+        assert frozen_ruleset is ruleset
+        assert ruleset.frozen
+        assert all(rule.frozen for rule in ruleset.rules)
+        with pytest.raises(AttributeError):
+            ruleset.rules.add(iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element2']}))
+        with pytest.raises(AttributeError):
+            ruleset.order_rules_by_cost()
+        with pytest.raises(AttributeError):
+            rules_in_order[0].context = '//another_element'
+        assert list(ruleset.rules) == rules_in_order
+        assert rules_in_order[0].context == '//root_element'
+
+    def test_ruleset_freeze_twice(self, ruleset_to_freeze):
+        """Check that freezing a frozen Ruleset has no effect."""
+        ruleset = ruleset_to_freeze.freeze()
+        rules = ruleset.rules
+
+        assert ruleset.freeze() is ruleset
+        assert ruleset.rules is rules
+
+    def test_ruleset_frozen_deepcopy(self, ruleset_to_freeze):
+        """Check that a deep copy of a frozen Ruleset may be modified without affecting the frozen Ruleset."""
+        ruleset = ruleset_to_freeze.freeze()
+
+        ruleset_copy = deepcopy(ruleset)
+        ruleset_copy.order_rules_by_cost()
+        ruleset_copy.rules.add(iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element2']}))
+
+        assert not ruleset_copy.frozen
+        assert not any(rule.frozen for rule in ruleset_copy.rules)
+        assert [rule.name for rule in ruleset_copy.rules] == ['atleast_one', 'sum', 'atleast_one']
+        assert [rule.name for rule in ruleset.rules] == ['sum', 'atleast_one']
+
+    def test_ruleset_frozen_pickle(self, datasets_to_evaluate):
+        """Check that a frozen Ruleset remains frozen when pickled, and may still check Datasets."""
+        ruleset = deepcopy(iati.tests.utilities.RULESET_FOR_TESTING).freeze()
+
+        ruleset_unpickled = pickle.loads(pickle.dumps(ruleset))
+
+        assert ruleset_unpickled.frozen
+        assert all(rule.frozen for rule in ruleset_unpickled.rules)
+        for dataset in datasets_to_evaluate:
+            assert ruleset_unpickled.is_valid_for(dataset) == ruleset.is_valid_for(dataset)
+
+    @pytest.mark.parametrize("rule_type", [None] + iati.rulesets._VALID_RULE_TYPES)
+    def test_schema_validator_reused(self, rule_type):
+        """Check that the section of the Ruleset Schema and its validator are created once for each type of Rule."""
+        schema, validator = iati.ruleset_caches.schema_validator(rule_type)
+
+        assert iati.ruleset_caches.schema_validator(rule_type) == (schema, validator)
+        assert validator.schema is schema
+
+    def test_rules_of_same_type_share_schema_section(self):
+        """Check that Rules of the same type share a section of the Ruleset Schema, rather than each creating their own."""
+        rule_1 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element1']})
+        rule_2 = iati.rulesets.RuleAtLeastOne('//root_element', {'paths': ['element2']})
+
+        assert rule_1._ruleset_schema_section() is rule_2._ruleset_schema_section()
+        assert 'paths' in rule_1._ruleset_schema_section()['required']
+
 
 class TestRule(object):
     """A container for tests relating to Rules."""
@@ -190,6 +512,30 @@ class TestRule(object):
         with pytest.raises(TypeError):
             iati.Rule(name, context, case)  # pylint: disable=too-many-function-args
 
+    def test_compiled_xpaths_are_faster(self):
+        """Check that checking a Dataset with compiled XPaths is faster than compiling each XPath whenever it is evaluated.
+
+        Note:
+            This is a lightweight timing regression test. The best of several timings is compared, and the compiled XPaths are typically several times faster.
+
+        """
+        activities = ''.join('<iati-activity><iati-identifier>AA-AAA-{0}</iati-identifier><reporting-org ref="AA-AAA"/></iati-activity>'.format(idx) for idx in range(500))
+        dataset = iati.Dataset('<iati-activities version="2.02">' + activities + '</iati-activities>')
+        case = {
+            'paths': ['iati-identifier', 'reporting-org/@ref'],
+            'regex': '^AA-AAA',
+            'condition': 'count(title/narrative[string-length(normalize-space(text())) > 0]) > 1'
+        }
+        rule = iati.rulesets.RuleRegexMatches('//iati-activity', case)
+        uncompiled_rule = iati.rulesets.RuleRegexMatches('//iati-activity', case)
+        uncompiled_rule._xpaths = dict()
+
+        compiled_time = min(timeit.repeat(lambda: rule.is_valid_for(dataset), number=3, repeat=5))
+        uncompiled_time = min(timeit.repeat(lambda: uncompiled_rule.is_valid_for(dataset), number=3, repeat=5))
+
+        assert rule.is_valid_for(dataset) == uncompiled_rule.is_valid_for(dataset)
+        assert compiled_time < uncompiled_time
+
 
 class TestRuleSubclasses(object):
     """A container for tests relating to all Rule subclasses."""
@@ -380,6 +726,36 @@ class RuleSubclassTestBase(object):  # pylint: disable=too-many-public-methods
         """Check that a given Rule returns the expected result when given a Dataset."""
         assert not rule_invalid.is_valid_for(invalid_dataset)
 
+    def test_is_valid_for_uses_compiled_xpaths(self, valid_dataset, invalid_dataset, rule_valid, rule_invalid, monkeypatch):
+        """Check that XPaths are compiled when a Rule is created, rather than when it is checked against a Dataset."""
+        def fail_xpath(*args, **kwargs):  # pylint: disable=unused-argument
+            raise AssertionError('An XPath was compiled when checking a Dataset.')
+
+        monkeypatch.setattr(iati.rulesets.etree, 'XPath', fail_xpath)
+
+        assert rule_valid.is_valid_for(valid_dataset)
+        assert not rule_invalid.is_valid_for(invalid_dataset)
+        assert set(rule_valid._xpaths_to_compile()) == set(rule_valid._xpaths.keys())
+
+    def test_rule_deepcopy(self, valid_dataset, invalid_dataset, rule_valid, rule_invalid):
+        """Check that a copied Rule has its own compiled XPaths and gives the same results as the original."""
+        rule_valid_copy = deepcopy(rule_valid)
+        rule_invalid_copy = deepcopy(rule_invalid)
+
+        assert rule_valid_copy._xpaths is not rule_valid._xpaths
+        assert sorted(rule_valid_copy._xpaths.keys()) == sorted(rule_valid._xpaths.keys())
+        assert rule_valid_copy.is_valid_for(valid_dataset)
+        assert not rule_invalid_copy.is_valid_for(invalid_dataset)
+
+    def test_rule_pickle(self, valid_dataset, invalid_dataset, rule_valid, rule_invalid):
+        """Check that a Rule can be pickled, with its XPaths compiled again when it is unpickled."""
+        rule_valid_unpickled = pickle.loads(pickle.dumps(rule_valid))
+        rule_invalid_unpickled = pickle.loads(pickle.dumps(rule_invalid))
+
+        assert sorted(rule_valid_unpickled._xpaths.keys()) == sorted(rule_valid._xpaths.keys())
+        assert rule_valid_unpickled.is_valid_for(valid_dataset)
+        assert not rule_invalid_unpickled.is_valid_for(invalid_dataset)
+
     @pytest.mark.parametrize("junk_data", iati.tests.utilities.generate_test_types([], True))
     def test_is_valid_for_raises_error_on_non_permitted_argument(self, rule_instantiating, junk_data):
         """Check that a given Rule returns expected error when passed an argument that is not a Dataset."""
@@ -447,6 +823,66 @@ class RuleSubclassTestBase(object):  # pylint: disable=too-many-public-methods
             rule_constructor(valid_single_context, junk_condition_case)
 
 
+class RuleValuesInAllContextsTestBase(RuleSubclassTestBase):
+    """A base class for tests of Rules that locate the values within every context element at once."""
+
+    def test_values_in_all_contexts_match_context_elements(self, rule_valid, rule_invalid, valid_dataset, invalid_dataset):
+        """Check that checking the values within every context element at once gives the same result as checking each context element in turn."""
+        for rule in [rule_valid, rule_invalid]:
+            for dataset in [valid_dataset, invalid_dataset]:
+                context_elements = rule._find_context_elements(dataset)
+                assert rule._values_in_all_contexts(dataset, context_elements) is not None
+                assert rule.is_valid_for(dataset) == iati.rulesets.Rule._is_valid_for_context_elements(rule, dataset, context_elements)
+
+    def test_values_in_all_contexts_match_nested_context_elements(self, rule_constructor, valid_multiple_context, valid_nest_case, invalid_nest_case, valid_dataset, invalid_dataset):
+        """Check that values are attributed to the correct context element when context elements are nested within one another."""
+        for case in [valid_nest_case, invalid_nest_case]:
+            rule = rule_constructor(valid_multiple_context, case)
+            assert rule._combined_paths() is not None
+            for dataset in [valid_dataset, invalid_dataset]:
+                context_elements = rule._find_context_elements(dataset)
+                assert rule.is_valid_for(dataset) == iati.rulesets.Rule._is_valid_for_context_elements(rule, dataset, context_elements)
+
+    @pytest.mark.parametrize("path", [
+        '../element1',
+        'element1//element2',
+        'element1/text()',
+        'element1[element2/element3]',
+        'count(element1)'
+    ])
+    def test_values_in_all_contexts_not_used_for_other_steps(self, rule_constructor, path):
+        """Check that values are not located at once when they cannot be attributed to the context element that contains them."""
+        rule = rule_constructor('//root_element', {'paths': [path]})
+
+        assert rule._combined_paths() is None
+
+
+class RuleRegexTestBase(RuleSubclassTestBase):
+    """A base class for tests of Rules that check text against a regular expression."""
+
+    def test_combined_paths_match_context_elements(self, rule_valid, rule_invalid, valid_dataset, invalid_dataset):
+        """Check that checking the text within every context element at once gives the same result as checking each context element in turn."""
+        assert rule_valid._combined_paths() is not None
+        for rule in [rule_valid, rule_invalid]:
+            for dataset in [valid_dataset, invalid_dataset]:
+                assert rule.is_valid_for(dataset) == iati.rulesets.Rule._is_valid_for_context_elements(rule, dataset, rule._find_context_elements(dataset))
+
+    @pytest.mark.parametrize("context, paths", [
+        ('//root_element | //nest', ['element1']),
+        ('//root_element', ['element1 | element2']),
+        ('//root_element', ['/root_element/element1'])
+    ])
+    def test_combined_paths_not_used_when_unsafe(self, rule_constructor, context, paths):
+        """Check that XPaths are not combined when doing so would change their meaning."""
+        rule = rule_constructor(context, {'regex': r'\btest\b', 'paths': paths})
+
+        assert rule._combined_paths() is None
+
+    def test_combined_paths_not_used_with_condition(self, valid_condition_rule):
+        """Check that XPaths are not combined when the Rule has a condition, since the condition must be checked for each context element."""
+        assert valid_condition_rule._combined_paths() is None
+
+
 class TestRuleAtLeastOne(RuleSubclassTestBase):
     """A container for tests relating to RuleAtLeastOne."""
 
@@ -716,8 +1152,78 @@ class TestRuleDateOrder(RuleSubclassTestBase):
         """Check that the string format of the Rule contains some relevant information."""
         assert any(needle in str(rule_instantiating) for needle in ['must be chronologically', 'in the future', 'in the past'])
 
+    @pytest.mark.parametrize("date_str", [
+        '2017-01-31',
+        '1999-12-01',
+        '2016-02-29',  # leap day
+        '0001-01-01'
+    ])
+    def test_parse_date_matches_strptime(self, date_str):
+        """Check that parsed dates are the same as those given by `datetime.strptime()`."""
+        assert iati.ruleset_caches.parse_date(date_str) == datetime.strptime(date_str, '%Y-%m-%d')
+
+    @pytest.mark.parametrize("date_str", [
+        '2017-13-01',  # month out of range
+        '2017-02-30',  # day out of range
+        '2017-02-29',  # not a leap year
+        '0000-01-01',  # year out of range
+        '2017-1-011',  # month not zero-padded
+        '2017/01/01',
+        '2017-01-0a'
+    ])
+    def test_parse_date_invalid_raises_error(self, date_str):
+        """Check that date strings that cannot be parsed by `datetime.strptime()` raise the same error."""
+        with pytest.raises(ValueError):
+            datetime.strptime(date_str, '%Y-%m-%d')
+        with pytest.raises(ValueError):
+            iati.ruleset_caches.parse_date(date_str)
+
+    def test_parse_date_cache_is_bounded(self, monkeypatch):
+        """Check that parsed dates are cached, with the least recently used date removed once the cache is full."""
+        monkeypatch.setattr(iati.ruleset_caches, '_PARSED_DATES', OrderedDict())
+        monkeypatch.setattr(iati.ruleset_caches, '_PARSED_DATES_MAX_SIZE', 2)
+
+        first_date = iati.ruleset_caches.parse_date('2017-01-01')
+        iati.ruleset_caches.parse_date('2017-01-02')
+        assert iati.ruleset_caches.parse_date('2017-01-01') is first_date
+        iati.ruleset_caches.parse_date('2017-01-03')
+
+        assert list(iati.ruleset_caches._PARSED_DATES.keys()) == ['2017-01-01', '2017-01-03']
+
+    def test_now_is_the_same_throughout_run(self, monkeypatch):
+        """Check that `NOW` is determined once per run, rather than for every context element that is checked."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
+        ruleset = iati.Ruleset('')
+        rule_1 = iati.rulesets.RuleDateOrder('//iati-activity', {'less': 'NOW', 'more': 'NOW'})
+        rule_2 = iati.rulesets.RuleDateOrder('//iati-activity', {'less': 'activity-date[@type="1"]/@iso-date', 'more': 'NOW'})
+        ruleset.rules.update([rule_1, rule_2])
+        times_determined = list()
+
+        class RecordingDatetime(datetime):
+            """A datetime that records each time that `today()` is called."""
+
+            @classmethod
+            def today(cls):
+                """Record that the current time has been determined."""
+                times_determined.append(True)
+                return datetime.today()
 
-class TestRuleDependent(RuleSubclassTestBase):
+        monkeypatch.setattr(iati.rulesets, 'datetime', RecordingDatetime)
+
+        assert ruleset.is_valid_for(dataset)
+        assert len(times_determined) == 1
+
+    def test_run_state_is_not_stored_on_rule(self):
+        """Check that checking a Rule does not leave the time of the run stored upon the Rule, since Rules may be shared between runs."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_std_ruleset')
+        rule = iati.rulesets.RuleDateOrder('//iati-activity', {'less': 'activity-date[@type="1"]/@iso-date', 'more': 'NOW'})
+        attributes_before_run = vars(rule).copy()
+
+        assert rule.is_valid_for(dataset)
+        assert vars(rule) == attributes_before_run
+
+
+class TestRuleDependent(RuleValuesInAllContextsTestBase):
     """A container for tests relating to RuleDependent."""
 
     all_valid_cases = [
@@ -804,7 +1310,7 @@ class TestRuleDependent(RuleSubclassTestBase):
         assert any(needle in str(rule_instantiating) for needle in ['must all exist', 'always True'])
 
 
-class TestRuleNoMoreThanOne(RuleSubclassTestBase):
+class TestRuleNoMoreThanOne(RuleValuesInAllContextsTestBase):
     """A container for tests relating to RuleNoMoreThanOne."""
 
     all_valid_cases = [
@@ -889,7 +1395,7 @@ class TestRuleNoMoreThanOne(RuleSubclassTestBase):
         assert any(needle in str(rule_instantiating) for needle in ['zero or one', 'no more than one'])
 
 
-class TestRuleRegexMatches(RuleSubclassTestBase):
+class TestRuleRegexMatches(RuleRegexTestBase):
     """A container for tests relating to RuleRegexMatches."""
 
     all_valid_cases = [
@@ -982,7 +1488,7 @@ class TestRuleRegexMatches(RuleSubclassTestBase):
         assert 'must match the regular expression' in str(rule_instantiating)
 
 
-class TestRuleRegexNoMatches(RuleSubclassTestBase):
+class TestRuleRegexNoMatches(RuleRegexTestBase):
     """A container for tests relating to RuleRegexNoMatches."""
 
     all_valid_cases = [
@@ -1327,8 +1833,25 @@ class TestRuleSum(RuleSubclassTestBase):
         rule = rule_constructor(valid_single_context, no_values_case)
         assert rule.is_valid_for(valid_dataset) is None
 
+    @pytest.mark.parametrize("values, expected_sum, is_valid", [
+        (['33.333333333333', '33.333333333333', '33.333333333334'], 100, True),  # more precision than a float
+        (['33.333333333333', '33.333333333333', '33.333333333333'], 100, False),
+        (['0.1', '0.2'], 0.3, True),
+        (['5E+1', '50'], 100, True),  # exponent notation
+        (['+50', ' 50.000 '], 100, True),  # signs, trailing zeros and whitespace
+        (['150', '-50'], 100, True),
+        (['NaN', '100'], 100, False),
+        (['Infinity'], 100, False)
+    ])
+    def test_sum_matches_decimal_semantics(self, rule_constructor, values, expected_sum, is_valid):
+        """Check that values are summed exactly, as `decimal.Decimal`s, regardless of their format."""
+        dataset = iati.Dataset('<root_element>{0}</root_element>'.format(''.join('<value>{0}</value>'.format(value) for value in values)))
+        rule = rule_constructor('//root_element', {'paths': ['value'], 'sum': expected_sum})
+
+        assert rule.is_valid_for(dataset) is is_valid
+
 
-class TestRuleUnique(RuleSubclassTestBase):
+class TestRuleUnique(RuleValuesInAllContextsTestBase):
     """A container for tests relating to RuleUnique."""
 
     all_valid_cases = [
@@ -1,5 +1,6 @@
 """A module containing tests for the library representation of Schemas."""
 # pylint: disable=protected-access
+from copy import deepcopy
 from lxml import etree
 import pytest
 import iati.codelists
@@ -157,6 +158,75 @@ class TestSchemas(object):
         assert isinstance(tree.getroot().find(included_xpath), etree._Element)
         assert iati.utilities.convert_tree_to_schema(tree)
 
+    def test_schema_validator_reused(self, schema_initialised):
+        """Check that the validator for a Schema is only created once while the base tree is unchanged."""
+        schema = schema_initialised
+
+        assert schema.validator() is schema.validator()
+
+    def test_schema_validator_base_tree_changed(self, schema_initialised):
+        """Check that a new validator is created when the base tree of a Schema is replaced or modified through the Schema."""
+        schema = schema_initialised
+        original_validator = schema.validator()
+
+        schema.flatten_includes(schema._schema_base_tree)
+        flattened_validator = schema.validator()
+        schema._schema_base_tree = etree.ElementTree(schema._schema_base_tree.getroot())
+        replaced_validator = schema.validator()
+
+        assert isinstance(flattened_validator, etree.XMLSchema)
+        assert flattened_validator is not original_validator
+        assert replaced_validator is not flattened_validator
+
+    def test_schema_validator_deepcopy(self, schema_initialised):
+        """Check that a copied Schema can create a validator, and that the Schemas do not share a base tree."""
+        schema = schema_initialised
+        original_validator = schema.validator()
+
+        schema_copy = deepcopy(schema)
+
+        assert schema_copy.validator() is original_validator
+        assert schema_copy._schema_base_tree is not schema._schema_base_tree
+
+    def test_schema_freeze(self, schema_initialised):
+        """Check that a frozen Schema, and the Codelists and Rulesets within it, cannot be modified."""
+        schema = schema_initialised
+        schema.codelists.add(iati.Codelist('a test Codelist name'))
+        schema.rulesets.add(iati.Ruleset())
+
+        frozen_schema = schema.freeze()
+
+        assert frozen_schema is schema
+        assert schema.frozen
+        assert all(codelist.frozen for codelist in schema.codelists)
+        assert all(ruleset.frozen for ruleset in schema.rulesets)
+        assert isinstance(schema.validator(), etree.XMLSchema)
+        with pytest.raises(AttributeError, match='mutable=True'):
+            schema.codelists.add(iati.Codelist('another test Codelist name'))
+        with pytest.raises(AttributeError, match='mutable=True'):
+            schema.rulesets.discard(next(iter(schema.rulesets)))
+        with pytest.raises(AttributeError, match='mutable=True'):
+            schema.rulesets = set()
+        with pytest.raises(AttributeError):
+            schema.flatten_includes(schema._schema_base_tree)
+
+    def test_schema_frozen_deepcopy(self, schema_initialised):
+        """Check that a deep copy of a frozen Schema may be modified without affecting the frozen Schema."""
+        schema = schema_initialised
+        schema.codelists.add(iati.Codelist('a test Codelist name'))
+        schema.rulesets.add(iati.Ruleset())
+        schema.freeze()
+
+        schema_copy = deepcopy(schema)
+        schema_copy.codelists.add(iati.Codelist('another test Codelist name'))
+        schema_copy.flatten_includes(schema_copy._schema_base_tree)
+
+        assert not schema_copy.frozen
+        assert not any(codelist.frozen for codelist in schema_copy.codelists)
+        assert not any(ruleset.frozen for ruleset in schema_copy.rulesets)
+        assert len(schema_copy.codelists) == 2
+        assert len(schema.codelists) == 1
+
     def test_schema_codelists_add(self, schema_initialised):
         """Check that it is possible to add Codelists to the Schema."""
         codelist_name = "a test Codelist name"
@@ -203,3 +203,58 @@ class TestDefaultVersions(object):
 
         for version in result:
             assert version.startswith(str(major_version))
+
+
+class TestOrderedSet(object):
+    """A container for tests relating to OrderedSets."""
+
+    def test_ordered_set_empty(self):
+        """Check that an OrderedSet is empty when no items are given."""
+        ordered_set = iati.utilities.OrderedSet()
+
+        assert len(ordered_set) == 0
+        assert ordered_set == set()
+
+    def test_ordered_set_keeps_insertion_order(self):
+        """Check that items are given in the order that they were first added, rather than in an order that depends on their hash."""
+        items = [object() for _ in range(50)]
+        ordered_set = iati.utilities.OrderedSet(items)
+        ordered_set.add(items[0])
+
+        assert list(ordered_set) == items
+
+    def test_ordered_set_behaves_as_set(self):
+        """Check that an OrderedSet can be modified and compared in the same way as a set."""
+        ordered_set = iati.utilities.OrderedSet(['c', 'a'])
+        ordered_set.update(['b', 'a'], ['d'])
+        ordered_set.discard('d')
+        ordered_set.discard('not present')
+
+        assert list(ordered_set) == ['c', 'a', 'b']
+        assert ordered_set == set(['a', 'b', 'c'])
+        assert set(['a', 'b', 'c']) == ordered_set
+        assert 'a' in ordered_set
+        assert 'd' not in ordered_set
+        with pytest.raises(KeyError):
+            ordered_set.remove('d')
+
+
+class TestFrozenOrderedSet(object):
+    """A container for tests relating to FrozenOrderedSets."""
+
+    def test_frozen_ordered_set_keeps_insertion_order(self):
+        """Check that items are given in the order that they were first added, rather than in an order that depends on their hash."""
+        items = [object() for _ in range(50)]
+        frozen_ordered_set = iati.utilities.FrozenOrderedSet(items + [items[0]])
+
+        assert list(frozen_ordered_set) == items
+
+    def test_frozen_ordered_set_cannot_be_modified(self):
+        """Check that a FrozenOrderedSet can be compared in the same way as a set, but cannot be modified."""
+        frozen_ordered_set = iati.utilities.FrozenOrderedSet(['c', 'a'])
+
+        assert frozen_ordered_set == set(['a', 'c'])
+        assert frozen_ordered_set == iati.utilities.OrderedSet(['a', 'c'])
+        assert hash(frozen_ordered_set) == hash(iati.utilities.FrozenOrderedSet(['a', 'c']))
+        with pytest.raises(AttributeError):
+            frozen_ordered_set.add('b')  # pylint: disable=no-member
@@ -1,5 +1,9 @@
 """A module containing tests for data validation."""
+# pylint: disable=too-many-lines
+from io import BytesIO
+from lxml import etree
 import pytest
+import iati.codelist_validation
 import iati.data
 import iati.default
 import iati.schemas
@@ -7,6 +11,23 @@ import iati.tests.utilities
 import iati.validator
 
 
+@pytest.fixture(scope='module')
+def schema_all_codelists():
+    """Return an Activity Schema with all the default Codelists added."""
+    schema = iati.default.activity_schema(None, False, mutable=True)
+
+    for codelist in iati.default.codelists().values():
+        schema.codelists.add(codelist)
+
+    return schema
+
+
+@pytest.fixture(scope='module')
+def schema_everything():
+    """Return an Activity Schema with all the default Codelists and the Standard Ruleset added."""
+    return iati.default.activity_schema(None, True)
+
+
 class ValidationTestBase(object):
     """A container for fixtures and other functionality useful among multiple groups of Validation Test."""
 
@@ -116,10 +137,65 @@ class TestValidationError(object):
         assert err.name == err_name
         assert err.info == err_detail['info']
         assert err.help == err_detail['help']
-        # attributes set with `setattr()`, so not picked up by linter
-        assert err.base_exception == ValueError  # pylint: disable=no-member
-        assert err.category == err_detail['category']  # pylint: disable=no-member
-        assert err.description == err_detail['description']  # pylint: disable=no-member
+        assert err.base_exception == ValueError
+        assert err.category == err_detail['category']
+        assert err.description == err_detail['description']
+
+    def test_validation_error_formatted_on_access(self):
+        """Test that the messages of a ValidationError are formatted with values from the calling scope when accessed, and only the values that are required are kept."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_iati')
+        codelist = iati.default.codelist('Version')
+        code = 'not-a-version'
+        attr_name = 'version'
+        line_number = 2
+        unused_value = 'not used in any message'  # pylint: disable=unused-variable
+
+        err = iati.validator.ValidationError('err-code-not-on-codelist', locals())
+
+        assert err._help is None  # pylint: disable=protected-access
+        assert err._info is None  # pylint: disable=protected-access
+        assert 'unused_value' not in err._format_values  # pylint: disable=protected-access
+        assert 'dataset' not in err._format_values  # pylint: disable=protected-access
+        assert 'Version' in err.help
+        assert 'not-a-version' in err.info
+
+    def test_validation_error_context_on_access(self, monkeypatch):
+        """Test that the context of a ValidationError is only obtained from the Dataset when it is accessed."""
+        dataset = iati.tests.utilities.load_as_dataset('valid_iati')
+        line_number = 2
+        calls = []
+        original_source_around_line = dataset.source_around_line
+
+        def recording_source_around_line(*args, **kwargs):
+            calls.append(args)
+            return original_source_around_line(*args, **kwargs)
+
+        monkeypatch.setattr(dataset, 'source_around_line', recording_source_around_line)
+        err = iati.validator.ValidationError('err-code-not-on-codelist', locals())
+        calls_after_creation = len(calls)
+        context = err.context
+
+        assert calls_after_creation == 0
+        assert context == dataset.source_around_line(line_number)
+        assert err.context is context
+        assert len(calls) == 2
+
+    def test_validation_error_no_context_without_dataset(self):
+        """Test that a ValidationError created without a Dataset has no context."""
+        line_number = 2  # pylint: disable=unused-variable
+
+        err = iati.validator.ValidationError('err-code-not-on-codelist', locals())
+
+        assert err.line_number == 2
+        assert not hasattr(err, 'context')
+
+    def test_validation_error_slots(self):
+        """Test that a ValidationError has a fixed set of attributes, rather than a dictionary of them."""
+        err = iati.validator.ValidationError('err-code-not-on-codelist')
+
+        assert not hasattr(err, '__dict__')
+        with pytest.raises(AttributeError):
+            err.not_an_attribute = 'value'
 
 
 class TestValidationErrorLog(ValidationTestBase):  # pylint: disable=too-many-public-methods
@@ -323,6 +399,30 @@ class TestValidationAuxiliaryData(object):
                 assert attr_name in code_attrs
                 assert isinstance(err_code[attr_name], attr_type)
 
+    def test_error_codes_modification_does_not_affect_errors(self):
+        """Check that modifying the returned error codes does not modify ValidationErrors that are subsequently created."""
+        err_name = 'err-code-not-on-codelist'
+        original_info = iati.validator.get_error_codes()[err_name]['info']
+
+        iati.validator.get_error_codes()[err_name]['info'] = 'A modified value.'
+        err = iati.validator.ValidationError(err_name)
+
+        assert err.info == original_info
+        assert iati.validator.get_error_codes()[err_name]['info'] == original_info
+
+    def test_error_codes_loaded_once(self, monkeypatch):
+        """Check that creating a ValidationError does not load the error codes from disk again."""
+        iati.validator.ValidationError('err-code-not-on-codelist')
+
+        def fail_to_load(path):
+            """Fail should a resource be loaded."""
+            raise AssertionError('The error codes were loaded from disk again.')
+
+        monkeypatch.setattr(iati.resources, 'load_as_string', fail_to_load)
+
+        for _ in range(1000):
+            iati.validator.ValidationError('err-code-not-on-codelist')
+
 
 class ValidateCodelistsBase(ValidationTestBase):
     """A container for fixtures required for Codelist validation tests."""
@@ -330,7 +430,7 @@ class ValidateCodelistsBase(ValidationTestBase):
     @pytest.fixture
     def schema_version(self):
         """Return an Activity Schema with the Version Codelist added."""
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
         codelist = iati.default.codelist('Version')
 
         schema.codelists.add(codelist)
@@ -340,7 +440,7 @@ class ValidateCodelistsBase(ValidationTestBase):
     @pytest.fixture
     def schema_org_type(self):
         """Return an Activity Schema with the OrganisationType Codelist added."""
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
         codelist = iati.default.codelist('OrganisationType')
 
         schema.codelists.add(codelist)
@@ -350,7 +450,7 @@ class ValidateCodelistsBase(ValidationTestBase):
     @pytest.fixture
     def schema_incomplete_codelist(self):
         """Return an Activity Schema with an incomplete Codelist added."""
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
         codelist = iati.default.codelist('Country')
 
         schema.codelists.add(codelist)
@@ -360,7 +460,7 @@ class ValidateCodelistsBase(ValidationTestBase):
     @pytest.fixture
     def schema_short_mapping_codelist(self):
         """Return an Activity Schema with a Codelist that has a short `path` in the mapping file."""
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
         codelist = iati.default.codelist('Language')
 
         schema.codelists.add(codelist)
@@ -370,7 +470,7 @@ class ValidateCodelistsBase(ValidationTestBase):
     @pytest.fixture
     def schema_sectors(self):
         """Return an Activity Schema with the DAC Sector Codelists and appropriate vocabulary added."""
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
 
         codelist_1 = iati.default.codelist('SectorVocabulary')
         codelist_2 = iati.default.codelist('Sector')
@@ -712,6 +812,71 @@ class TestValidationCodelist(ValidateCodelistsBase):
         assert iati.validator.is_iati_xml(data, schema_short_mapping_codelist)
         assert iati.validator.is_valid(data, schema_short_mapping_codelist)
 
+    def test_basic_validation_short_mapping_xpath_invalid_code(self, schema_short_mapping_codelist):
+        """Perform data validation against valid IATI XML. The attribute being tested refers to a Codelist with an abnormally short mapping file path.
+
+        The data has a value that is not on the (incomplete) Codelist in an attribute mapped to by the Codelist.
+
+        """
+        data = iati.tests.utilities.load_as_dataset('valid_iati_invalid_code_short_mapping_xpath')
+
+        result = iati.validator.full_validation(data, schema_short_mapping_codelist)
+
+        assert iati.validator.is_iati_xml(data, schema_short_mapping_codelist)
+        assert result.contains_error_called('warn-code-not-on-codelist')
+        assert result[0].actual_value == 'not-a-language'
+        assert result[0].line_number == 7
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-pass') + [
+        iati.resources.get_test_data_path('valid_iati_invalid_code'),
+        iati.resources.get_test_data_path('valid_iati_invalid_code_short_mapping_xpath'),
+        iati.resources.get_test_data_path('valid_iati_vocab_multiple_different_invalid_code'),
+        iati.resources.get_test_data_path('valid_iati_vocab_user_defined_with_uri_readable_bad_code')
+    ])
+    def test_single_pass_matches_per_codelist_check(self, data_path, schema_all_codelists):
+        """Check that checking all Codelists in a single pass over a Dataset finds the same problems, in the same order, as checking each Codelist in turn."""
+        data = iati.resources.load_as_dataset(data_path)
+        schema = schema_all_codelists
+        per_codelist_log = iati.validator.ValidationErrorLog()
+        for codelist in schema.codelists:
+            per_codelist_log.extend(iati.validator._check_codes(data, codelist))  # pylint: disable=protected-access
+
+        single_pass_log = iati.validator._check_codelist_values(data, schema)  # pylint: disable=protected-access
+
+        assert [(err.name, err.line_number, err.actual_value, err.info) for err in single_pass_log] == [(err.name, err.line_number, err.actual_value, err.info) for err in per_codelist_log]
+
+    def test_codelist_validation_plan_compiles(self):
+        """Check that every default Codelist mapping is compiled into the validation plan."""
+        plan = iati.codelist_validation.validation_plan()
+        mappings = iati.default.codelist_mapping()
+
+        assert set(plan.keys()) == set(mappings.keys())
+        for codelist_name, compiled_mappings in plan.items():
+            assert len(compiled_mappings) == len(mappings[codelist_name])
+
+    def test_codelist_mapping_compiles(self, standard_version_mandatory):
+        """Check that every Codelist mapping at each version of the Standard can be compiled."""
+        mappings = iati.default.codelist_mapping(*standard_version_mandatory)
+
+        for codelist_mappings in mappings.values():
+            for mapping in codelist_mappings:
+                compiled_mapping = iati.codelist_validation.compile_mapping(mapping)
+                assert isinstance(compiled_mapping['parent_xpath'], etree.XPath)
+
+    def test_codelist_validation_plan_reused(self, schema_version, monkeypatch):
+        """Check that the Codelist mapping file is not parsed again each time a Dataset is checked against a Codelist."""
+        data = iati.tests.utilities.load_as_dataset('valid_iati_invalid_code')
+        iati.validator.full_validation(data, schema_version)
+
+        def fail_to_map(version=None):
+            """Fail should the Codelist mapping be parsed."""
+            raise AssertionError('The Codelist mapping was parsed again.')
+
+        monkeypatch.setattr(iati.default, 'codelist_mapping', fail_to_map)
+
+        for _ in range(10):
+            assert iati.validator.full_validation(data, schema_version).contains_error_called('err-code-not-on-codelist')
+
 
 class TestValidationVocabularies(ValidateCodelistsBase):
     """A container for tests relating to validation of vocabularies and associated Codelists."""
@@ -882,7 +1047,7 @@ class TestValidateRulesets(object):
         data_with_multiple_rule_errors = iati.tests.utilities.load_as_dataset('ruleset-std/invalid_std_ruleset_multiple_rule_errors')
         ruleset_1 = iati.default.ruleset()
         ruleset_2 = iati.default.ruleset()
-        schema = iati.default.activity_schema(None, False)
+        schema = iati.default.activity_schema(None, False, mutable=True)
         schema.rulesets.add(ruleset_1)
         schema.rulesets.add(ruleset_2)
         result = iati.validator.full_validation(data_with_multiple_rule_errors, schema)
@@ -900,6 +1065,72 @@ class TestValidateRulesets(object):
         assert result.get_errors_or_warnings_by_name('err-ruleset-conformance-fail') == []
 
 
+class TestValidationFailFast(ValidateCodelistsBase):
+    """A container for tests relating to validation that stops at the first error."""
+
+    @staticmethod
+    def assert_fail_fast_log_matches(fail_fast_log, full_log):
+        """Check that a log from failing fast contains only the first error, and that this error was also found when not failing fast."""
+        assert fail_fast_log.contains_errors() == full_log.contains_errors()
+        assert fail_fast_log.get_warnings() == []
+        for err in fail_fast_log:
+            assert (err.name, getattr(err, 'line_number', None)) in [(full_err.name, getattr(full_err, 'line_number', None)) for full_err in full_log]
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-fail') + iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-pass'))
+    def test_fail_fast_is_iati_xml(self, data_path, schema_basic):
+        """Check that failing fast when validating against the XSD finds an error only when there are errors."""
+        data = iati.resources.load_as_dataset(data_path)
+
+        fail_fast_log = iati.validator._check_is_iati_xml(data, schema_basic, fail_fast=True)  # pylint: disable=protected-access
+        full_log = iati.validator._check_is_iati_xml(data, schema_basic)  # pylint: disable=protected-access
+
+        self.assert_fail_fast_log_matches(fail_fast_log, full_log)
+        assert len(fail_fast_log) <= 1
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-pass') + [
+        iati.resources.get_test_data_path('valid_iati_incomplete_codelist_code_not_present'),
+        iati.resources.get_test_data_path('valid_iati_invalid_code'),
+        iati.resources.get_test_data_path('valid_iati_invalid_code_from_common'),
+        iati.resources.get_test_data_path('valid_iati_invalid_codes_multiple_xpaths_for_codelist_second'),
+        iati.resources.get_test_data_path('valid_iati_vocab_multiple_different_invalid_code')
+    ])
+    def test_fail_fast_codelist_values(self, data_path, schema_all_codelists):
+        """Check that failing fast when checking Codelist values finds an error only when there are errors."""
+        data = iati.resources.load_as_dataset(data_path)
+
+        fail_fast_log = iati.validator._check_codelist_values(data, schema_all_codelists, fail_fast=True)  # pylint: disable=protected-access
+        full_log = iati.validator._check_codelist_values(data, schema_all_codelists)  # pylint: disable=protected-access
+
+        self.assert_fail_fast_log_matches(fail_fast_log, full_log)
+        assert len(fail_fast_log) <= 1
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ruleset-std') + [
+        iati.resources.get_test_data_path('valid_std_ruleset')
+    ])
+    def test_fail_fast_ruleset_conformance(self, data_path, schema_ruleset):
+        """Check that failing fast when checking Ruleset conformance stops at the first Rule that does not pass."""
+        data = iati.resources.load_as_dataset(data_path)
+
+        fail_fast_log = iati.validator._check_ruleset_conformance(data, schema_ruleset, fail_fast=True)  # pylint: disable=protected-access
+        full_log = iati.validator._check_ruleset_conformance(data, schema_ruleset)  # pylint: disable=protected-access
+
+        self.assert_fail_fast_log_matches(fail_fast_log, full_log)
+        assert len(fail_fast_log.get_errors_or_warnings_by_category('rule')) <= 1
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-pass') + iati.resources.get_test_data_paths_in_folder('ruleset-std') + [
+        iati.resources.get_test_data_path('invalid_iati_missing_required_element'),
+        iati.resources.get_test_data_path('valid_iati_invalid_code'),
+        iati.resources.get_test_data_path('valid_iati_incomplete_codelist_code_not_present')
+    ])
+    def test_is_valid_matches_full_validation(self, data_path, schema_everything):
+        """Check that a Dataset is valid when failing fast only when full validation finds no errors."""
+        data = iati.resources.load_as_dataset(data_path)
+        full_log = iati.validator.full_validation(data, schema_everything)
+        full_log.extend(iati.validator.validate_is_iati_xml(data, schema_everything))
+
+        assert iati.validator.is_valid(data, schema_everything) == (not full_log.contains_errors())
+
+
 class TestValidatorFullValidation(ValidateCodelistsBase):
     """A container for tests relating to detailed error output from validation."""
 
@@ -958,3 +1189,89 @@ class TestValidatorFullValidation(ValidateCodelistsBase):
 
         assert len(result) == 1
         assert result.contains_error_called('err-not-xml-empty-document')
+
+
+class TestValidateStream(ValidateCodelistsBase):
+    """A container for tests relating to validation of streams of XML."""
+
+    def test_validate_stream_path(self, schema_incomplete_codelist):
+        """Perform streaming validation against a path to a file that has a value that is not on an incomplete Codelist."""
+        data_path = iati.resources.resource_filename(iati.resources.get_test_data_path('valid_iati_incomplete_codelist_code_not_present'))
+
+        result = iati.validator.validate_stream(data_path, schema_incomplete_codelist)
+
+        assert len(result) == 1
+        assert result[0].name == 'warn-code-not-on-codelist'
+        assert result[0].line_number == 18
+        assert 'code="a-code-not-on-the-codelist"' in result[0].context.split('\n')[1]
+
+    def test_validate_stream_file_object(self, schema_version):
+        """Perform streaming validation against a file object that has a value that is not on a Codelist. The value is an attribute of the root element."""
+        data_path = iati.resources.resource_filename(iati.resources.get_test_data_path('valid_iati_invalid_code'))
+
+        with open(data_path, 'rb') as data_file:
+            result = iati.validator.validate_stream(data_file, schema_version)
+
+        assert len(result) == 1
+        assert result[0].name == 'err-code-not-on-codelist'
+        assert result[0].line_number == 3
+        assert result[0].actual_value == '200.02'
+
+    @pytest.mark.parametrize("data_path", iati.resources.get_test_data_paths_in_folder('ssot-activity-xml-pass'))
+    def test_validate_stream_matches_codelist_check(self, data_path, schema_all_codelists):
+        """Check that streaming validation finds the same Codelist problems, at the same lines, as validating the whole Dataset at once."""
+        data = iati.resources.load_as_dataset(data_path)
+        whole_dataset_log = iati.validator._check_codelist_values(data, schema_all_codelists)  # pylint: disable=protected-access
+
+        stream_log = iati.validator.validate_stream(iati.resources.resource_filename(data_path), schema_all_codelists)
+
+        assert sorted((err.name, err.line_number, err.actual_value) for err in stream_log) == sorted((err.name, err.line_number, err.actual_value) for err in whole_dataset_log)
+
+    @pytest.mark.parametrize("xml_str", [
+        '<iati-activities version="200.02"></iati-activities>',
+        '<iati-activities version="200.02" generated-datetime="2017-01-01T00:00:00"/>'
+    ])
+    def test_validate_stream_root_only_matches_whole_dataset(self, xml_str, schema_everything):
+        """Check that streaming validation finds the same problems as validating the whole Dataset at once when the root element has an attribute that is not on a Codelist, and there are no activities."""
+        dataset = iati.Dataset(xml_str)
+        whole_dataset_log = iati.validator._check_codelist_values(dataset, schema_everything)  # pylint: disable=protected-access
+        whole_dataset_log.extend(iati.validator._check_ruleset_conformance(dataset, schema_everything))  # pylint: disable=protected-access
+
+        stream_log = iati.validator.validate_stream(BytesIO(xml_str.encode('utf-8')), schema_everything)
+
+        assert stream_log.contains_error_called('err-code-not-on-codelist')
+        assert sorted(err.name for err in stream_log) == sorted(err.name for err in whole_dataset_log)
+        assert [(err.line_number, err.actual_value) for err in stream_log.get_errors_or_warnings_by_category('codelist')] == [(err.line_number, err.actual_value) for err in whole_dataset_log.get_errors_or_warnings_by_category('codelist')]
+
+    def test_validate_stream_root_attribute_checked_once(self, schema_version):
+        """Check that an attribute of the root element that is not on a Codelist is found once, rather than for each activity that the root element contains."""
+        xml_str = (
+            '<iati-activities version="200.02">\n'
+            '  <iati-activity><iati-identifier>AA-AAA-123456789-ABC123</iati-identifier></iati-activity>\n'
+            '  <iati-activity><iati-identifier>AA-AAA-123456789-ABC124</iati-identifier></iati-activity>\n'
+            '</iati-activities>'
+        )
+
+        result = iati.validator.validate_stream(BytesIO(xml_str.encode('utf-8')), schema_version)
+
+        assert len(result) == 1
+        assert result[0].name == 'err-code-not-on-codelist'
+        assert result[0].line_number == 1
+
+    def test_validate_stream_ruleset(self, schema_ruleset):
+        """Perform streaming validation against a file that does not conform with the Standard Ruleset."""
+        data_path = iati.resources.resource_filename(iati.resources.get_test_data_path('ruleset-std/invalid_std_ruleset_multiple_rule_errors'))
+
+        result = iati.validator.validate_stream(data_path, schema_ruleset)
+
+        assert result.contains_error_called('err-ruleset-conformance-fail')
+        assert len(result.get_errors_or_warnings_by_category('rule')) > 1
+
+    def test_validate_stream_not_xml(self, schema_basic):
+        """Perform streaming validation against a file that is not XML."""
+        data_path = iati.resources.resource_filename(iati.resources.get_test_data_path('invalid'))
+
+        result = iati.validator.validate_stream(data_path, schema_basic)
+
+        assert result.contains_errors()
+        assert result.get_errors_or_warnings_by_category('xml') != []
@@ -1,10 +1,122 @@
 """A module containing utility functions."""
 import logging
 import os
+from collections import OrderedDict
 from io import StringIO
 from lxml import etree
 import iati.constants
 
+try:
+    from collections.abc import MutableSet, Set
+except ImportError:  # python2/3 - the abstract base classes moved to `collections.abc` at python 3.3
+    from collections import MutableSet, Set
+
+
+class OrderedSet(MutableSet):
+    """A set that remembers the order in which items were added.
+
+    Iterating over an OrderedSet gives its items in the order that they were first added, rather than in an order that depends on their hash.
+
+    """
+
+    def __init__(self, iterable=None):
+        """Initialise an OrderedSet.
+
+        Args:
+            iterable (iterable): Items to add to the OrderedSet, in order. Defaults to None, meaning that the OrderedSet is empty.
+
+        """
+        self._items = OrderedDict()
+
+        if iterable is not None:
+            self.update(iterable)
+
+    def __contains__(self, item):
+        """Determine whether an item is within the OrderedSet."""
+        return item in self._items
+
+    def __iter__(self):
+        """Iterate over the items within the OrderedSet in the order that they were added."""
+        return iter(self._items)
+
+    def __len__(self):
+        """Return the number of items within the OrderedSet."""
+        return len(self._items)
+
+    def __repr__(self):
+        """Return a representation of the OrderedSet."""
+        return '{0}({1!r})'.format(self.__class__.__name__, list(self))
+
+    def add(self, value):
+        """Add an item to the end of the OrderedSet, unless it is already present.
+
+        Args:
+            value (object): The hashable item to add.
+
+        """
+        self._items[value] = None
+
+    def discard(self, value):
+        """Remove an item from the OrderedSet, if it is present.
+
+        Args:
+            value (object): The hashable item to remove.
+
+        """
+        self._items.pop(value, None)
+
+    def update(self, *iterables):
+        """Add the items from each of a number of iterables to the OrderedSet, in order.
+
+        Args:
+            *iterables (iterable): The iterables to add items from.
+
+        """
+        for iterable in iterables:
+            for value in iterable:
+                self.add(value)
+
+
+class FrozenOrderedSet(Set):
+    """An immutable set that remembers the order in which items were added.
+
+    Iterating over a FrozenOrderedSet gives its items in the order that they were first added, rather than in an order that depends on their hash.
+
+    """
+
+    def __init__(self, iterable=None):
+        """Initialise a FrozenOrderedSet.
+
+        Args:
+            iterable (iterable): Items within the FrozenOrderedSet, in order. Defaults to None, meaning that the FrozenOrderedSet is empty.
+
+        """
+        self._items = OrderedDict()
+
+        if iterable is not None:
+            for value in iterable:
+                self._items[value] = None
+
+    def __contains__(self, item):
+        """Determine whether an item is within the FrozenOrderedSet."""
+        return item in self._items
+
+    def __iter__(self):
+        """Iterate over the items within the FrozenOrderedSet in the order that they were added."""
+        return iter(self._items)
+
+    def __len__(self):
+        """Return the number of items within the FrozenOrderedSet."""
+        return len(self._items)
+
+    def __repr__(self):
+        """Return a representation of the FrozenOrderedSet."""
+        return '{0}({1!r})'.format(self.__class__.__name__, list(self))
+
+    def __hash__(self):
+        """Return a hash of the FrozenOrderedSet, which does not depend on the order of its items."""
+        return self._hash()
+
 
 def add_namespace(tree, new_ns_name, new_ns_uri):
     """Add a namespace to a Schema.
@@ -1,16 +1,25 @@
 """A module containing validation functionality."""
 
 import sys
+from copy import deepcopy
 from lxml import etree
 import yaml
+import iati.codelist_validation
+import iati.constants
 import iati.default
 import iati.resources
 
 
-class ValidationError(object):
-    """A base class to encapsulate information about Validation Errors."""
+class ValidationError(object):  # pylint: disable=too-many-instance-attributes
+    """A base class to encapsulate information about Validation Errors.
+
+    Note:
+        The `help`, `info` and `context` of an error are only created when they are first accessed. Only the values from the calling scope that these require are kept until then.
+
+    """
+
+    __slots__ = ('name', 'status', 'actual_value', 'line_number', 'column_number', 'err', 'lxml_err_code', '_detail', '_format_values', '_dataset', '_help', '_info', '_context')
 
-    # pylint: disable=too-many-instance-attributes
     def __init__(self, err_name, calling_locals=None):
         """Create a new ValidationError.
 
@@ -32,31 +41,27 @@ class ValidationError(object):
             calling_locals = dict()
 
         try:
-            err_detail = get_error_codes()[err_name]
+            self._detail = _error_codes()[err_name]
         except (KeyError, TypeError):
             raise ValueError('{err_name} is not a known type of ValidationError.'.format(**locals()))
 
         # set general attributes for this type of error
         self.name = err_name
         self.actual_value = None
-
-        for key, val in err_detail.items():
-            setattr(self, key, val)
-
         self.status = 'error' if err_name.split('-')[0] == 'err' else 'warning'
 
-        # format error messages with context-specific info
-        try:
-            self.help = self.help.format(**calling_locals)
-            self.info = self.info.format(**calling_locals)
-        except KeyError:  # as missing_var_err:
-            # raise NameError('The calling scope must contain a `{missing_var_err.args[0]}` variable for providing information for the error message.'.format(**locals()))
-            pass
+        # keep only the values from the calling scope that are used when formatting error messages
+        templates = self._detail['help'] + self._detail['info']
+        self._format_values = {key: val for key, val in calling_locals.items() if '{' + key in templates}
+        self._help = None
+        self._info = None
+        self._context = None
+        self._dataset = None
 
         # set general attributes for this type of error that require context from the calling scope
         try:
             self.line_number = calling_locals['line_number']
-            self.context = calling_locals['dataset'].source_around_line(self.line_number)
+            self._dataset = calling_locals['dataset']
         except KeyError:
             pass
         try:
@@ -69,6 +74,76 @@ class ValidationError(object):
         except (AttributeError, KeyError):
             pass
 
+    @property
+    def base_exception(self):
+        """type: The Python exception that this type of error represents."""
+        return self._detail['base_exception']
+
+    @property
+    def category(self):
+        """str: The high level category that this type of error falls into."""
+        return self._detail['category']
+
+    @property
+    def description(self):
+        """str: A short general description of this type of error."""
+        return self._detail['description']
+
+    @property
+    def help(self):
+        """str: A detailed description of the error, formatted with information from the scope that the error was created in."""
+        if self._help is None:
+            self._help = self._format(self._detail['help'])
+        return self._help
+
+    @help.setter
+    def help(self, value):
+        self._help = value
+
+    @property
+    def info(self):
+        """str: Specific information about the error, formatted with information from the scope that the error was created in."""
+        if self._info is None:
+            self._info = self._format(self._detail['info'])
+        return self._info
+
+    @info.setter
+    def info(self, value):
+        self._info = value
+
+    @property
+    def context(self):
+        """str: The source of the Dataset around the line that the error occurred on.
+
+        Raises:
+            AttributeError: When the error was not created with both a Dataset and a line number.
+
+        """
+        if self._context is None:
+            if self._dataset is None:
+                raise AttributeError("'ValidationError' object has no attribute 'context'")
+            self._context = self._dataset.source_around_line(self.line_number)
+        return self._context
+
+    @context.setter
+    def context(self, value):
+        self._context = value
+
+    def _format(self, template):
+        """Format an error message with the values kept from the scope that the error was created in.
+
+        Args:
+            template (str): The error message to format.
+
+        Returns:
+            str: The formatted message. The message is returned unformatted if a value that it requires was not available.
+
+        """
+        try:
+            return template.format(**self._format_values)
+        except KeyError:
+            return template
+
 
 class ValidationErrorLog(object):
     """A container to keep track of a set of ValidationErrors.
@@ -272,86 +347,81 @@ class ValidationErrorLog(object):
         return [err for err in self if err.status == 'warning']
 
 
-def _check_codes(dataset, codelist):
+def _check_codes(dataset, codelist, fail_fast=False):
     """Determine whether a given Dataset has values from the specified Codelist where expected.
 
     Args:
         dataset (iati.data.Dataset): The Dataset to check Codelist values within.
         codelist (iati.codelists.Codelist): The Codelist to check values from.
+        fail_fast (bool): Whether to stop at the first error, rather than finding every error and warning. Defaults to False.
 
     Returns:
         iati.validator.ValidationErrorLog: A log of the errors that occurred.
+            When failing fast, the log contains only the first error found, and no warnings.
+
+    Note:
+        This evaluates one XPath per mapping for the Codelist. To check many Codelists at once, use `_check_codelist_values()`, which walks the Dataset once.
 
     """
     error_log = ValidationErrorLog()
-    mappings = iati.default.codelist_mapping()
-
-    for mapping in mappings[codelist.name]:
-        base_xpath = mapping['xpath']
-        condition = mapping['condition']
-        split_xpath = base_xpath.split('/')
-        parent_el_xpath = '/'.join(split_xpath[:-1])
-        attr_name = split_xpath[-1:][0][1:]
+    plan = iati.codelist_validation.validation_plan()
 
-        if condition is None:
-            parent_el_xpath = parent_el_xpath + '[@' + attr_name + ']'
-        else:
-            parent_el_xpath = parent_el_xpath + '[' + condition + ' and @' + attr_name + ']'
+    if fail_fast and not codelist.complete:
+        # values that are not on an incomplete Codelist only cause warnings
+        return error_log
 
-        # some nasty string manipulation to make the `//@xml:lang` mapping work
-        while not parent_el_xpath.startswith('//'):
-            parent_el_xpath = '/' + parent_el_xpath
-        if parent_el_xpath.startswith('//['):
-            parent_el_xpath = '//*[' + parent_el_xpath[3:]
-
-        parents_to_check = dataset.xml_tree.xpath(parent_el_xpath)
+    for mapping in plan.get(codelist.name, []):
+        parents_to_check = mapping['parent_xpath'](dataset.xml_tree)
 
         for parent in parents_to_check:
-            code = parent.attrib[attr_name]
-
-            if code not in codelist.codes:
-                line_number = parent.sourceline  # used via `locals()` # pylint: disable=unused-variable
-
-                if codelist.complete:
-                    error = ValidationError('err-code-not-on-codelist', locals())
-                else:
-                    error = ValidationError('warn-code-not-on-codelist', locals())
+            code = iati.codelist_validation.value_for(parent, mapping)
 
-                error.actual_value = code
-
-                error_log.add(error)
+            if code not in codelist.code_values:
+                error_log.add(_create_error_for_codelist_value(dataset, codelist, code, mapping['attr_name'], parent.sourceline))
+                if fail_fast:
+                    return error_log
 
     return error_log
 
 
-def _check_codelist_values(dataset, schema):
+def _check_codelist_values(dataset, schema, fail_fast=False, skip_root=False):
     """Check whether a given Dataset has values from Codelists that have been added to a Schema where expected.
 
+    The Dataset is walked once, with each element being checked against the Codelist mappings for its tag. This is much faster than evaluating an XPath per mapping when there are many Codelists.
+
     Args:
         dataset (iati.data.Dataset): The Dataset to check Codelist values within.
         schema (iati.schemas.Schema): The Schema to locate Codelists within.
+        fail_fast (bool): Whether to stop at the first error, rather than finding every error and warning. Defaults to False.
+        skip_root (bool): Whether to skip checking the root element of the Dataset, such as when its values have already been checked. Defaults to False.
 
     Returns:
         iati.validator.ValidationErrorLog: A log of the errors that occurred.
+            When failing fast, the log contains only the first error found, and no warnings.
+
+    Note:
+        Errors are logged in the same order as if `_check_codes()` were called for each Codelist in turn. When failing fast, the first error in document order is logged.
 
     """
     error_log = ValidationErrorLog()
 
-    for codelist in schema.codelists:
-        error_log.extend(_check_codes(dataset, codelist))
+    for codelist, code, attr_name, line_number in iati.codelist_validation.invalid_values(dataset, schema.codelists, fail_fast, skip_root):
+        error_log.add(_create_error_for_codelist_value(dataset, codelist, code, attr_name, line_number))
 
     return error_log
 
 
-def _check_is_iati_xml(dataset, schema):
+def _check_is_iati_xml(dataset, schema, fail_fast=False):
     """Check whether a given Dataset contains valid IATI XML.
 
     Args:
         dataset (iati.data.Dataset): The Dataset to check validity of.
         schema (iati.schemas.Schema): The Schema to validate the Dataset against.
+        fail_fast (bool): Whether to stop at the first error, rather than finding every error and warning. Defaults to False.
 
     Returns:
         iati.validator.ValidationErrorLog: A log of the errors that occurred.
+            When failing fast, the log contains only the first error found, and no warnings.
 
     Raises:
         iati.exceptions.SchemaError: An error occurred in the parsing of the Schema.
@@ -367,6 +437,12 @@ def _check_is_iati_xml(dataset, schema):
     except iati.exceptions.SchemaError as err:
         raise err
 
+    if fail_fast:
+        # lxml always validates the whole document, though only the first entry in its log needs converting
+        if not validator.validate(dataset.xml_tree):
+            error_log.add(_create_error_for_lxml_log_entry(validator.error_log[0]))
+        return error_log
+
     try:
         validator.assertValid(dataset.xml_tree)
     except etree.DocumentInvalid as doc_invalid:
@@ -390,58 +466,43 @@ def _check_is_xml(maybe_xml):
         Consider how a Dataset may be passed when creating errors so that context can be obtained.
 
     """
-    error_log = ValidationErrorLog()
-
     if isinstance(maybe_xml, iati.data.Dataset):
         maybe_xml = maybe_xml.xml_str
 
-    try:
-        parser = etree.XMLParser()
-        _ = etree.fromstring(maybe_xml.strip(), parser)
-    except etree.XMLSyntaxError:
-        for log_entry in parser.error_log:
-            error = _create_error_for_lxml_log_entry(log_entry)
-            error_log.add(error)
-    except (AttributeError, TypeError, ValueError):
-        problem_var_type = type(maybe_xml)  # used via `locals()` # pylint: disable=unused-variable
-        error = ValidationError('err-not-xml-not-string', locals())
-        error_log.add(error)
-
-    # the parser does not cause any errors when given an empty string, so this needs handling separately
-    if error_log == ValidationErrorLog() and maybe_xml.strip() == '':
-        err_name = 'err-not-xml-empty-document'
-        err = 'A file or string containing no data is not XML.'  # used via `locals()` # pylint: disable=unused-variable
-        error = ValidationError(err_name, locals())
-        error_log.add(error)
+    _, error_log = _parse_xml(maybe_xml)
 
     return error_log
 
 
-def _check_rules(dataset, ruleset):
+def _check_rules(dataset, ruleset, fail_fast=False):
     """Determine whether a given Dataset conforms with a provided Ruleset.
 
     Args:
         dataset (iati.data.Dataset): The Dataset to check Ruleset conformance with.
         ruleset (iati.code.Ruleset): The Ruleset to check conformance with.
+        fail_fast (bool): Whether to stop at the first error, rather than finding every error and warning. Defaults to False.
 
     Returns:
         iati.validator.ValidationErrorLog: A log of the errors that occurred.
+            When failing fast, the log contains only the first Rule that did not pass and the resulting Ruleset error, and no warnings.
 
     """
     error_log = ValidationErrorLog()
     error_found = False
 
-    for rule in ruleset.rules:
-        validation_status = rule.is_valid_for(dataset)
+    for rule, validation_status in ruleset._results_for(dataset):  # pylint: disable=protected-access
         if validation_status is None:
             # A result of `None` signifies that a rule was skipped.
-            error = ValidationError('warn-rule-skipped', locals())
-            error_log.add(error)
+            if not fail_fast:
+                error = ValidationError('warn-rule-skipped', locals())
+                error_log.add(error)
         elif validation_status is False:
             # A result of `False` signifies that a rule did not pass.
             error = _create_error_for_rule(rule)
             error_log.add(error)
             error_found = True
+            if fail_fast:
+                break
 
     if error_found:
         # Add a ruleset error if at least one rule error was found.
@@ -451,21 +512,25 @@ def _check_rules(dataset, ruleset):
     return error_log
 
 
-def _check_ruleset_conformance(dataset, schema):
+def _check_ruleset_conformance(dataset, schema, fail_fast=False):
     """Check whether a given Dataset conforms with Rulesets that have been added to a Schema.
 
     Args:
         dataset (iati.data.Dataset): The Dataset to check Ruleset conformance with.
         schema (iati.schemas.Schema): The Schema to locate Rulesets within.
+        fail_fast (bool): Whether to stop at the first error, rather than finding every error and warning. Defaults to False.
 
     Returns:
         iati.validator.ValidationErrorLog: A log of the errors that occurred.
+            When failing fast, the log contains only the errors from the first Ruleset that the Dataset does not conform with.
 
     """
     error_log = ValidationErrorLog()
 
     for ruleset in schema.rulesets:
-        error_log.extend(_check_rules(dataset, ruleset))
+        error_log.extend(_check_rules(dataset, ruleset, fail_fast))
+        if fail_fast and error_log.contains_errors():
+            break
 
     return error_log
 
@@ -481,7 +546,7 @@ def _conforms_with_ruleset(dataset, schema):
         bool: A boolean indicating whether the given Dataset conforms with Rulesets attached to the given Schema.
 
     """
-    error_log = _check_ruleset_conformance(dataset, schema)
+    error_log = _check_ruleset_conformance(dataset, schema, fail_fast=True)
 
     return not error_log.contains_errors()
 
@@ -497,11 +562,35 @@ def _correct_codelist_values(dataset, schema):
         bool: A boolean indicating whether the given Dataset has values from the specified Codelists where they should be.
 
     """
-    error_log = _check_codelist_values(dataset, schema)
+    error_log = _check_codelist_values(dataset, schema, fail_fast=True)
 
     return not error_log.contains_errors()
 
 
+def _create_error_for_codelist_value(dataset, codelist, code, attr_name, line_number):  # pylint: disable=invalid-name,unused-argument
+    """Create an IATI ValidationError for a value that is not on the Codelist that it should be on.
+
+    Args:
+        dataset (iati.data.Dataset): The Dataset that the value is within.
+        codelist (iati.codelists.Codelist): The Codelist that the value should be on.
+        code (str): The value that is not on the Codelist.
+        attr_name (str): The name of the attribute that contains the value.
+        line_number (int): The line of the Dataset that the value is on.
+
+    Returns:
+        ValidationError: An IATI ValidationError. This is an error if the Codelist is complete, or a warning if it is not.
+
+    """
+    if codelist.complete:
+        error = ValidationError('err-code-not-on-codelist', locals())
+    else:
+        error = ValidationError('warn-code-not-on-codelist', locals())
+
+    error.actual_value = code
+
+    return error
+
+
 def _create_error_for_lxml_log_entry(log_entry):  # pylint: disable=invalid-name
     """Parse a log entry from an lxml error log and convert it to a IATI ValidationError.
 
@@ -613,8 +702,35 @@ def full_validation(dataset, schema):
     return error_log
 
 
-def get_error_codes():
-    """Return a dictionary of the possible error codes and their information.
+_ERROR_CODES = dict()
+"""A cache of the loaded error codes.
+
+This removes the need to repeatedly load and parse `validation_err_codes.yaml` each time a ValidationError is created.
+
+The dictionary is structured as:
+
+{
+    "name-of-error-a": {
+        "base_exception": ValueError,
+        "category": "codelist",
+        "description": "...",
+        "help": "...",
+        "info": "..."
+    },
+    [...]
+}
+
+Warning:
+    Modifying values directly obtained from this cache will modify every subsequently created ValidationError. As such, a `deepcopy()` should be performed on any accessed value before it is modified in any way.
+
+"""
+
+
+def _error_codes(use_cache=True):
+    """Locate the possible error codes and their information.
+
+    Args:
+        use_cache (bool): Whether the cache should be used rather than loading the error codes from disk again. If used, a `deepcopy()` should be performed on any returned value before it is modified.
 
     Returns:
         dict: A dictionary of error codes.
@@ -622,11 +738,16 @@ def get_error_codes():
     Raises:
         KeyError: When a specified base_exception is not a valid type of exception.
 
-    Todo:
-        Raise the correct error for incorrect base_exception values.
-        Raise an error when there is a problem with non-base_exception-related errors.
+    Warning:
+        The returned dictionary is the cache itself. Modification of a returned value will modify it everywhere.
+
+    Note:
+        This is a private function so as to prevent the (dangerous) `use_cache` parameter being part of the public API.
 
     """
+    if _ERROR_CODES and use_cache:
+        return _ERROR_CODES
+
     err_codes_str = iati.resources.load_as_string(iati.resources.get_lib_data_path('validation_err_codes.yaml'))
     err_codes_list_of_dict = yaml.safe_load(err_codes_str)
     # yaml parses the values into a list of dicts, so they need combining into one
@@ -640,7 +761,30 @@ def get_error_codes():
         except KeyError:
             err['base_exception'] = getattr(sys.modules['exceptions'], err['base_exception'])
 
-    return err_codes_dict
+    _ERROR_CODES.clear()
+    _ERROR_CODES.update(err_codes_dict)
+
+    return _ERROR_CODES
+
+
+def get_error_codes():
+    """Return a dictionary of the possible error codes and their information.
+
+    Returns:
+        dict: A dictionary of error codes.
+
+    Raises:
+        KeyError: When a specified base_exception is not a valid type of exception.
+
+    Note:
+        The error codes are only loaded from disk once. A copy is returned so that modifying the result does not affect the ValidationErrors that are subsequently created.
+
+    Todo:
+        Raise the correct error for incorrect base_exception values.
+        Raise an error when there is a problem with non-base_exception-related errors.
+
+    """
+    return deepcopy(_error_codes())
 
 
 def is_iati_xml(dataset, schema):
@@ -663,7 +807,7 @@ def is_iati_xml(dataset, schema):
         Create test against a bad Schema.
 
     """
-    return not _check_is_iati_xml(dataset, schema).contains_errors()
+    return not _check_is_iati_xml(dataset, schema, fail_fast=True).contains_errors()
 
 
 def is_valid(dataset, schema):
@@ -708,6 +852,54 @@ def is_xml(maybe_xml):
     return not error_log.contains_errors()
 
 
+def _parse_xml(maybe_xml):
+    """Parse a given parameter as XML, recording any errors that occur.
+
+    Args:
+        maybe_xml (str): An string that may or may not contain valid XML.
+
+    Returns:
+        tuple: The root element of the parsed XML, or None if the parameter is not valid XML. Followed by an iati.validator.ValidationErrorLog containing a log of the errors that occurred.
+
+    Note:
+        This allows the tree created when checking whether a string is XML to be used, rather than parsing the string a second time.
+
+    """
+    error_log = ValidationErrorLog()
+    root = None
+
+    try:
+        parser = etree.XMLParser()
+        root = etree.fromstring(maybe_xml.strip(), parser)
+    except etree.XMLSyntaxError:
+        for log_entry in parser.error_log:
+            error = _create_error_for_lxml_log_entry(log_entry)
+            error_log.add(error)
+    except (AttributeError, TypeError, ValueError):
+        problem_var_type = type(maybe_xml)  # used via `locals()` # pylint: disable=unused-variable
+        error = ValidationError('err-not-xml-not-string', locals())
+        error_log.add(error)
+
+    # the parser does not cause any errors when given an empty string, so this needs handling separately
+    if error_log == ValidationErrorLog() and maybe_xml.strip() == '':
+        err_name = 'err-not-xml-empty-document'
+        err = 'A file or string containing no data is not XML.'  # used via `locals()` # pylint: disable=unused-variable
+        error = ValidationError(err_name, locals())
+        error_log.add(error)
+
+    if error_log.contains_errors():
+        root = None
+
+    return root, error_log
+
+
+_STREAM_ROOT_TAGS = ('iati-activities', 'iati-organisations')
+"""tuple of str: The tags of the root elements of IATI XML that may be read from a stream."""
+
+_STREAM_ELEMENT_TAGS = ('iati-activity', 'iati-organisation')
+"""tuple of str: The tags of the elements that are each checked in turn when IATI XML is read from a stream."""
+
+
 def validate_is_iati_xml(dataset, schema):
     """Check whether a Dataset contains valid IATI XML.
 
@@ -732,3 +924,72 @@ def validate_is_xml(maybe_xml):
 
     """
     return _check_is_xml(maybe_xml)
+
+
+def validate_stream(source, schema):
+    """Check whether a stream of XML has values from Codelists and conforms with Rulesets that have been added to a Schema.
+
+    The XML is parsed incrementally. Each `iati-activity` or `iati-organisation` is checked in turn and then discarded. As such, memory usage depends upon the size of the largest activity or organisation, rather than the size of the whole document.
+
+    Args:
+        source (str or file): The path to a file, or a file-like object opened in binary mode, that contains the XML to check.
+        schema (iati.schemas.Schema): The Schema to locate Codelists and Rulesets within.
+
+    Returns:
+        iati.validator.ValidationErrorLog: A log of the errors that occurred.
+
+    Raises:
+        FileNotFoundError (python3) / IOError (python2): When a file at the specified path does not exist.
+
+    Note:
+        The XML is not checked against the XSD, since this requires the whole document. Use `validate_is_iati_xml()` to do so.
+
+        Ruleset conformance is determined separately for each activity or organisation. As such, a Ruleset error is added for each one that does not conform with a Ruleset. Where there are none, Ruleset conformance is determined for the root element.
+
+        Attributes on the root element are checked against Codelists once, as soon as the root element is read, rather than for each activity or organisation.
+
+        Each activity or organisation is checked within a copy of the root element, including its attributes.
+
+    """
+    error_log = ValidationErrorLog()
+    root_checked = False
+    element_checked = False
+    elements = etree.iterparse(source, events=('start', 'end'), tag=_STREAM_ROOT_TAGS + _STREAM_ELEMENT_TAGS)
+
+    try:
+        for event, element in elements:
+            root = element.getparent()
+
+            if event == 'start':
+                # the attributes of the root element are known once it starts, so they are checked even when it contains no activities or organisations
+                if root is None and element.tag in _STREAM_ROOT_TAGS:
+                    error_log.extend(_check_codelist_values(iati.data._fragment_for_root(element), schema))  # pylint: disable=protected-access
+                    root_checked = True
+                continue
+
+            if element.tag not in _STREAM_ELEMENT_TAGS:
+                # with no activities or organisations to check, Ruleset conformance is determined for the root element, as it is for a whole Dataset
+                if root is None and not element_checked:
+                    error_log.extend(_check_ruleset_conformance(iati.data._fragment_for_root(element), schema))  # pylint: disable=protected-access
+                continue
+
+            if not root_checked and root is not None:
+                error_log.extend(_check_codelist_values(iati.data._fragment_for_root(root), schema))  # pylint: disable=protected-access
+                root_checked = True
+
+            fragment_tree = etree.Element(root.tag, attrib=dict(root.attrib), nsmap=root.nsmap) if root is not None else None
+            fragment = iati.data._fragment_for_element(element, fragment_tree)  # pylint: disable=protected-access
+            error_log.extend(_check_codelist_values(fragment, schema, skip_root=root is not None))
+            error_log.extend(_check_ruleset_conformance(fragment, schema))
+            element_checked = True
+
+            # discard the element, plus any preceding siblings, so that the tree does not grow as the stream is read
+            element.clear()
+            while element.getprevious() is not None:
+                del root[0]
+    except etree.XMLSyntaxError as err:
+        for log_entry in err.error_log:  # pylint: disable=no-member
+            error = _create_error_for_lxml_log_entry(log_entry)
+            error_log.add(error)
+
+    return error_log